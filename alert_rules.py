@@ -0,0 +1,226 @@
+"""
+Alert Routing Rules
+
+Lets individual people and channels subscribe to the alerts they care about,
+each with their own Discord webhook, next to the main @everyone webhook.
+
+A rule is a JSON object:
+
+    {
+        "name": "Ana - August weekends",
+        "webhook": "https://discord.com/api/webhooks/...",
+        "mention": "<@123456789>",            # optional prefix for the message
+        "months": ["August"],                 # optional event filters:
+        "weekdays": ["fri", "sat", "sun"],    #   months, weekdays and/or
+        "events": ["august-8"],               #   explicit event ids
+        "states": ["available", "possible"],  # optional, states moved *to*
+        "upgrades_only": true,                # optional
+        "inventory_known": true               # optional, status carries a stock count
+    }
+
+Rules are compiled into an index keyed by
+(event_id, state, is_upgrade, inventory_known). Each rule is entered under
+every key it accepts, so finding the subscribers for a transition is one
+dictionary lookup returning exactly the matching rules. The cost follows the
+number of matches, not the number of rules.
+
+RuleStore keeps the rules in a JSON file and rebuilds the index when the
+file changes on disk, so every gunicorn worker sees rules added through
+another one. Changes hold a file lock from reload to save.
+"""
+import re
+import json
+import uuid
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from json_file import locked, file_version, write_json
+from lifecycle import DEFAULT_TOUR_YEAR, event_date
+from transitions import STATE_NAMES, availability_level, availability_state
+
+logger = logging.getLogger(__name__)
+
+STATES = tuple(STATE_NAMES.values()) + ('other',)
+WEEKDAYS = ('mon', 'tue', 'wed', 'thu', 'fri', 'sat', 'sun')
+INVENTORY_PATTERN = re.compile(r'\d+ tickets in stock|Stock:')
+RULE_ID_PATTERN = re.compile(r'[A-Za-z0-9_-]{1,64}')
+DEFAULT_WORKERS = 8
+
+
+def validate_rule(rule, known_events, year=DEFAULT_TOUR_YEAR):
+    """Return a normalized rule, or raise ValueError"""
+    if not isinstance(rule, dict):
+        raise ValueError("rule must be an object")
+    webhook = rule.get('webhook')
+    if not isinstance(webhook, str) or not webhook.startswith('https://'):
+        raise ValueError("webhook must be an https URL")
+
+    def string_list(field, allowed, transform=str):
+        values = rule.get(field) or []
+        if not isinstance(values, list) or not all(isinstance(value, str) for value in values):
+            raise ValueError(f"{field} must be a list of strings")
+        values = [transform(value) for value in values]
+        unknown = sorted(set(values) - set(allowed))
+        if unknown:
+            raise ValueError(f"unknown {field}: {', '.join(unknown)}")
+        return values
+
+    rule_id = rule.get('id') or uuid.uuid4().hex[:12]
+    if not isinstance(rule_id, str) or not RULE_ID_PATTERN.fullmatch(rule_id):
+        raise ValueError("id must be up to 64 letters, digits, '-' or '_'")
+
+    months = sorted({event_id.split('-')[0] for event_id in known_events})
+    normalized = {
+        'id': rule_id,
+        'name': str(rule.get('name') or '')[:100],
+        'webhook': webhook,
+        'mention': str(rule.get('mention') or '')[:100],
+        'events': string_list('events', known_events),
+        'months': string_list('months', months, str.lower),
+        'weekdays': string_list('weekdays', WEEKDAYS, lambda day: day.lower()[:3]),
+        'states': string_list('states', STATES),
+        'upgrades_only': bool(rule.get('upgrades_only')),
+        'inventory_known': bool(rule.get('inventory_known')),
+    }
+    if not rule_events(normalized, known_events, year):
+        raise ValueError("rule matches no events")
+    return normalized
+
+
+def rule_events(rule, known_events, year=DEFAULT_TOUR_YEAR):
+    """Event ids a rule's event filters accept; weekdays are those of the given year"""
+    matched = []
+    for event_id in known_events:
+        if rule['events'] and event_id not in rule['events']:
+            continue
+        if rule['months'] and event_id.split('-')[0] not in rule['months']:
+            continue
+        if rule['weekdays'] and WEEKDAYS[event_date(event_id, year).weekday()] not in rule['weekdays']:
+            continue
+        matched.append(event_id)
+    return matched
+
+
+def compile_index(rules, known_events, year=DEFAULT_TOUR_YEAR):
+    """(event_id, state, is_upgrade, inventory_known) -> [rule, ...]"""
+    index = {}
+    for rule in rules:
+        states = rule['states'] or STATES
+        upgrade_keys = (True,) if rule['upgrades_only'] else (True, False)
+        inventory_keys = (True,) if rule['inventory_known'] else (True, False)
+        for event_id in rule_events(rule, known_events, year):
+            for state in states:
+                for is_upgrade in upgrade_keys:
+                    for inventory in inventory_keys:
+                        index.setdefault((event_id, state, is_upgrade, inventory), []).append(rule)
+    return index
+
+
+def transition_key(event_id, previous_status, status):
+    """Index key describing one confirmed transition"""
+    new_level = availability_level(status)
+    old_level = availability_level(previous_status) if previous_status else None
+    is_upgrade = new_level is not None and (old_level is None or new_level > old_level)
+    return (event_id, availability_state(status), is_upgrade, bool(INVENTORY_PATTERN.search(status)))
+
+
+class RuleStore:
+    """Thread-safe rule set persisted to a JSON file, with its compiled index"""
+
+    def __init__(self, path, known_events, year=DEFAULT_TOUR_YEAR):
+        self.path = path
+        self.known_events = list(known_events)
+        self.year = year
+        self._lock = threading.Lock()
+        self._rules = {}
+        self._index = {}
+        self._version = None
+        with self._lock:
+            self._reload()
+
+    def add(self, rule):
+        """Add or replace a rule (by id); raises ValueError if it is malformed"""
+        rule = validate_rule(rule, self.known_events, self.year)
+        with self._lock, locked(self.path):
+            self._reload()
+            self._rules[rule['id']] = rule
+            self._save()
+        return rule
+
+    def remove(self, rule_id):
+        with self._lock, locked(self.path):
+            self._reload()
+            removed = self._rules.pop(rule_id, None) is not None
+            if removed:
+                self._save()
+        return removed
+
+    def all(self):
+        with self._lock:
+            self._reload()
+            return list(self._rules.values())
+
+    def __len__(self):
+        with self._lock:
+            self._reload()
+            return len(self._rules)
+
+    def match(self, event_id, previous_status, status):
+        """Rules subscribed to this transition"""
+        key = transition_key(event_id, previous_status, status)
+        with self._lock:
+            self._reload()
+            return list(self._index.get(key, ()))
+
+    def _reload(self):
+        version = file_version(self.path)
+        if version is None or version == self._version:
+            return
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                rules = [validate_rule(rule, self.known_events, self.year) for rule in json.load(f)]
+            self._rules = {rule['id']: rule for rule in rules}
+            self._index = compile_index(rules, self.known_events, self.year)
+        except (OSError, ValueError, TypeError) as e:
+            logger.warning("Ignoring unreadable alert rules %s: %s", self.path, e)
+        self._version = version
+
+    def _save(self):
+        self._version = write_json(self.path, list(self._rules.values()), indent=2)
+        self._index = compile_index(self._rules.values(), self.known_events, self.year)
+
+
+def dispatch(rules, message, post, max_workers=DEFAULT_WORKERS):
+    """
+    Deliver a message to every matched rule's webhook, once per webhook.
+
+    Args:
+        rules: Matched rules
+        message: Alert text; each webhook's mentions are prefixed
+        post: Callable (webhook, content) -> truthy on success
+
+    Returns:
+        Dictionary with sent and failed counts
+    """
+    mentions = {}
+    for rule in rules:
+        webhook_mentions = mentions.setdefault(rule['webhook'], [])
+        if rule['mention'] and rule['mention'] not in webhook_mentions:
+            webhook_mentions.append(rule['mention'])
+
+    def deliver(webhook):
+        content = ' '.join(mentions[webhook] + [message])
+        try:
+            return bool(post(webhook, content))
+        except Exception as e:
+            logger.warning("Routed alert to %s failed: %s", webhook[:60], e)
+            return False
+
+    result = {'sent': 0, 'failed': 0}
+    if not mentions:
+        return result
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(mentions))) as pool:
+        for ok in pool.map(deliver, list(mentions)):
+            result['sent' if ok else 'failed'] += 1
+    return result
@@ -1,12 +1,38 @@
 import os
 from flask import Flask, render_template, jsonify, send_from_directory, request
 import requests
-from datetime import datetime
+from datetime import datetime, timezone
 import time
+import hmac
 import random
+import threading
 import json
-from bs4 import BeautifulSoup
+import copy
+import csv
+import io
+import page_classifier
+from sampling_profiler import start_profile
+from asset_pipeline import (
+    DIST_DIR, IMMUTABLE_CACHE_CONTROL, guess_mimetype, load_manifest, select_encoding
+)
 import logging
+from log_pipeline import configure_logging
+from web_push import SubscriptionStore, broadcast, vapid_sender, webpush
+from json_file import StoreFull
+from monitor_config import ConfigWatcher
+import compact_status
+import metrics
+from circuit_breaker import BreakerRegistry, HALF_OPEN, is_check_failure
+from single_flight import SingleFlight
+from transitions import TransitionDetector
+from history_store import HistoryStore
+from lifecycle import DEFAULT_TOUR_YEAR, LifecycleManager
+from alert_rules import RuleStore, dispatch
+from watchlists import WatchlistStore, PayloadCache, filter_snapshot, signature, new_token
+from page_archive import PageArchive
+from page_reader import PageReader, TRUNCATED_RATIO
+from page_parser import parser_backend
+import sqlite3
 from fake_useragent import UserAgent
 import asyncio
 import aiohttp
@@ -15,8 +41,10 @@ from playwright.sync_api import sync_playwright
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+# Configure logging: records go through a queue to a background writer thread
+LOG_FORMAT = os.getenv('LOG_FORMAT', 'json')  # 'json' or 'text'
+LOG_SAMPLE_EVERY = int(os.getenv('LOG_SAMPLE_EVERY', '20'))  # Keep 1 in N repetitive per-event lines
+configure_logging(level=logging.INFO, fmt=LOG_FORMAT, sample_every=LOG_SAMPLE_EVERY)
 logger = logging.getLogger(__name__)
 
 # Environment variables with defaults
@@ -29,7 +57,7 @@ try:
     PLAYWRIGHT_AVAILABLE = True
 except ImportError:
     PLAYWRIGHT_AVAILABLE = False
-    print("Playwright not available. Falling back to requests-only mode.")
+    logger.warning("Playwright not available. Falling back to requests-only mode.")
 
 # Bad Bunny tour dates (as per user specifications)
 BAD_BUNNY_DATES = {
@@ -91,6 +119,16 @@ CONCERT_DATES = {
 app = Flask(__name__)
 logger = app.logger
 
+# Hashed bundle names from `python asset_pipeline.py`; empty when assets were not built
+ASSET_MANIFEST = load_manifest()
+
+@app.context_processor
+def inject_asset_helpers():
+    """Expose the built asset bundles to templates"""
+    def asset_url(name):
+        return f"/assets/{ASSET_MANIFEST[name]}"
+    return {'asset_bundles': bool(ASSET_MANIFEST), 'asset_url': asset_url}
+
 # Monitoring settings
 BASE_CHECK_INTERVAL = 60  # Base interval in seconds to avoid anti-bot detection
 JITTER_MAX = 30  # Maximum random delay to add to each check (in seconds)
@@ -98,11 +136,147 @@ MAX_DATES_PER_CHECK = 3  # Only check a few dates each interval
 CHECK_INTERVAL = int(os.environ.get('CHECK_INTERVAL', BASE_CHECK_INTERVAL))
 DISCORD_WEBHOOK_URL = os.environ.get('DISCORD_WEBHOOK_URL', 'https://discord.com/api/webhooks/1347702022039666783/IIgJ2B6vT5aQoTjNOadVxdAviHuEsCRR8zwu4CgWAvWzcob9BJ0_5XQC-BTyVauTljR_')
 
+# Hot-reloadable overrides for the settings above (see monitor_config.py)
+MONITOR_CONFIG_PATH = os.environ.get('MONITOR_CONFIG_PATH', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'monitor_config.json'))
+CONFIG_DEFAULTS = {
+    'CHECK_INTERVAL': CHECK_INTERVAL,
+    'MAX_DATES_PER_CHECK': MAX_DATES_PER_CHECK,
+    'JITTER_MAX': JITTER_MAX,
+    'event_urls': copy.deepcopy(TICKETERA_URLS),
+}
+config_lock = threading.Lock()  # Held while settings are swapped or a sweep picks its events
+
 # Global state
 ticket_status = {}
 last_check = None
 last_update_time = {}  # Track when each event was last checked
 
+# Clock used by the check loop; the replay harness swaps in a virtual clock
+monitor_clock = time.time
+monitor_sleep = time.sleep
+
+# Sweep bookkeeping for the health endpoints (monitor_clock() timestamps)
+monitor_started = monitor_clock()
+last_sweep_started = None
+last_sweep_finished = None
+sweep_thread_ident = None  # Thread running the current sweep, for the profiler
+
+# Under gunicorn, sweeps run inside /api/tickets requests; the ASGI mode
+# (asgi_app.py) runs them from its own check engine and turns this off
+INLINE_SWEEPS = True
+
+# Snapshot versioning: bumped whenever a sweep updates ticket_status
+snapshot_version = 0
+snapshot_updated = None  # monitor_clock() of the last snapshot update
+# Called, from any thread, when the snapshot changes outside a sweep (e.g. a config reload)
+snapshot_listeners = []
+
+# Per-event circuit breakers: events whose checks keep failing are skipped
+# and only probed now and then (see circuit_breaker.py)
+event_breakers = BreakerRegistry(
+    failure_threshold=int(os.environ.get('BREAKER_FAILURES', 3)),
+    open_seconds=int(os.environ.get('BREAKER_OPEN_SECONDS', 300)),
+    max_open_seconds=int(os.environ.get('BREAKER_MAX_OPEN_SECONDS', 3600)),
+)
+CHECK_RETRIES = 5  # urllib3 retries for 5xx on a normal check
+PROBE_RETRIES = 1  # A half-open probe only needs to learn whether the page is back
+
+# Checks of one URL share a single fetch and verdict while in flight, and for
+# COALESCE_TTL_SECONDS afterwards (see single_flight.py)
+url_checks = SingleFlight(
+    ttl=float(os.environ.get('COALESCE_TTL_SECONDS', 10)),
+    clock=lambda: monitor_clock(),
+)
+
+# Alert hysteresis: downgrades need TRANSITION_CONFIRMATIONS of the last
+# TRANSITION_WINDOW results; upgrades to availability alert at once
+status_transitions = TransitionDetector(
+    confirmations=int(os.environ.get('TRANSITION_CONFIRMATIONS', 2)),
+    window=int(os.environ.get('TRANSITION_WINDOW', 3)),
+)
+
+# Check history and event retirement: past events, and events confirmed sold
+# out for ARCHIVE_SOLD_OUT_HOURS, leave the rotation and the snapshot.
+# Event ids carry no year, so retirement stays off until TOUR_YEAR is set
+HISTORY_DB_PATH = os.environ.get('HISTORY_DB_PATH', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'history.db'))
+TOUR_YEAR = int(os.environ['TOUR_YEAR']) if os.environ.get('TOUR_YEAR') else None
+ARCHIVE_EVENTS = os.environ.get('ARCHIVE_EVENTS', '1' if TOUR_YEAR else '0') != '0'
+history = HistoryStore(HISTORY_DB_PATH)
+lifecycle = LifecycleManager(
+    grace_days=int(os.environ.get('ARCHIVE_GRACE_DAYS', 1)),
+    sold_out_seconds=float(os.environ.get('ARCHIVE_SOLD_OUT_HOURS', 24)) * 3600,
+    year=TOUR_YEAR,
+)
+archived_event_ids = set()
+
+# Optional archive of fetched pages, one compressed copy per distinct page
+PAGE_ARCHIVE_DIR = os.environ.get('PAGE_ARCHIVE_DIR')  # Unset: pages are not kept
+PAGE_ARCHIVE_MAX_MB = int(os.environ.get('PAGE_ARCHIVE_MAX_MB', 256))
+page_archive = PageArchive(PAGE_ARCHIVE_DIR, PAGE_ARCHIVE_MAX_MB * 1024 * 1024) if PAGE_ARCHIVE_DIR else None
+checked_pages = {}  # Event URL -> page its latest check classified: archive hash and whether it was cut short
+
+# Fetched pages are streamed and capped so one huge response cannot bloat a worker
+MAX_PAGE_KB = int(os.environ.get('MAX_PAGE_KB', 2048))
+MAX_COMPRESSION_RATIO = int(os.environ.get('MAX_COMPRESSION_RATIO', 100))
+page_reader = PageReader(MAX_PAGE_KB * 1024, MAX_COMPRESSION_RATIO)
+
+# HTML parser used by the classifier: 'soup' (BeautifulSoup) or 'lxml' (see page_parser.py)
+PARSER_BACKEND = os.environ.get('PARSER_BACKEND', 'soup')
+page_document = parser_backend(PARSER_BACKEND)
+
+metrics.describe('monitor_checks_total', 'counter', 'Event checks by outcome')
+metrics.describe('monitor_breaker_trips_total', 'counter', 'Times an event breaker opened')
+metrics.describe('monitor_breaker_state', 'gauge', '1 for the current breaker state of each event')
+metrics.describe('monitor_url_checks_total', 'counter', 'Page checks by how they were served: leader fetched, inflight joined a running fetch, cached reused a fresh verdict')
+metrics.describe('monitor_status_changes_total', 'counter', 'Raw status changes: confirmed as a transition or suppressed')
+metrics.describe('monitor_events', 'gauge', 'Events by lifecycle state')
+metrics.describe('monitor_routed_alerts_total', 'counter', 'Alerts delivered to subscriber webhooks by routing rules')
+metrics.describe('monitor_alert_rules', 'gauge', 'Alert routing rules loaded')
+metrics.describe('monitor_watchlist_payloads_total', 'counter', 'Filtered snapshot payloads served from cache (hit) or built (miss)')
+metrics.describe('monitor_archived_pages_total', 'counter', 'Fetched pages by archive outcome: stored, duplicate (already archived) or evicted')
+metrics.describe('monitor_page_archive_bytes', 'gauge', 'Compressed bytes in the page archive')
+metrics.describe('monitor_page_truncations_total', 'counter', 'Fetched pages cut short: over MAX_PAGE_KB (size) or over MAX_COMPRESSION_RATIO (ratio)')
+metrics.describe('monitor_page_buffer_peak_bytes', 'gauge', 'Largest page body buffered by this worker')
+metrics.describe('monitor_snapshot_version', 'gauge', 'Snapshot version published by the last sweep')
+metrics.describe('monitor_last_sweep_age_seconds', 'gauge', 'Seconds since this worker last finished a sweep')
+
+# Health thresholds
+SWEEP_STALL_SECONDS = int(os.environ.get('SWEEP_STALL_SECONDS', 600))  # A sweep running longer than this is hung
+READY_SWEEP_INTERVALS = int(os.environ.get('READY_SWEEP_INTERVALS', 10))  # No finished sweep for this many check intervals means checking stalled
+
+def ready_max_sweep_age():
+    """Seconds without a finished sweep before /readyz fails; follows config reloads of CHECK_INTERVAL"""
+    return READY_SWEEP_INTERVALS * CHECK_INTERVAL
+
+# Admin endpoints are disabled unless ADMIN_TOKEN is set
+ADMIN_TOKEN = os.environ.get('ADMIN_TOKEN')
+PROFILE_DIR = os.environ.get('PROFILE_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'profiles'))
+MAX_PROFILE_SECONDS = 300
+active_profile = None  # File name of the profile currently being recorded
+failed_profiles = {}  # File name -> why its recording failed, for the download endpoint
+MAX_FAILED_PROFILES = 20
+
+# Web Push alerts are enabled when a VAPID key pair is configured (and pywebpush is installed)
+VAPID_PUBLIC_KEY = os.environ.get('VAPID_PUBLIC_KEY')
+VAPID_PRIVATE_KEY = os.environ.get('VAPID_PRIVATE_KEY')
+VAPID_SUBJECT = os.environ.get('VAPID_SUBJECT', 'mailto:alerts@example.com')
+PUSH_SUBSCRIPTIONS_PATH = os.environ.get('PUSH_SUBSCRIPTIONS_PATH', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'push_subscriptions.json'))
+PUSH_ENABLED = bool(VAPID_PUBLIC_KEY and VAPID_PRIVATE_KEY and webpush is not None)
+MAX_PUSH_SUBSCRIPTIONS = int(os.environ.get('MAX_PUSH_SUBSCRIPTIONS', 10000))
+push_subscriptions = SubscriptionStore(PUSH_SUBSCRIPTIONS_PATH, MAX_PUSH_SUBSCRIPTIONS)
+
+# Per-subscriber alert routing rules, each with its own webhook (see alert_rules.py)
+ALERT_RULES_PATH = os.environ.get('ALERT_RULES_PATH', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'alert_rules.json'))
+alert_rules = RuleStore(ALERT_RULES_PATH, BAD_BUNNY_EVENT_IDS, TOUR_YEAR or DEFAULT_TOUR_YEAR)
+
+# Per-client watchlists: the ticket endpoints serve only the watched events
+WATCHLISTS_PATH = os.environ.get('WATCHLISTS_PATH', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'watchlists.json'))
+WATCHLIST_COOKIE = 'bb_watchlist'
+WATCHLIST_COOKIE_MAX_AGE = 365 * 24 * 3600
+MAX_WATCHLISTS = int(os.environ.get('MAX_WATCHLISTS', 50000))
+watchlists = WatchlistStore(WATCHLISTS_PATH, BAD_BUNNY_EVENT_IDS, MAX_WATCHLISTS)
+watchlist_payloads = PayloadCache()
+
 # Hardcoded Bad Bunny dates to ensure complete coverage
 BAD_BUNNY_DATES = {
     'July': ['12', '18', '19'],
@@ -183,7 +357,7 @@ for month, days in BAD_BUNNY_DATES.items():
 for month, days in CONCERT_DATES.items():
     for day in days:
         event_id = f"{month.lower()}-{day}"
-        last_update_time[event_id] = datetime.min
+        last_update_time[event_id] = 0  # Never checked; same units as monitor_clock()
 
 def format_date(month, day):
     return f"{month} {day}, 2025"
@@ -288,22 +462,71 @@ def send_discord_notification(message, use_mentions=False, title=None, color=Non
         response.raise_for_status()
         return True
     except Exception as e:
-        print(f"Error sending Discord notification: {e}")
+        logger.error("Error sending Discord notification: %s", e)
         return False
 
-def check_ticketera_availability(event_url):
-    """Check if tickets are available on Ticketera."""
-    # Create a session with retry capability
-    session = requests.Session()
-    retry = Retry(
-        total=5,
-        backoff_factor=0.5,
-        status_forcelist=[500, 502, 503, 504],
-    )
-    adapter = HTTPAdapter(max_retries=retry)
-    session.mount('http://', adapter)
-    session.mount('https://', adapter)
+def send_push_alert(event_id, event_name, previous_status, status, event_url):
+    """
+    Push a status change to every subscribed device in a background thread
+    
+    Delivery is batched and concurrent; subscriptions the push service reports
+    as gone are pruned from the store.
+    """
+    if not PUSH_ENABLED or not len(push_subscriptions):
+        return None
+    
+    payload = {
+        "title": event_name,
+        "body": f"{previous_status} → {status}",
+        "eventId": event_id,
+        "status": status,
+        "url": event_url,
+        "urgent": "TICKETS AVAILABLE" in status or "CHECK NOW" in status,
+    }
+    
+    def run():
+        result = broadcast(push_subscriptions, payload, vapid_sender(VAPID_PRIVATE_KEY, VAPID_SUBJECT))
+        logger.info("Push alert for %s: %d sent, %d expired, %d failed", event_id,
+                    result['sent'], result['expired'], result['failed'], extra={'event_id': event_id})
+    
+    thread = threading.Thread(target=run, name='web-push', daemon=True)
+    thread.start()
+    return thread
+
+def send_routed_alerts(event_id, event_name, previous_status, status, event_url):
+    """
+    Deliver a confirmed transition to the subscribers whose rules match it
+    
+    Matching is an index lookup; delivery runs in a background thread.
+    """
+    matched = alert_rules.match(event_id, previous_status, status)
+    if not matched:
+        return None
+    
+    message = f"**Status Change** for {event_name}\n{previous_status} → {status}\n[Check Tickets]({event_url})"
     
+    def post(webhook, content):
+        response = requests.post(webhook, json={
+            "username": "Bad Bunny Ticket Monitor",
+            "avatar_url": "https://i.imgur.com/MQ3Dvz0.png",
+            "content": content,
+        }, timeout=10)
+        response.raise_for_status()
+        return True
+    
+    def run():
+        result = dispatch(matched, message, post)
+        metrics.inc('monitor_routed_alerts_total', result['sent'], result='sent')
+        metrics.inc('monitor_routed_alerts_total', result['failed'], result='failed')
+        logger.info("Routed alert for %s: %d rules, %d sent, %d failed", event_id, len(matched),
+                    result['sent'], result['failed'], extra={'event_id': event_id})
+    
+    thread = threading.Thread(target=run, name='alert-routing', daemon=True)
+    thread.start()
+    return thread
+
+def browser_request_headers():
+    """Headers and cookies that make a check look like a real browser visit"""
     # Rotate user agents to avoid detection
     user_agents = [
         # Chrome Windows
@@ -344,146 +567,82 @@ def check_ticketera_availability(event_url):
         "_fbp": f"fb.1.{int(time.time()) - random.randint(3600, 86400)}.{random.randint(1000000000, 9999999999)}",
     }
     
+    return headers, cookies
+
+def check_ticketera_availability(event_url, retries=CHECK_RETRIES):
+    """Check if tickets are available on Ticketera."""
+    # Create a session with retry capability
+    session = requests.Session()
+    retry = Retry(
+        total=retries,
+        backoff_factor=0.5,
+        status_forcelist=[500, 502, 503, 504],
+    )
+    adapter = HTTPAdapter(max_retries=retry)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    
+    headers, cookies = browser_request_headers()
+    
     # Add random delay to mimic human behavior (between 1 and 5 seconds)
-    time.sleep(random.uniform(1, 5))
+    monitor_sleep(random.uniform(1, 5))
+    checked_pages.pop(event_url, None)
     
     try:
-        # Get the page content
-        response = session.get(event_url, headers=headers, cookies=cookies, timeout=30)
-        response.raise_for_status()
-        
-        # Parse the html content
-        soup = BeautifulSoup(response.text, 'lxml')
-        
-        # Look for checkout links
-        checkout_links = []
-        # Search for checkout links in href attributes
-        checkout_pattern = "/checkout/"
-        for link in soup.find_all('a', href=True):
-            if checkout_pattern in link['href']:
-                checkout_links.append(link['href'])
-        
-        # Also look for checkout links in the page JavaScript
-        for script in soup.find_all('script'):
-            if script.string and checkout_pattern in script.string:
-                # Extract potential checkout URLs from JavaScript
-                script_text = script.string
-                start_idx = 0
-                while True:
-                    start_idx = script_text.find(checkout_pattern, start_idx)
-                    if start_idx == -1:
-                        break
-                    # Try to extract the full URL
-                    end_idx = script_text.find('"', start_idx)
-                    if end_idx == -1:
-                        end_idx = script_text.find("'", start_idx)
-                    if end_idx == -1:
-                        end_idx = script_text.find('\\', start_idx)
-                    if end_idx == -1:
-                        end_idx = script_text.find(' ', start_idx)
-                    if end_idx == -1:
-                        end_idx = start_idx + 100  # Limit to reasonable length
-                    
-                    potential_link = script_text[start_idx-20:end_idx].strip()
-                    if 'http' in potential_link:
-                        http_start = potential_link.find('http')
-                        potential_link = potential_link[http_start:]
-                        checkout_links.append(potential_link)
-                    else:
-                        checkout_links.append('https://choli.ticketera.com' + potential_link)
-                    
-                    start_idx = end_idx
-        
-        # If we found checkout links, this is highly valuable information
-        if checkout_links:
-            checkout_links = list(set(checkout_links))  # Remove duplicates
-            # Format the first checkout link for display
-            formatted_link = checkout_links[0]
-            if len(formatted_link) > 60:
-                formatted_link = formatted_link[:60] + "..."
-            
-            # Save the checkout links to a file for quick access
-            event_name = event_url.split('/')[-1]
-            with open(f"checkout_links_{event_name}.txt", "w") as f:
-                for link in checkout_links:
-                    f.write(link + "\n")
-            
-            # Return a special message with checkout link information
-            return f"🚨 DIRECT CHECKOUT AVAILABLE! 🚨 Link: {formatted_link}"
+        # Stream the page so its size is capped while it downloads
+        with session.get(event_url, headers=headers, cookies=cookies, timeout=30, stream=True) as response:
+            response.raise_for_status()
+            page_body, page_html, truncated = page_reader.read(response)
         
-        # Look for indicators of ticket availability
-        if "¡Entradas disponibles!" in response.text or "Comprar ahora" in response.text:
-            # Try to extract actual inventory numbers if available
-            try:
-                # Look for the inventory counter in the JSON data that's often embedded in the page
-                if "ticketsAvailable" in response.text or "availableCount" in response.text or "stockLevel" in response.text:
-                    # Try to extract JSON data from script tags
-                    scripts = soup.find_all('script')
-                    inventory_count = None
-                    
-                    for script in scripts:
-                        script_text = script.string if script.string else ""
-                        # Look for inventory-related JSON
-                        if "ticketsAvailable" in script_text or "availableCount" in script_text or "stockLevel" in script_text:
-                            try:
-                                # Find JSON objects in the script
-                                json_start = script_text.find('{')
-                                json_end = script_text.rfind('}') + 1
-                                if json_start >= 0 and json_end > json_start:
-                                    json_str = script_text[json_start:json_end]
-                                    # Try to clean and parse the JSON
-                                    json_data = json.loads(json_str)
-                                    # Look for inventory fields using various common names
-                                    for field in ['ticketsAvailable', 'availableCount', 'stockLevel', 'inventory', 'available', 'stock']:
-                                        if field in json_data:
-                                            inventory_count = json_data[field]
-                                            break
-                            except Exception as e:
-                                print(f"Error parsing JSON from script: {e}")
-                    
-                    if inventory_count is not None:
-                        return f"🔥 TICKETS AVAILABLE! {inventory_count} tickets in stock 🔥"
-                
-                # If we couldn't get exact inventory, try to find inventory indicators in the HTML
-                inventory_elements = soup.select('[data-inventory], [data-stock], .inventory-count, .stock-level, .tickets-available')
-                for element in inventory_elements:
-                    if element.get_text().strip() and any(c.isdigit() for c in element.get_text()):
-                        inventory_text = element.get_text().strip()
-                        return f"🔥 TICKETS AVAILABLE! Stock: {inventory_text} 🔥"
-            except Exception as e:
-                print(f"Error trying to extract inventory: {e}")
-                
-            # If all inventory extraction fails, just return the basic availability message
-            return "🔥 TICKETS AVAILABLE! CHECK NOW 🔥"
-        elif "coming soon" in response.text.lower() or "próximamente" in response.text.lower():
-            return "⚡ Coming Soon"
-        elif "sold out" in response.text.lower() or "agotado" in response.text.lower():
-            return "❌ Sold Out"
-        else:
-            # Check for specific elements that might indicate availability
-            buy_buttons = soup.select('button.buy-button, .checkout-button, .buy-now')
-            if buy_buttons:
-                return "⚠️ Possible Availability - CHECK NOW"
-            
-            # Check for waitlist or queue indicators
-            waitlist = soup.select('.waitlist, .queue, .waiting-room')
-            if waitlist:
-                return "⏳ In Queue/Waitlist"
-            
-            # Fallback message
-            return "⚡ Not Yet Available"
-            
+        error_status = truncated_page_status(truncated, len(page_body), event_url)
+        if error_status:
+            return error_status
+        archive_page(event_url, page_body, truncated)
+        return classify_ticketera_page(page_html, event_url)
+    
     except requests.exceptions.HTTPError as e:
-        if e.response.status_code == 403:
-            logger.error(f"Blocked by Ticketera: 403 Forbidden: {e}")
-            return "🚫 Access Blocked - Using Cached Status"
-        else:
-            logger.error(f"HTTP Error: {e}")
-            return "⚠️ Error Checking - Using Cached Status"
+        return http_error_status(e.response.status_code, e, event_url)
     except requests.exceptions.RequestException as e:
-        logger.error(f"Error checking Ticketera: {e}")
+        logger.error("Error checking Ticketera: %s", e, extra={'url': event_url})
         return "⚡ Error checking availability"
 
+def archive_page(event_url, body, truncated=None):
+    """Keep a copy of a fetched page and remember its hash and truncation for the check record"""
+    page = checked_pages[event_url] = {'page_hash': None, 'truncated': bool(truncated)}
+    if page_archive is None:
+        return None
+    try:
+        digest = page_archive.store(body)
+    except OSError as e:
+        logger.error("Could not archive page: %s", e, extra={'url': event_url})
+        return None
+    page['page_hash'] = digest
+    return digest
+
+def truncated_page_status(reason, size, event_url):
+    """Error status for a page that was abandoned, or None if it can be classified"""
+    if reason is None:
+        return None
+    if reason == TRUNCATED_RATIO:
+        logger.error("Abandoned page that inflates over %dx after %d bytes", page_reader.max_ratio, size,
+                     extra={'url': event_url})
+        return "⚠️ Error Checking - Using Cached Status"
+    # Still classified (and recorded as truncated): the status markers sit near the top
+    logger.warning("Page truncated at %d bytes", size, extra={'url': event_url})
+    return None
+
+def http_error_status(status_code, error, event_url):
+    """Display status for a Ticketera page that answered with an HTTP error"""
+    if status_code == 403:
+        logger.error("Blocked by Ticketera: 403 Forbidden: %s", error, extra={'url': event_url})
+        return "🚫 Access Blocked - Using Cached Status"
+    logger.error("HTTP Error: %s", error, extra={'url': event_url})
+    return "⚠️ Error Checking - Using Cached Status"
+
+def classify_ticketera_page(page_html, event_url, document_class=None):
+    """Classify a fetched Ticketera page with the configured parser backend."""
+    return page_classifier.classify_ticketera_page(page_html, event_url, document_class or page_document)
+
 async def add_to_cart(page, logger, event_url, browser_context, event_name, event_date, quantity=2):
     """
     Add tickets to cart for the given event and return the cart URL
@@ -642,6 +801,8 @@ async def add_to_cart(page, logger, event_url, browser_context, event_name, even
 
 def check_with_playwright(event_url, attempt_carting=False, event_id=None):
     """Enhanced browser-based check with carting capability"""
+    # The browser inspects the live DOM; there is no single page body to archive
+    checked_pages.pop(event_url, None)
     try:
         # Use our custom browser settings to avoid detection
         with sync_playwright() as p:
@@ -812,18 +973,69 @@ def check_with_playwright(event_url, attempt_carting=False, event_id=None):
             return ticket_status
     
     except Exception as e:
-        logger.error(f"Playwright error checking Ticketera: {e}")
+        logger.error("Playwright error checking Ticketera: %s", e, extra={'url': event_url})
         return "⚠️ Error Checking (Browser) - Using Cached Status"
 
-def update_ticket_status():
-    """Enhanced update function with fallback mechanisms and smart date selection"""
-    global ticket_status, last_check, last_update_time
+def event_url_for(event_id):
+    """Ticketera URL for an event id like 'july-12', falling back to the base URL"""
+    month, day = event_id.split('-')
+    month = month.capitalize()
+    if month in TICKETERA_URLS and day in TICKETERA_URLS[month]:
+        return TICKETERA_URLS[month][day]
+    return TICKETERA_BASE_URL
+
+def begin_sweep():
+    """
+    Start a sweep: record its start and pick the events to check this round
+    
+    Returns:
+        List of (event_id, event_url) to check, least recently checked first
+    """
+    global last_check, last_sweep_started, sweep_thread_ident
     
     last_check = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    last_sweep_started = monitor_clock()
+    sweep_thread_ident = threading.get_ident()
     
+    # A sweep uses one config revision: URLs and batch size are read together
+    with config_lock:
+        if ARCHIVE_EVENTS:
+            retire_finished_events()
+        return _select_sweep_events()
+
+def retire_finished_events():
+    """Move events that are over out of the rotation and the snapshot, into history"""
+    global snapshot_version, snapshot_updated
+    
+    now = monitor_clock()
+    try:
+        # Pick up events other workers retired
+        retired = history.archived_ids() - archived_event_ids
+        for event_id in BAD_BUNNY_EVENT_IDS:
+            if event_id in archived_event_ids or event_id in retired:
+                continue
+            reason = lifecycle.retirement_reason(event_id, status_transitions.confirmed(event_id), now)
+            if reason:
+                entry = ticket_status.get(event_id) or {'url': event_url_for(event_id)}
+                history.archive(event_id, entry, reason, now)
+                logger.info("Archived %s: %s", event_id, reason, extra={'event_id': event_id, 'reason': reason})
+                retired.add(event_id)
+    except sqlite3.Error as e:
+        logger.error("History store error while retiring events: %s", e)
+        return
+    
+    if retired:
+        archived_event_ids.update(retired)
+        for event_id in retired:
+            ticket_status.pop(event_id, None)
+            last_update_time.pop(event_id, None)
+        snapshot_version += 1
+        snapshot_updated = now
+
+def _select_sweep_events():
     # Generate all Bad Bunny event dates if not in ticket_status
     for event_id in BAD_BUNNY_EVENT_IDS:
-        if event_id not in ticket_status:
+        if event_id not in ticket_status and event_id not in archived_event_ids:
             # Extract month and day from the event ID
             month, day = event_id.split('-')
             month = month.capitalize()
@@ -831,16 +1043,11 @@ def update_ticket_status():
             # Set up initial status for this event
             date_str = f"{month} {day}, 2025"
             
-            # Get URL for this event if available, otherwise use the base URL
-            event_url = TICKETERA_BASE_URL
-            if month in TICKETERA_URLS and day in TICKETERA_URLS[month]:
-                event_url = TICKETERA_URLS[month][day]
-            
             ticket_status[event_id] = {
                 "name": f"Bad Bunny - {date_str}",
                 "date": date_str,
                 "status": "⚡ Not Yet Available",
-                "url": event_url,
+                "url": event_url_for(event_id),
                 "lastChecked": "Pending..."
             }
     
@@ -851,95 +1058,163 @@ def update_ticket_status():
     )
     
     # Only check a subset of dates each time, prioritizing those checked least recently
-    # This helps avoid triggering anti-bot detection
-    max_checks = min(MAX_DATES_PER_CHECK, len(sorted_dates))
-    dates_to_check = sorted_dates[:max_checks]
-    
-    for event_id in dates_to_check:
-        # Only update if we have the event in our tracking
-        if event_id in ticket_status:
-            # Extract month and day
-            month, day = event_id.split('-')
-            month = month.capitalize()
+    # This helps avoid triggering anti-bot detection. Events with an open breaker
+    # are skipped, so their slots go to events that are answering
+    now = monitor_clock()
+    selected = []
+    for event_id in sorted_dates:
+        if len(selected) >= MAX_DATES_PER_CHECK:
+            break
+        event_url = event_url_for(event_id)
+        if event_breakers.allow(event_id, event_url, now):
+            selected.append((event_id, event_url))
+    return selected
+
+def should_attempt_carting(event_id):
+    """Whether a check of this event should also try to cart tickets"""
+    return (
+        cart_config['enabled'] and  # Carting is enabled
+        event_id not in cart_session['completedCarts'] and  # Not already carted
+        event_id not in cart_session['activeCarts']  # Not currently carting
+    )
+
+def check_retries(event_id):
+    """Retry budget for an event's next check: minimal while its breaker is probing"""
+    return PROBE_RETRIES if event_breakers.state(event_id) == HALF_OPEN else CHECK_RETRIES
+
+def record_breaker_outcome(event_id, event_url, status):
+    """Feed a check result to the event's breaker"""
+    # A placeholder URL is the Ticketera home page, which never says anything about the event
+    placeholder = event_url == TICKETERA_BASE_URL
+    success = not placeholder and not is_check_failure(status)
+    reason = 'placeholder URL' if placeholder else (None if success else status)
+    metrics.inc('monitor_checks_total', result='ok' if success else 'failure')
+    
+    if event_breakers.record(event_id, event_url, success, monitor_clock(), reason, trip_now=placeholder):
+        metrics.inc('monitor_breaker_trips_total', event=event_id)
+        logger.warning("Circuit breaker opened for %s: %s", event_id, reason,
+                       extra={'event_id': event_id, 'breaker': event_breakers.describe(event_id, monitor_clock())})
+
+def record_check_result(event_id, event_url, status, attempt_carting=False):
+    """Apply one check result: notify on significant transitions and update the snapshot"""
+    record_breaker_outcome(event_id, event_url, status)
+    try:
+        page = checked_pages.get(event_url) or {}
+        history.record_check(event_id, status, event_url, monitor_clock(), page.get('page_hash'), page.get('truncated'))
+    except sqlite3.Error as e:
+        logger.error("Could not record check of %s: %s", event_id, e, extra={'event_id': event_id})
+    
+    # Update status and last check time
+    previous_status = ticket_status[event_id]["status"]
+    if previous_status != status:
+        logger.info("Status change for %s: %s → %s", event_id, previous_status, status,
+                    extra={'event_id': event_id, 'previous_status': previous_status, 'status': status})
+    
+    # Alerts follow confirmed transitions only: check errors and unconfirmed
+    # downgrades are shown on the dashboard but never notified
+    transition = status_transitions.observe(event_id, status, baseline=previous_status)
+    if transition is None:
+        if previous_status != status:
+            metrics.inc('monitor_status_changes_total', result='suppressed')
+    else:
+        confirmed_previous, _ = transition
+        metrics.inc('monitor_status_changes_total', result='confirmed')
+        logger.info("Confirmed transition for %s: %s → %s", event_id, confirmed_previous, status,
+                    extra={'event_id': event_id, 'previous_status': confirmed_previous, 'status': status})
+        
+        # Subscribers' rules decide for themselves which transitions they want
+        send_routed_alerts(event_id, ticket_status[event_id]["name"], confirmed_previous, status, event_url)
+        
+        # Only notify for certain status changes (to avoid notification spam)
+        should_notify = (
+            ("TICKETS AVAILABLE" in status) or
+            ("CHECK NOW" in status) or
+            (confirmed_previous != "⚡ Not Yet Available" and "Not Yet Available" not in status)
+        )
+        
+        if should_notify:
+            # Send Discord notification
+            event_name = ticket_status[event_id]["name"]
+            notification_text = f"**Status Change** for {event_name}\n{confirmed_previous} → {status}\n[Check Tickets]({event_url})"
             
-            # Get URL for this event
-            event_url = TICKETERA_BASE_URL
-            if month in TICKETERA_URLS and day in TICKETERA_URLS[month]:
-                event_url = TICKETERA_URLS[month][day]
+            send_push_alert(event_id, event_name, confirmed_previous, status, event_url)
             
+            # Add @everyone mention for high priority alerts
+            if "TICKETS AVAILABLE" in status or "CHECK NOW" in status:
+                send_discord_notification(notification_text, use_mentions=True)
+                
+                # If carting is enabled, automatically attempt to cart for available tickets
+                if (
+                    cart_config['enabled'] and 
+                    "TICKETS AVAILABLE" in status and
+                    event_id not in cart_session['completedCarts'] and
+                    event_id not in cart_session['activeCarts'] and
+                    PLAYWRIGHT_AVAILABLE and
+                    not attempt_carting  # Don't attempt twice in the same update
+                ):
+                    logger.info("Automatically attempting to cart tickets for %s", event_id, extra={'event_id': event_id})
+                    
+                    # Schedule carting attempt in a separate thread to not block the main thread
+                    threading.Thread(
+                        target=check_with_playwright,
+                        args=(event_url, True, event_id),
+                        daemon=True
+                    ).start()
+            else:
+                send_discord_notification(notification_text)
+    
+    # Update ticket status in our tracking
+    ticket_status[event_id].update({
+        "status": status,
+        "lastChecked": datetime.now().strftime("%H:%M:%S")
+    })
+    
+    # Update the last check time for this event
+    last_update_time[event_id] = monitor_clock()
+
+def finish_sweep(checked):
+    """End a sweep, publishing a new snapshot version if any event was checked"""
+    global last_sweep_finished, sweep_thread_ident, snapshot_version, snapshot_updated
+    
+    if checked:
+        snapshot_version += 1
+        snapshot_updated = monitor_clock()
+    
+    last_sweep_finished = monitor_clock()
+    sweep_thread_ident = None
+
+def update_ticket_status():
+    """Enhanced update function with fallback mechanisms and smart date selection"""
+    dates_to_check = []
+    try:
+        dates_to_check = begin_sweep()
+        jitter_max = JITTER_MAX
+        
+        for event_id, event_url in dates_to_check:
             # Check if we should attempt carting
-            attempt_carting = (
-                cart_config['enabled'] and  # Carting is enabled
-                event_id not in cart_session['completedCarts'] and  # Not already carted
-                event_id not in cart_session['activeCarts']  # Not currently carting
-            )
+            attempt_carting = should_attempt_carting(event_id)
             
             # 10% chance to use Playwright for enhanced anti-bot capabilities
             # Always use Playwright if attempting carting
             if (PLAYWRIGHT_AVAILABLE and random.random() < 0.10) or attempt_carting:
-                logger.info(f"Using Playwright to check {event_id} ({event_url})")
+                logger.info("Using Playwright to check %s (%s)", event_id, event_url,
+                            extra={'event_id': event_id, 'sample_key': ('playwright-check', event_id)})
                 status = check_with_playwright(event_url, attempt_carting, event_id)
             else:
                 # Otherwise use regular requests (which is faster but more detectable)
-                logger.info(f"Using Requests to check {event_id} ({event_url})")
-                status = check_ticketera_availability(event_url)
+                logger.info("Using Requests to check %s (%s)", event_id, event_url,
+                            extra={'event_id': event_id, 'sample_key': ('requests-check', event_id)})
+                retries = check_retries(event_id)
+                status = url_checks.do(event_url, lambda: check_ticketera_availability(event_url, retries=retries))
             
             # Add jitter to request timing to seem more human-like
-            time.sleep(random.uniform(1, JITTER_MAX))
-            
-            # Update status and last check time
-            previous_status = ticket_status[event_id]["status"]
-            
-            # Only send Discord notification if the status changed significantly
-            if previous_status != status:
-                logger.info(f"Status change for {event_id}: {previous_status} → {status}")
-                
-                # Only notify for certain status changes (to avoid notification spam)
-                should_notify = (
-                    ("TICKETS AVAILABLE" in status) or
-                    ("CHECK NOW" in status) or
-                    (previous_status != "⚡ Not Yet Available" and "Not Yet Available" not in status)
-                )
-                
-                if should_notify:
-                    # Send Discord notification
-                    event_name = ticket_status[event_id]["name"]
-                    notification_text = f"**Status Change** for {event_name}\n{previous_status} → {status}\n[Check Tickets]({event_url})"
-                    
-                    # Add @everyone mention for high priority alerts
-                    if "TICKETS AVAILABLE" in status or "CHECK NOW" in status:
-                        send_discord_notification(notification_text, use_mentions=True)
-                        
-                        # If carting is enabled, automatically attempt to cart for available tickets
-                        if (
-                            cart_config['enabled'] and 
-                            "TICKETS AVAILABLE" in status and
-                            event_id not in cart_session['completedCarts'] and
-                            event_id not in cart_session['activeCarts'] and
-                            PLAYWRIGHT_AVAILABLE and
-                            not attempt_carting  # Don't attempt twice in the same update
-                        ):
-                            logger.info(f"Automatically attempting to cart tickets for {event_id}")
-                            
-                            # Schedule carting attempt in a separate thread to not block the main thread
-                            import threading
-                            threading.Thread(
-                                target=check_with_playwright,
-                                args=(event_url, True, event_id),
-                                daemon=True
-                            ).start()
-                    else:
-                        send_discord_notification(notification_text)
-            
-            # Update ticket status in our tracking
-            ticket_status[event_id].update({
-                "status": status,
-                "lastChecked": datetime.now().strftime("%H:%M:%S")
-            })
-            
-            # Update the last check time for this event
-            last_update_time[event_id] = time.time()
+            monitor_sleep(random.uniform(1, jitter_max))
             
+            record_check_result(event_id, event_url, status, attempt_carting)
+    finally:
+        # A failed check must not leave the sweep looking like it is still running
+        finish_sweep(bool(dates_to_check))
+    
     # Return the full status for all events (even those not checked this round)
     return ticket_status
 
@@ -954,7 +1229,7 @@ def ensure_all_dates_exist():
             date_str = f"{month} {day}, 2025"
             
             # If this date doesn't exist in our tracking, add it
-            if event_id not in ticket_status:
+            if event_id not in ticket_status and event_id not in archived_event_ids:
                 # Get URL for this event if available, otherwise use the base URL
                 event_url = TICKETERA_BASE_URL
                 if month in TICKETERA_URLS and day in TICKETERA_URLS[month]:
@@ -969,6 +1244,46 @@ def ensure_all_dates_exist():
                     "lastChecked": current_time
                 }
 
+def apply_monitor_config(settings):
+    """Swap in a validated config revision; settings it leaves out revert to defaults"""
+    global CHECK_INTERVAL, MAX_DATES_PER_CHECK, JITTER_MAX, TICKETERA_URLS, snapshot_version, snapshot_updated
+    
+    urls = copy.deepcopy(CONFIG_DEFAULTS['event_urls'])
+    for month, days in settings.get('event_urls', {}).items():
+        urls.setdefault(month, {}).update(days)
+    
+    with config_lock:
+        CHECK_INTERVAL = settings.get('CHECK_INTERVAL', CONFIG_DEFAULTS['CHECK_INTERVAL'])
+        MAX_DATES_PER_CHECK = settings.get('MAX_DATES_PER_CHECK', CONFIG_DEFAULTS['MAX_DATES_PER_CHECK'])
+        JITTER_MAX = settings.get('JITTER_MAX', CONFIG_DEFAULTS['JITTER_MAX'])
+        urls_changed = urls != TICKETERA_URLS
+        TICKETERA_URLS = urls
+        # Keep the links shown on the dashboard (and in alerts) in step
+        for event_id, entry in ticket_status.items():
+            entry['url'] = event_url_for(event_id)
+        if urls_changed:
+            # New links are a new snapshot: ETags and cached payloads must not outlive them
+            snapshot_version += 1
+            snapshot_updated = monitor_clock()
+    
+    if urls_changed:
+        for listener in list(snapshot_listeners):
+            listener()
+
+config_watcher = ConfigWatcher(MONITOR_CONFIG_PATH, BAD_BUNNY_DATES, apply_monitor_config).start()
+
+@app.route('/api/config/version')
+def get_config_version():
+    """API endpoint describing the config revision this worker is running"""
+    info = config_watcher.describe()
+    info['pid'] = os.getpid()
+    info['settings'] = {
+        'CHECK_INTERVAL': CHECK_INTERVAL,
+        'MAX_DATES_PER_CHECK': MAX_DATES_PER_CHECK,
+        'JITTER_MAX': JITTER_MAX,
+    }
+    return jsonify(info)
+
 @app.route('/api/tickets')
 def get_tickets():
     """API endpoint for getting ticket status"""
@@ -985,7 +1300,7 @@ def get_tickets():
                 date = format_date(month, day)
                 event_url = generate_event_url(month, day)
                 
-                if not event_url:
+                if not event_url or event_id in archived_event_ids:
                     continue
                         
                 ticket_status[event_id] = {
@@ -997,14 +1312,114 @@ def get_tickets():
                 }
         
     # Update status if it's been more than CHECK_INTERVAL seconds
-    if not last_check or (datetime.now() - last_check).total_seconds() >= CHECK_INTERVAL:
+    if INLINE_SWEEPS and (last_sweep_started is None or monitor_clock() - last_sweep_started >= CHECK_INTERVAL):
         update_ticket_status()
         
     # If we still have no data, create fallback data
-    if not ticket_status or len(ticket_status) == 0:
-        return jsonify(generateFallbackData())
-            
-    return jsonify(ticket_status)
+    data = ticket_status if ticket_status else generateFallbackData()
+    
+    events = request_watchlist()
+    if events:
+        body, media_type, variant = watchlist_tickets_body(data, events, request.accept_mimetypes,
+                                                           request.headers.get('X-Event-Dictionary'))
+        response = app.response_class(body, mimetype=media_type)
+        response.headers['X-Watchlist'] = ','.join(events)
+        return with_snapshot_headers(response, variant)
+    
+    # Bots may ask for a compact binary encoding instead of JSON
+    compact = encode_compact_tickets(data, request.accept_mimetypes, request.headers.get('X-Event-Dictionary'))
+    if compact:
+        body, media_type, variant = compact
+        return with_snapshot_headers(app.response_class(body, mimetype=media_type), variant)
+    
+    return with_snapshot_headers(jsonify(data))
+
+def encode_compact_tickets(data, accept_mimetypes, client_dictionary):
+    """
+    Encode the snapshot compactly if the client negotiated it
+    
+    Returns:
+        (body, media type, ETag variant) or None when the client gets JSON
+    """
+    media_type = compact_status.negotiate(accept_mimetypes)
+    if not media_type:
+        return None
+    payload = compact_status.compact_snapshot(data, snapshot_version, client_dictionary)
+    # Responses with and without the event dictionary must not share an ETag
+    variant = f"{media_type.rsplit('/', 1)[-1]}-{'full' if 'events' in payload else payload['d']}"
+    return compact_status.encode(payload, media_type), media_type, variant
+
+def request_watchlist():
+    """Events on the requesting client's watchlist, or None to serve everything"""
+    token = request.headers.get('X-Watchlist-Token') or request.cookies.get(WATCHLIST_COOKIE)
+    return watchlists.get(token) if token else None
+
+def watchlist_tickets_body(data, events, accept_mimetypes=None, client_dictionary=None):
+    """
+    Snapshot filtered to a watchlist, encoded for the client
+    
+    Payloads are cached per watchlist signature and snapshot version, so
+    clients following the same events share one filter and encode.
+    
+    Returns:
+        (body, media type, ETag variant)
+    """
+    media_type = compact_status.negotiate(accept_mimetypes) if accept_mimetypes is not None else None
+    key = (signature(events), snapshot_version, media_type, client_dictionary if media_type else None)
+    cached = watchlist_payloads.get(key)
+    if cached:
+        return cached
+    
+    filtered = filter_snapshot(data, events)
+    compact = encode_compact_tickets(filtered, accept_mimetypes, client_dictionary) if media_type else None
+    if compact:
+        body, media_type, variant = compact
+        variant = f"w{key[0]}-{variant}"
+    else:
+        body, media_type, variant = app.json.dumps(filtered).encode('utf-8'), 'application/json', f"w{key[0]}"
+    watchlist_payloads.put(key, (body, media_type, variant))
+    return body, media_type, variant
+
+def with_snapshot_headers(response, variant=None):
+    """
+    Publish the snapshot version and the server's check schedule.
+    
+    Dashboards drive their single clock from the schedule; the version doubles
+    as an ETag so unchanged snapshots revalidate with a 304.
+    """
+    response.headers.update(snapshot_headers())
+    response.headers['Vary'] = 'Accept, X-Event-Dictionary, X-Watchlist-Token, Cookie'
+    response.set_etag(snapshot_etag(variant))
+    return response.make_conditional(request)
+
+def snapshot_headers():
+    """Schedule and snapshot headers shared by the Flask and ASGI ticket endpoints"""
+    now = monitor_clock()
+    next_check = (last_sweep_started if last_sweep_started is not None else now) + CHECK_INTERVAL
+    headers = {
+        'X-Server-Time': str(int(now * 1000)),
+        'X-Next-Check': str(int(next_check * 1000)),
+        'X-Check-Interval': str(CHECK_INTERVAL * 1000),
+        'X-Snapshot-Version': str(snapshot_version),
+    }
+    if archived_event_ids:
+        headers['X-Archived-Events'] = ','.join(sorted(archived_event_ids))
+    if snapshot_updated is not None:
+        headers['X-Snapshot-Time'] = str(int(snapshot_updated * 1000))
+    return headers
+
+def snapshot_etag(variant=None):
+    # Each gunicorn worker keeps its own snapshot, so the pid is part of the tag
+    etag = f"{os.getpid()}-{snapshot_version}"
+    return f"{etag}-{variant}" if variant else etag
+
+@app.route('/sw.js')
+def service_worker():
+    """Serve the service worker from the root so it can control the dashboard"""
+    response = send_from_directory(app.static_folder, 'sw.js', mimetype='text/javascript', max_age=0)
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['Service-Worker-Allowed'] = '/'
+    return response
 
 def generateFallbackData():
     """Generate fallback data for all dates in case of API failure"""
@@ -1014,6 +1429,8 @@ def generateFallbackData():
     for month, days in CONCERT_DATES.items():
         for day in days:
             event_id = f"{month.lower()}-{day}"
+            if event_id in archived_event_ids:
+                continue
             date = format_date(month, day)
             fallback_data[event_id] = {
                 'name': f"Bad Bunny - {date}",
@@ -1029,6 +1446,352 @@ def generateFallbackData():
 def index():
     return render_template('index.html')
 
+@app.route('/assets/<path:filename>')
+def hashed_asset(filename):
+    """Serve content-hashed bundles, precompressed when the client accepts it"""
+    disk_name, encoding = select_encoding(filename, request.headers.get('Accept-Encoding'))
+    response = send_from_directory(DIST_DIR, disk_name, mimetype=guess_mimetype(filename), max_age=31536000)
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    response.headers['Vary'] = 'Accept-Encoding'
+    response.headers['Cache-Control'] = IMMUTABLE_CACHE_CONTROL
+    return response
+
+def monitor_health():
+    """Summarize checker progress from in-memory sweep state (no I/O)"""
+    now = monitor_clock()
+    sweep_in_progress = (
+        last_sweep_started is not None and
+        (last_sweep_finished is None or last_sweep_finished < last_sweep_started)
+    )
+    oldest_check = min(last_update_time.values(), default=0) or monitor_started
+    sweep_age = now - (last_sweep_finished if last_sweep_finished is not None else monitor_started)
+    max_sweep_age = ready_max_sweep_age()
+    
+    return {
+        'uptime': round(now - monitor_started, 3),
+        'lastSweepAge': round(now - last_sweep_finished, 3) if last_sweep_finished is not None else None,
+        'maxSweepAge': max_sweep_age,
+        'checksStale': sweep_age > max_sweep_age,
+        'inlineSweeps': INLINE_SWEEPS,
+        'sweepInProgress': sweep_in_progress,
+        'sweepRunningFor': round(now - last_sweep_started, 3) if sweep_in_progress else None,
+        'oldestEventAge': round(now - oldest_check, 3),
+        'eventsTracked': len(ticket_status),
+        'openBreakers': sum(1 for breaker in event_breakers.snapshot(now).values() if breaker['state'] == 'open')
+    }
+
+@app.route('/healthz')
+def healthz():
+    """Liveness probe: fails only when a sweep has hung"""
+    health = monitor_health()
+    healthy = not (health['sweepInProgress'] and health['sweepRunningFor'] > SWEEP_STALL_SECONDS)
+    health['status'] = 'ok' if healthy else 'sweep stalled'
+    return jsonify(health), 200 if healthy else 503
+
+@app.route('/readyz')
+def readyz():
+    """
+    Readiness probe: fails when a sweep has hung or no sweep has finished
+    within READY_SWEEP_INTERVALS check intervals.
+    
+    Applies with inline sweeps too: a worker that serves the dashboard sweeps
+    every CHECK_INTERVAL, so one that has not swept for many intervals is
+    serving stale statuses either way.
+    """
+    health = monitor_health()
+    if health['sweepInProgress'] and health['sweepRunningFor'] > SWEEP_STALL_SECONDS:
+        health['status'] = 'sweep stalled'
+    elif health['lastSweepAge'] is None:
+        # Give a fresh process one window to complete its first sweep
+        health['status'] = 'starting' if health['uptime'] <= health['maxSweepAge'] else 'no sweep completed'
+    elif health['checksStale']:
+        health['status'] = 'checking stalled'
+    else:
+        health['status'] = 'ok'
+    ready = health['status'] in ('ok', 'starting')
+    return jsonify(health), 200 if ready else 503
+
+@app.route('/api/breakers')
+def get_breakers():
+    """API endpoint listing each event's circuit breaker state"""
+    return jsonify({'pid': os.getpid(), 'breakers': event_breakers.snapshot(monitor_clock())})
+
+@app.route('/api/history/archived')
+def get_archived_events():
+    """API endpoint listing retired events with their final status"""
+    return jsonify({'events': history.archived()})
+
+EXPORT_FORMATS = {'csv': 'text/csv', 'ndjson': 'application/x-ndjson'}
+EXPORT_FIELDS = ('event_id', 'checked_at', 'time', 'status', 'url', 'page_hash', 'truncated')
+EXPORT_FLUSH_BYTES = 64 * 1024
+
+def export_rows(event_ids, since, until, changes_only):
+    """History rows for an export, optionally only those where an event's status changed"""
+    previous = (None, None)
+    for row in history.iter_checks(event_ids, since, until):
+        if changes_only:
+            if (row['event_id'], row['status']) == previous:
+                continue
+            previous = (row['event_id'], row['status'])
+        yield {
+            'event_id': row['event_id'],
+            'checked_at': row['checked_at'],
+            'time': datetime.fromtimestamp(row['checked_at'], timezone.utc).isoformat(),
+            'status': row['status'],
+            'url': row['url'],
+            'page_hash': row['page_hash'],
+            'truncated': bool(row['truncated']),
+        }
+
+def export_chunks(rows, export_format):
+    """Encode rows as CSV or NDJSON, yielding chunks of about EXPORT_FLUSH_BYTES"""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, EXPORT_FIELDS)
+    if export_format == 'csv':
+        writer.writeheader()
+    try:
+        for row in rows:
+            if export_format == 'csv':
+                writer.writerow(row)
+            else:
+                buffer.write(json.dumps(row, ensure_ascii=False) + '\n')
+            if buffer.tell() >= EXPORT_FLUSH_BYTES:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+    except sqlite3.Error as e:
+        # Headers are already sent; the client sees a short export
+        logger.error("History export failed: %s", e)
+    yield buffer.getvalue()
+
+@app.route('/api/history/export')
+def export_history():
+    """
+    API endpoint streaming check history as CSV or NDJSON.
+
+    Query parameters: format (csv or ndjson), events (comma-separated ids,
+    default all), since/until (Unix seconds) and changes=1 to keep only the
+    checks where an event's status changed. Rows are ordered by event, then time.
+    """
+    export_format = request.args.get('format', 'csv')
+    if export_format not in EXPORT_FORMATS:
+        return jsonify({'error': f"format must be one of {', '.join(EXPORT_FORMATS)}"}), 400
+    event_ids = None
+    if request.args.get('events'):
+        event_ids = sorted(set(request.args['events'].split(',')))
+        unknown = [event_id for event_id in event_ids if event_id not in BAD_BUNNY_EVENT_IDS]
+        if unknown:
+            return jsonify({'error': f"Unknown events: {', '.join(unknown)}"}), 400
+    since = request.args.get('since', type=float)
+    until = request.args.get('until', type=float)
+    changes_only = request.args.get('changes') in ('1', 'true')
+
+    rows = export_rows(event_ids, since, until, changes_only)
+    response = app.response_class(export_chunks(rows, export_format), mimetype=EXPORT_FORMATS[export_format])
+    response.headers['Content-Disposition'] = f'attachment; filename="history.{export_format}"'
+    response.headers['Cache-Control'] = 'no-store'
+    return response
+
+@app.route('/api/history/<event_id>')
+def get_event_history(event_id):
+    """API endpoint returning an event's recent checks, newest first"""
+    if event_id not in BAD_BUNNY_EVENT_IDS:
+        return jsonify({'error': 'Unknown event'}), 404
+    limit = min(request.args.get('limit', 100, type=int), 1000)
+    return jsonify({
+        'event_id': event_id,
+        'archived': history.archived().get(event_id),
+        'checks': history.checks(event_id, request.args.get('since', type=float),
+                                 request.args.get('until', type=float), limit),
+    })
+
+@app.route('/metrics')
+def prometheus_metrics():
+    """Prometheus scrape endpoint (counters are per worker process)"""
+    gauges = [
+        ('monitor_snapshot_version', {}, snapshot_version),
+        ('monitor_events', {'state': 'active'}, len(ticket_status)),
+        ('monitor_events', {'state': 'archived'}, len(archived_event_ids)),
+        ('monitor_alert_rules', {}, len(alert_rules)),
+    ]
+    if last_sweep_finished is not None:
+        gauges.append(('monitor_last_sweep_age_seconds', {}, round(monitor_clock() - last_sweep_finished, 3)))
+    for result, count in watchlist_payloads.stats.items():
+        gauges.append(('monitor_watchlist_payloads_total', {'result': result}, count))
+    if page_archive is not None:
+        for result, count in page_archive.stats.items():
+            gauges.append(('monitor_archived_pages_total', {'result': result}, count))
+        gauges.append(('monitor_page_archive_bytes', {}, page_archive.total_bytes))
+    for reason, count in page_reader.stats.items():
+        gauges.append(('monitor_page_truncations_total', {'reason': reason}, count))
+    gauges.append(('monitor_page_buffer_peak_bytes', {}, page_reader.peak_bytes))
+    for kind, count in url_checks.stats.items():
+        gauges.append(('monitor_url_checks_total', {'kind': kind}, count))
+    for event_id, breaker in event_breakers.snapshot(monitor_clock()).items():
+        for state in ('closed', 'open', 'half-open'):
+            gauges.append(('monitor_breaker_state', {'event': event_id, 'state': state},
+                           1 if breaker['state'] == state else 0))
+    return app.response_class(metrics.render(gauges), mimetype='text/plain; version=0.0.4')
+
+def admin_authorized():
+    """Check the request's admin token against ADMIN_TOKEN"""
+    token = request.headers.get('X-Admin-Token', '')
+    return bool(ADMIN_TOKEN) and hmac.compare_digest(token.encode(), ADMIN_TOKEN.encode())
+
+@app.route('/admin/profile', methods=['POST'])
+def start_sweep_profile():
+    """Admin endpoint: sample the sweep thread for N seconds into a collapsed-stack file"""
+    global active_profile
+    
+    if not admin_authorized():
+        return jsonify({'error': 'Not found'}), 404
+    
+    seconds = request.args.get('seconds', 30, type=float)
+    if not 0 < seconds <= MAX_PROFILE_SECONDS:
+        return jsonify({'error': f'seconds must be between 0 and {MAX_PROFILE_SECONDS}'}), 400
+    
+    if active_profile:
+        return jsonify({'error': 'A profile is already being recorded', 'file': active_profile}), 409
+    
+    filename = f"sweep-{datetime.now().strftime('%Y%m%d_%H%M%S')}-{os.getpid()}.collapsed"
+    active_profile = filename
+    
+    def on_done(path, samples, idle, error):
+        global active_profile
+        if error is not None:
+            failed_profiles[filename] = f"{type(error).__name__}: {error}"
+            while len(failed_profiles) > MAX_FAILED_PROFILES:
+                failed_profiles.pop(next(iter(failed_profiles)))
+            logger.error("Sweep profile %s failed: %s", path, error)
+        else:
+            logger.info("Sweep profile written to %s (%d samples, %d idle ticks)", path, samples, idle)
+        active_profile = None
+    
+    # Only the thread running a sweep is sampled; ticks between sweeps count as idle
+    start_profile(lambda: sweep_thread_ident, seconds, os.path.join(PROFILE_DIR, filename), on_done=on_done)
+    
+    return jsonify({
+        'file': filename,
+        'seconds': seconds,
+        'pid': os.getpid(),
+        'download': f"/admin/profile/{filename}"
+    }), 202
+
+@app.route('/admin/profile/<path:filename>', methods=['GET'])
+def download_sweep_profile(filename):
+    """Admin endpoint: download a finished collapsed-stack profile"""
+    if not admin_authorized():
+        return jsonify({'error': 'Not found'}), 404
+    if filename == active_profile:
+        return jsonify({'error': 'Profile still recording'}), 409
+    if filename in failed_profiles:
+        return jsonify({'error': 'Profile recording failed', 'reason': failed_profiles[filename]}), 500
+    return send_from_directory(PROFILE_DIR, filename, mimetype='text/plain')
+
+@app.route('/api/watchlist', methods=['GET'])
+def get_watchlist():
+    """API endpoint returning the events on this client's watchlist (empty: all events)"""
+    return jsonify({'events': request_watchlist() or []})
+
+@app.route('/api/watchlist', methods=['PUT'])
+def save_watchlist():
+    """API endpoint replacing this client's watchlist; an empty list follows every event again"""
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return jsonify({'error': 'body must be a JSON object with an events list'}), 400
+    token = request.headers.get('X-Watchlist-Token') or request.cookies.get(WATCHLIST_COOKIE)
+    if watchlists.get(token) is None:
+        # Only tokens this server issued and still holds are reused
+        token = new_token()
+    try:
+        events = watchlists.set(token, data.get('events'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except StoreFull as e:
+        return jsonify({'error': str(e)}), 503
+    response = jsonify({'token': token, 'events': events})
+    response.set_cookie(WATCHLIST_COOKIE, token, max_age=WATCHLIST_COOKIE_MAX_AGE,
+                        httponly=True, samesite='Lax', secure=request.is_secure)
+    return response
+
+@app.route('/api/watchlist', methods=['DELETE'])
+def delete_watchlist():
+    """API endpoint forgetting this client's watchlist"""
+    token = request.headers.get('X-Watchlist-Token') or request.cookies.get(WATCHLIST_COOKIE)
+    if token:
+        watchlists.remove(token)
+    response = jsonify({'success': True})
+    response.delete_cookie(WATCHLIST_COOKIE)
+    return response
+
+@app.route('/api/push/config', methods=['GET'])
+def get_push_config():
+    """API endpoint for the VAPID public key browsers need to subscribe"""
+    return jsonify({'enabled': PUSH_ENABLED, 'publicKey': VAPID_PUBLIC_KEY if PUSH_ENABLED else None})
+
+@app.route('/api/push/subscribe', methods=['POST'])
+def push_subscribe():
+    """API endpoint for registering a browser PushSubscription"""
+    if not PUSH_ENABLED:
+        return jsonify({'error': 'Web Push is not configured'}), 404
+    try:
+        push_subscriptions.add(request.get_json(silent=True))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except StoreFull as e:
+        return jsonify({'error': str(e)}), 503
+    return jsonify({'success': True}), 201
+
+@app.route('/api/push/unsubscribe', methods=['POST'])
+def push_unsubscribe():
+    """API endpoint for removing a browser PushSubscription"""
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict) or not isinstance(data.get('endpoint'), str):
+        return jsonify({'error': 'endpoint is required'}), 400
+    removed = push_subscriptions.remove([data['endpoint']])
+    return jsonify({'success': True, 'removed': removed})
+
+@app.route('/admin/pages/<digest>', methods=['GET'])
+def download_archived_page(digest):
+    """Admin endpoint: the archived page a check record points to, as a download"""
+    if not admin_authorized() or page_archive is None:
+        return jsonify({'error': 'Not found'}), 404
+    body = page_archive.load(digest)
+    if body is None:
+        return jsonify({'error': 'Not found'}), 404
+    # Never render scraped HTML on our own origin
+    response = app.response_class(body, mimetype='text/plain')
+    response.headers['Content-Disposition'] = f'attachment; filename="{digest}.html"'
+    return response
+
+@app.route('/admin/alert-rules', methods=['GET'])
+def list_alert_rules():
+    """Admin endpoint: list alert routing rules (they contain webhook URLs)"""
+    if not admin_authorized():
+        return jsonify({'error': 'Not found'}), 404
+    return jsonify({'rules': alert_rules.all()})
+
+@app.route('/admin/alert-rules', methods=['POST'])
+def add_alert_rule():
+    """Admin endpoint: add or replace (by id) an alert routing rule"""
+    if not admin_authorized():
+        return jsonify({'error': 'Not found'}), 404
+    try:
+        rule = alert_rules.add(request.get_json(silent=True))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    return jsonify({'success': True, 'rule': rule})
+
+@app.route('/admin/alert-rules/<rule_id>', methods=['DELETE'])
+def delete_alert_rule(rule_id):
+    """Admin endpoint: remove an alert routing rule"""
+    if not admin_authorized():
+        return jsonify({'error': 'Not found'}), 404
+    if not alert_rules.remove(rule_id):
+        return jsonify({'error': 'Unknown rule'}), 404
+    return jsonify({'success': True})
+
 @app.route('/api/cart-config', methods=['GET'])
 def get_cart_config():
     """API endpoint for getting cart configuration"""
@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+"""
+ASGI Serving Mode
+
+Serves the monitor from a single asyncio event loop under uvicorn:
+
+- /api/tickets is answered from the in-memory snapshot (same JSON, schedule
+  headers and ETag as the Flask endpoint, but never runs a sweep). Watchlist
+  lookups and encoding run in a thread, as do the stream's.
+- /api/stream is a Server-Sent Events feed that pushes the snapshot whenever a
+  sweep publishes a new version. An idle stream costs one coroutine, not a
+  worker thread, so thousands of open dashboards are cheap.
+- A check engine runs sweeps on the same loop: pages are fetched with aiohttp,
+  while classification, notifications and Playwright checks run in the
+  default thread pool so they never block the loop.
+- Every other route (dashboard, assets, admin, cart, push) is the unchanged
+  Flask app, run through a WSGI adapter.
+
+The gunicorn deployment (app:app) keeps working as before. Run one uvicorn
+process only, since each process would start its own check engine:
+
+    uvicorn asgi_app:app --host 0.0.0.0 --port $PORT
+    python asgi_app.py
+"""
+import os
+import json
+import random
+import asyncio
+import logging
+
+import aiohttp
+from werkzeug.datastructures import MIMEAccept
+from werkzeug.http import parse_accept_header, parse_cookie
+
+import app as monitor
+
+try:
+    from uvicorn.middleware.wsgi import WSGIMiddleware
+except ImportError:
+    WSGIMiddleware = None
+
+logger = logging.getLogger(__name__)
+
+STREAM_HEARTBEAT_SECONDS = 15  # Comment lines keep proxies from closing idle streams
+WSGI_THREADS = int(os.environ.get('ASGI_WSGI_THREADS', 10))  # Threads for the Flask routes
+RETRY_STATUSES = (500, 502, 503, 504)
+MAX_RETRIES = 5
+
+
+class SnapshotFeed:
+    """Wakes every waiting stream when a sweep publishes a new snapshot"""
+
+    def __init__(self):
+        self._changed = asyncio.Event()
+
+    def publish(self):
+        changed, self._changed = self._changed, asyncio.Event()
+        changed.set()
+
+    async def wait(self):
+        await self._changed.wait()
+
+
+class CheckEngine:
+    """Runs the monitor's sweeps on the event loop"""
+
+    def __init__(self, feed):
+        self.feed = feed
+
+    async def run(self):
+        # No cookie jar: each check gets fresh browser-like cookies, as with requests
+        async with aiohttp.ClientSession(cookie_jar=aiohttp.DummyCookieJar()) as session:
+            while True:
+                started = monitor.monitor_clock()
+                try:
+                    await self.sweep(session)
+                except Exception:
+                    logger.exception("Sweep failed")
+                elapsed = monitor.monitor_clock() - started
+                await asyncio.sleep(max(1.0, monitor.CHECK_INTERVAL - elapsed))
+
+    async def sweep(self, session):
+        loop = asyncio.get_running_loop()
+        dates_to_check = []
+        try:
+            dates_to_check = monitor.begin_sweep()
+            jitter_max = monitor.JITTER_MAX
+
+            for event_id, event_url in dates_to_check:
+                attempt_carting = monitor.should_attempt_carting(event_id)
+
+                # Same Playwright policy as update_ticket_status; the sync API needs its own thread
+                if (monitor.PLAYWRIGHT_AVAILABLE and random.random() < 0.10) or attempt_carting:
+                    logger.info("Using Playwright to check %s (%s)", event_id, event_url,
+                                extra={'event_id': event_id, 'sample_key': ('playwright-check', event_id)})
+                    status = await loop.run_in_executor(
+                        None, monitor.check_with_playwright, event_url, attempt_carting, event_id)
+                else:
+                    logger.info("Using aiohttp to check %s (%s)", event_id, event_url,
+                                extra={'event_id': event_id, 'sample_key': ('aiohttp-check', event_id)})
+                    retries = monitor.check_retries(event_id)
+                    status = await monitor.url_checks.do_async(
+                        event_url, lambda: self.check(session, event_url, retries))
+
+                # Add jitter to request timing to seem more human-like
+                await asyncio.sleep(random.uniform(1, jitter_max))
+
+                # Notifications post to Discord and Web Push with blocking clients
+                await loop.run_in_executor(
+                    None, monitor.record_check_result, event_id, event_url, status, attempt_carting)
+        finally:
+            # A failed or cancelled check must not leave the sweep looking like it is still running
+            monitor.finish_sweep(bool(dates_to_check))
+            self.feed.publish()
+
+    async def check(self, session, event_url, max_retries=MAX_RETRIES):
+        """Async counterpart of check_ticketera_availability"""
+        headers, cookies = monitor.browser_request_headers()
+
+        # Add random delay to mimic human behavior (between 1 and 5 seconds)
+        await asyncio.sleep(random.uniform(1, 5))
+        monitor.checked_pages.pop(event_url, None)
+
+        try:
+            for attempt in range(max_retries + 1):
+                async with session.get(event_url, headers=headers, cookies=cookies,
+                                       timeout=aiohttp.ClientTimeout(total=30)) as response:
+                    if response.status in RETRY_STATUSES and attempt < max_retries:
+                        await asyncio.sleep(0.5 * 2 ** attempt)
+                        continue
+                    if response.status >= 400:
+                        error = f"{response.status} {response.reason} for url: {event_url}"
+                        return monitor.http_error_status(response.status, error, event_url)
+                    page_body, page_html, truncated = await monitor.page_reader.read_async(response)
+                    break
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.error("Error checking Ticketera: %s", e, extra={'url': event_url})
+            return "⚡ Error checking availability"
+
+        error_status = monitor.truncated_page_status(truncated, len(page_body), event_url)
+        if error_status:
+            return error_status
+
+        # Compression, archive writes and BeautifulSoup parsing all block; keep them off the loop
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, monitor.archive_page, event_url, page_body, truncated)
+        return await loop.run_in_executor(None, monitor.classify_ticketera_page, page_html, event_url)
+
+
+def snapshot_data():
+    monitor.ensure_all_dates_exist()
+    return monitor.ticket_status or monitor.generateFallbackData()
+
+
+def snapshot_body():
+    return monitor.app.json.dumps(snapshot_data()).encode('utf-8')
+
+
+def _header(scope, name):
+    for key, value in scope.get('headers', []):
+        if key == name:
+            return value.decode('latin-1')
+    return None
+
+
+def _watchlist(scope):
+    """Same lookup as app.request_watchlist, from raw ASGI headers"""
+    token = _header(scope, b'x-watchlist-token') or parse_cookie(_header(scope, b'cookie') or '').get(monitor.WATCHLIST_COOKIE)
+    return monitor.watchlists.get(token) if token else None
+
+
+def tickets_response(scope):
+    """(status, headers, body) for /api/tickets; reads the watchlist store and encodes, so run it off the loop"""
+    accept = parse_accept_header(_header(scope, b'accept'), MIMEAccept)
+    events = _watchlist(scope)
+    if events:
+        body, media_type, variant = monitor.watchlist_tickets_body(
+            snapshot_data(), events, accept, _header(scope, b'x-event-dictionary'))
+    else:
+        compact = monitor.encode_compact_tickets(snapshot_data(), accept, _header(scope, b'x-event-dictionary'))
+        if compact:
+            body, media_type, variant = compact
+        else:
+            body, media_type, variant = None, 'application/json', None
+
+    etag = f'"{monitor.snapshot_etag(variant)}"'
+    headers = [(key.lower().encode(), value.encode()) for key, value in monitor.snapshot_headers().items()]
+    headers += [(b'etag', etag.encode()), (b'vary', b'Accept, X-Event-Dictionary, X-Watchlist-Token, Cookie')]
+    if events:
+        headers.append((b'x-watchlist', ','.join(events).encode()))
+
+    if etag in (_header(scope, b'if-none-match') or ''):
+        return 304, headers, b''
+
+    if body is None:
+        body = snapshot_body()
+    headers += [(b'content-type', media_type.encode()), (b'content-length', str(len(body)).encode())]
+    return 200, headers, body
+
+
+async def tickets_endpoint(scope, send):
+    status, headers, body = await asyncio.to_thread(tickets_response, scope)
+    await send({'type': 'http.response.start', 'status': status, 'headers': headers})
+    # HEAD keeps the GET headers, content-length included, but sends no body
+    await send({'type': 'http.response.body', 'body': b'' if scope['method'] == 'HEAD' else body})
+
+
+def stream_body(events):
+    """Snapshot payload for a stream, filtered to its watchlist if it has one"""
+    if events:
+        body, _, _ = monitor.watchlist_tickets_body(snapshot_data(), events)
+        return body
+    return snapshot_body()
+
+
+async def stream_endpoint(scope, receive, send, feed):
+    """Server-Sent Events: one 'snapshot' event per published version"""
+    await send({
+        'type': 'http.response.start',
+        'status': 200,
+        'headers': [
+            (b'content-type', b'text/event-stream'),
+            (b'cache-control', b'no-cache'),
+            (b'x-accel-buffering', b'no'),  # Stop reverse proxies from buffering the stream
+        ],
+    })
+
+    async def wait_for_disconnect():
+        while (await receive())['type'] != 'http.disconnect':
+            pass
+
+    disconnected = asyncio.ensure_future(wait_for_disconnect())
+    sent_version = _header(scope, b'last-event-id')
+    events = await asyncio.to_thread(_watchlist, scope)
+    sent_body = None
+    try:
+        while not disconnected.done():
+            version = str(monitor.snapshot_version)
+            if version != sent_version:
+                body = await asyncio.to_thread(stream_body, events)
+                meta = json.dumps({key.lower(): value for key, value in monitor.snapshot_headers().items()})
+                message = f"event: schedule\ndata: {meta}\n\n"
+                # A new version that leaves the watched events unchanged only moves the schedule
+                if body != sent_body:
+                    message = f"event: snapshot\nid: {version}\ndata: {body.decode('utf-8')}\n\n" + message
+                    sent_body = body
+                sent_version = version
+            else:
+                message = ": keepalive\n\n"
+            await send({'type': 'http.response.body', 'body': message.encode('utf-8'), 'more_body': True})
+
+            changed = asyncio.ensure_future(feed.wait())
+            await asyncio.wait({changed, disconnected}, timeout=STREAM_HEARTBEAT_SECONDS,
+                               return_when=asyncio.FIRST_COMPLETED)
+            changed.cancel()
+    finally:
+        disconnected.cancel()
+
+
+def create_app():
+    """Build the ASGI application; the check engine starts with the lifespan"""
+    if WSGIMiddleware is None:
+        raise RuntimeError("uvicorn is not installed: pip install uvicorn")
+
+    flask_app = WSGIMiddleware(monitor.app, workers=WSGI_THREADS)
+    state = {}
+
+    async def lifespan(receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                # Sweeps come from the engine, never from requests
+                monitor.INLINE_SWEEPS = False
+                state['feed'] = SnapshotFeed()
+                # Config reloads change the snapshot from the watcher thread; publish on the loop
+                loop = asyncio.get_running_loop()
+                state['listener'] = lambda: loop.call_soon_threadsafe(state['feed'].publish)
+                monitor.snapshot_listeners.append(state['listener'])
+                state['engine'] = asyncio.ensure_future(CheckEngine(state['feed']).run())
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                if state.get('listener') in monitor.snapshot_listeners:
+                    monitor.snapshot_listeners.remove(state['listener'])
+                engine = state.get('engine')
+                if engine:
+                    engine.cancel()
+                    await asyncio.gather(engine, return_exceptions=True)
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    async def asgi(scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await lifespan(receive, send)
+        elif scope['type'] != 'http':
+            return
+        elif scope['path'] == '/api/tickets' and scope['method'] in ('GET', 'HEAD'):
+            await tickets_endpoint(scope, send)
+        elif scope['path'] == '/api/stream' and scope['method'] == 'GET':
+            if 'feed' not in state:
+                state['feed'] = SnapshotFeed()
+            await stream_endpoint(scope, receive, send, state['feed'])
+        else:
+            await flask_app(scope, receive, send)
+
+    return asgi
+
+
+app = create_app() if WSGIMiddleware is not None else None
+
+
+if __name__ == "__main__":
+    import uvicorn
+    uvicorn.run(create_app(), host='0.0.0.0', port=int(os.getenv('PORT', 8000)),
+                timeout_keep_alive=65, lifespan='on')
@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+Static Asset Pipeline
+
+Build step and serving helpers for the dashboard's CSS and JS.
+
+The build (``python asset_pipeline.py``) does the following:
+1. Fetches the pinned Bootstrap and Font Awesome releases into static/vendor/,
+   so the dashboard no longer depends on third-party CDNs at runtime.
+2. Concatenates vendor and app files into one CSS and one JS bundle,
+   minifying them when rcssmin/rjsmin are installed.
+3. Writes content-hashed copies to static/dist/ with .gz and .br
+   (when Brotli is installed) siblings, plus a manifest.json that maps
+   logical names to hashed file names.
+
+app.py serves static/dist/ under /assets/ with immutable cache headers and
+picks the precompressed variant matching Accept-Encoding. If no manifest
+exists (e.g. local development without a build), the template falls back to
+the unbundled files and CDN links.
+"""
+import os
+import re
+import sys
+import gzip
+import json
+import shutil
+import hashlib
+import argparse
+import mimetypes
+from urllib.parse import urljoin
+
+import requests
+
+try:
+    import rcssmin
+except ImportError:
+    rcssmin = None
+
+try:
+    import rjsmin
+except ImportError:
+    rjsmin = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+STATIC_DIR = os.path.join(BASE_DIR, 'static')
+VENDOR_DIR = os.path.join(STATIC_DIR, 'vendor')
+DIST_DIR = os.path.join(STATIC_DIR, 'dist')
+MANIFEST_PATH = os.path.join(DIST_DIR, 'manifest.json')
+
+# Pinned third-party assets (same versions the template used from CDNs)
+VENDOR_ASSETS = {
+    'bootstrap/bootstrap.min.css': "https://cdn.jsdelivr.net/npm/bootstrap@5.3.0-alpha1/dist/css/bootstrap.min.css",
+    'bootstrap/bootstrap.bundle.min.js': "https://cdn.jsdelivr.net/npm/bootstrap@5.3.0-alpha1/dist/js/bootstrap.bundle.min.js",
+    'fontawesome/css/all.min.css': "https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.0.0-beta3/css/all.min.css",
+}
+
+# Bundle name -> source files relative to static/, in load order
+BUNDLES = {
+    'dashboard.css': [
+        'vendor/bootstrap/bootstrap.min.css',
+        'vendor/fontawesome/css/all.min.css',
+        'css/checkout.css',
+        'css/autofill.css',
+        'css/cart.css',
+        'css/dashboard.css',
+    ],
+    'dashboard.js': [
+        'vendor/bootstrap/bootstrap.bundle.min.js',
+        'js/checkout.js',
+        'js/autofill.js',
+        'js/cart_automation.js',
+        'js/dashboard.js',
+    ],
+}
+
+# Text assets worth precompressing
+COMPRESSIBLE_EXTENSIONS = ('.css', '.js', '.svg', '.json')
+
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+_CSS_URL_RE = re.compile(r'url\(\s*([\'"]?)([^\'")]+)\1\s*\)')
+
+
+def fetch_vendor_assets(force=False):
+    """Download pinned vendor files (and the fonts their CSS references)"""
+    for relative_path, url in VENDOR_ASSETS.items():
+        path = os.path.join(VENDOR_DIR, relative_path)
+        if not os.path.exists(path) or force:
+            _download(url, path)
+
+        if relative_path.endswith('.css'):
+            with open(path, encoding='utf-8') as f:
+                css = f.read()
+            for _, ref in _CSS_URL_RE.findall(css):
+                if ref.startswith('data:'):
+                    continue
+                ref_path = os.path.normpath(os.path.join(os.path.dirname(path), re.split(r'[?#]', ref)[0]))
+                if not os.path.exists(ref_path) or force:
+                    _download(urljoin(url, ref), ref_path)
+
+
+def _download(url, path):
+    print(f"Fetching {url}")
+    response = requests.get(url, timeout=60)
+    response.raise_for_status()
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(response.content)
+
+
+def content_hash(data):
+    return hashlib.sha256(data).hexdigest()[:12]
+
+
+def hashed_name(name, data):
+    stem, ext = os.path.splitext(name)
+    return f"{stem}.{content_hash(data)}{ext}"
+
+
+def write_asset(name, data):
+    """Write data under its hashed name plus precompressed siblings; return the hashed name"""
+    filename = hashed_name(name, data)
+    path = os.path.join(DIST_DIR, filename)
+    with open(path, 'wb') as f:
+        f.write(data)
+
+    if filename.endswith(COMPRESSIBLE_EXTENSIONS):
+        # mtime=0 keeps the .gz output byte-identical across builds
+        with open(path + '.gz', 'wb') as f:
+            f.write(gzip.compress(data, compresslevel=9, mtime=0))
+        if brotli is not None:
+            with open(path + '.br', 'wb') as f:
+                f.write(brotli.compress(data, quality=11))
+    return filename
+
+
+def _rewrite_css_urls(css, source_path, manifest):
+    """Copy files referenced by url() into dist under hashed names and point the CSS at them"""
+    def replace(match):
+        quote, ref = match.groups()
+        if ref.startswith(('data:', 'http:', 'https:', '/')):
+            return match.group(0)
+        base = re.split(r'[?#]', ref)[0]
+        suffix = ref[len(base):]
+        ref_path = os.path.normpath(os.path.join(os.path.dirname(source_path), base))
+        if not os.path.exists(ref_path):
+            return match.group(0)
+        with open(ref_path, 'rb') as f:
+            data = f.read()
+        name = os.path.basename(ref_path)
+        manifest[name] = write_asset(name, data)
+        # Drop query strings (cache-busters) but keep #fragments (SVG font ids)
+        fragment = suffix[suffix.find('#'):] if '#' in suffix else ''
+        return f"url({quote}{manifest[name]}{fragment}{quote})"
+
+    return _CSS_URL_RE.sub(replace, css)
+
+
+def build_bundle(name, sources, manifest):
+    """Concatenate, minify and write one bundle"""
+    parts = []
+    for source in sources:
+        path = os.path.join(STATIC_DIR, source)
+        with open(path, encoding='utf-8') as f:
+            text = f.read()
+        if name.endswith('.css'):
+            text = _rewrite_css_urls(text, path, manifest)
+        parts.append(text)
+
+    if name.endswith('.css'):
+        bundle = '\n'.join(parts)
+        if rcssmin is not None:
+            bundle = rcssmin.cssmin(bundle)
+    else:
+        # Separate files with ';' so a missing trailing semicolon cannot merge statements
+        bundle = '\n;\n'.join(parts)
+        if rjsmin is not None:
+            bundle = rjsmin.jsmin(bundle)
+
+    manifest[name] = write_asset(name, bundle.encode('utf-8'))
+    return manifest[name]
+
+
+def build(fetch=True, force_fetch=False):
+    """Build all bundles into a fresh static/dist and write the manifest"""
+    if fetch:
+        fetch_vendor_assets(force=force_fetch)
+
+    if os.path.isdir(DIST_DIR):
+        shutil.rmtree(DIST_DIR)
+    os.makedirs(DIST_DIR)
+
+    manifest = {}
+    for name, sources in BUNDLES.items():
+        build_bundle(name, sources, manifest)
+
+    with open(MANIFEST_PATH, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    return manifest
+
+
+def load_manifest():
+    """Return the build manifest, or an empty dict if assets were not built"""
+    try:
+        with open(MANIFEST_PATH, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def select_encoding(filename, accept_encoding):
+    """
+    Pick the best precompressed variant of filename for an Accept-Encoding header.
+
+    Returns (file name on disk, content encoding or None).
+    """
+    accepted = {part.split(';')[0].strip().lower() for part in (accept_encoding or '').split(',')}
+    for encoding, suffix in (('br', '.br'), ('gzip', '.gz')):
+        if encoding in accepted and os.path.exists(os.path.join(DIST_DIR, filename + suffix)):
+            return filename + suffix, encoding
+    return filename, None
+
+
+def guess_mimetype(filename):
+    return mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the dashboard's static asset bundles")
+    parser.add_argument('--offline', action='store_true', help="Use the vendor files already in static/vendor")
+    parser.add_argument('--refresh-vendor', action='store_true', help="Re-download vendor files")
+    args = parser.parse_args()
+
+    if rcssmin is None or rjsmin is None:
+        print("rcssmin/rjsmin not installed: bundles will be concatenated but not minified", file=sys.stderr)
+    if brotli is None:
+        print("Brotli not installed: only gzip variants will be written", file=sys.stderr)
+
+    manifest = build(fetch=not args.offline, force_fetch=args.refresh_vendor)
+    for name in BUNDLES:
+        path = os.path.join(DIST_DIR, manifest[name])
+        sizes = [f"{os.path.getsize(path) / 1024:.0f}KB"]
+        for suffix in ('.gz', '.br'):
+            if os.path.exists(path + suffix):
+                sizes.append(f"{suffix[1:]} {os.path.getsize(path + suffix) / 1024:.0f}KB")
+        print(f"{name} -> {manifest[name]} ({', '.join(sizes)})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Compact Status Benchmark
+
+Compares the /api/tickets JSON payload with the compact MessagePack and CBOR
+encodings (compact_status.py): bytes on the wire, raw and gzipped, and the
+time to encode on the server plus decode on the client.
+
+"first poll" includes the event dictionary; "steady" is every later poll,
+where the client already holds the dictionary.
+
+Usage:
+    python bench_compact_status.py                         # synthetic snapshot
+    python bench_compact_status.py --url http://127.0.0.1:5000   # live instance over HTTP
+"""
+import sys
+import gzip
+import json
+import time
+import random
+import argparse
+
+import compact_status
+
+STATUSES = [
+    "⚡ Not Yet Available",
+    "❌ Sold Out",
+    "⏳ In Queue/Waitlist",
+    "⚠️ Possible Availability - CHECK NOW",
+    "🔥 TICKETS AVAILABLE! 12 tickets in stock 🔥",
+    "🚫 Access Blocked - Using Cached Status",
+]
+
+DATES = {
+    'July': ['12', '18', '19'],
+    'August': ['1', '2', '3', '8', '9', '10', '15', '16', '17', '22', '23', '24', '29', '30', '31'],
+    'September': ['5', '6', '7', '12', '13', '14'],
+}
+
+
+def synthetic_snapshot(seed=2025):
+    """A snapshot shaped like ticket_status during a sale"""
+    rng = random.Random(seed)
+    snapshot = {}
+    for month, days in DATES.items():
+        for day in days:
+            shop = ''.join(rng.choice('0123456789abcdef') for _ in range(24))
+            snapshot[f"{month.lower()}-{day}"] = {
+                "name": f"Bad Bunny - {month} {day}, 2025",
+                "date": f"{month} {day}, 2025",
+                "status": rng.choice(STATUSES),
+                "url": f"https://choli.ticketera.com/checkout/{shop}?underShop={shop[::-1]}&boxOnly=true",
+                "lastChecked": f"{rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}:{rng.randint(0, 59):02d}",
+            }
+    return snapshot
+
+
+def timed(func, repeat=2000):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func()
+    return result, (time.perf_counter() - start) / repeat
+
+
+def offline_rows(snapshot):
+    rows = []
+
+    def json_encode():
+        # Same settings as Flask's jsonify outside debug mode
+        return json.dumps(snapshot, sort_keys=True, separators=(',', ':')).encode('utf-8')
+
+    body, encode_time = timed(json_encode)
+    _, decode_time = timed(lambda: json.loads(body))
+    rows.append(('json', 'every poll', body, encode_time, decode_time))
+
+    _, dictionary_version = compact_status.event_dictionary(snapshot)
+    for media_type in (compact_status.MSGPACK_TYPES[0], compact_status.CBOR_TYPE):
+        if media_type not in compact_status.available_types():
+            print(f"{media_type}: library not installed, skipped")
+            continue
+        label = media_type.rsplit('/', 1)[-1]
+        for poll, client_dictionary in (('first poll', None), ('steady', dictionary_version)):
+            def encode(client_dictionary=client_dictionary, media_type=media_type):
+                payload = compact_status.compact_snapshot(snapshot, 42, client_dictionary)
+                return compact_status.encode(payload, media_type)
+
+            body, encode_time = timed(encode)
+            _, decode_time = timed(lambda body=body, media_type=media_type: compact_status.decode(body, media_type))
+            rows.append((label, poll, body, encode_time, decode_time))
+    return rows
+
+
+def print_rows(rows):
+    baseline = len(rows[0][2])
+    print(f"{'format':<10}{'poll':<12}{'bytes':>8}{'gzip':>8}{'vs json':>9}{'encode':>11}{'decode':>11}")
+    print("-" * 69)
+    for label, poll, body, encode_time, decode_time in rows:
+        print(f"{label:<10}{poll:<12}{len(body):>8}{len(gzip.compress(body)):>8}"
+              f"{len(body) / baseline:>8.0%}{encode_time * 1e6:>9.1f}us{decode_time * 1e6:>9.1f}us")
+    print()
+
+
+def live_rows(url, polls):
+    """Poll a running instance in each format and time full round trips"""
+    import requests
+
+    rows = []
+    session = requests.Session()
+    for label, accept in (('json', 'application/json'), ('msgpack', 'application/msgpack'),
+                          ('cbor', 'application/cbor')):
+        dictionary = None
+        sizes, latencies = [], []
+        for _ in range(polls):
+            headers = {'Accept': accept, 'Accept-Encoding': 'identity'}
+            if dictionary:
+                headers['X-Event-Dictionary'] = dictionary
+            start = time.perf_counter()
+            response = session.get(f"{url.rstrip('/')}/api/tickets", headers=headers, timeout=120)
+            latencies.append(time.perf_counter() - start)
+            sizes.append(len(response.content))
+            media_type = response.headers.get('Content-Type', '').split(';')[0]
+            if media_type != 'application/json':
+                dictionary = compact_status.decode(response.content, media_type)['d']
+            elif label != 'json':
+                print(f"{label}: server answered with JSON (library not installed there?)")
+                break
+        else:
+            latencies.sort()
+            rows.append((label, sizes[0], sizes[-1], latencies[len(latencies) // 2]))
+
+    print(f"{'format':<10}{'first':>8}{'steady':>8}{'p50 round trip':>16}")
+    print("-" * 42)
+    for label, first, steady, p50 in rows:
+        print(f"{label:<10}{first:>8}{steady:>8}{p50 * 1000:>14.1f}ms")
+    print()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare JSON and compact status payloads")
+    parser.add_argument('--url', help="Base URL of a running monitor to poll over HTTP")
+    parser.add_argument('--polls', type=int, default=50, help="Polls per format with --url")
+    args = parser.parse_args()
+
+    if args.url:
+        live_rows(args.url, args.polls)
+    else:
+        print_rows(offline_rows(synthetic_snapshot()))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
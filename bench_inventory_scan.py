@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Inventory Scanner Benchmark
+
+Compares the targeted inventory scanner against the old approach of slicing
+each script from its first '{' to its last '}' and calling json.loads on it.
+
+Usage:
+    python bench_inventory_scan.py                 # synthetic payloads
+    python bench_inventory_scan.py recorded_pages/ # .html/.js files from a capture
+
+Recorded .html files are split into their inline scripts; .js files are used
+as a single script each.
+"""
+import os
+import sys
+import json
+import time
+import random
+import tracemalloc
+from bs4 import BeautifulSoup
+
+from inventory_scan import INVENTORY_FIELDS, INVENTORY_MARKERS, extract_inventory_count
+
+
+def legacy_extract(script_texts):
+    """The whole-script json.loads extraction that used to live in app.py"""
+    inventory_count = None
+    for script_text in script_texts:
+        script_text = script_text or ""
+        if not any(marker in script_text for marker in INVENTORY_MARKERS):
+            continue
+        try:
+            json_start = script_text.find('{')
+            json_end = script_text.rfind('}') + 1
+            if json_start >= 0 and json_end > json_start:
+                json_data = json.loads(script_text[json_start:json_end])
+                for field in INVENTORY_FIELDS:
+                    if field in json_data:
+                        inventory_count = json_data[field]
+                        break
+        except Exception:
+            pass
+    return inventory_count
+
+
+def synthetic_payloads(seed=2025):
+    """Build script payloads shaped like Ticketera's embedded state bundles"""
+    rng = random.Random(seed)
+
+    def state_blob(sections):
+        return {
+            "event": {"id": "67801ac67b15db4542eeed7e", "name": "Bad Bunny", "venue": "Coliseo de Puerto Rico"},
+            "sections": [
+                {
+                    "id": f"sec-{i}",
+                    "name": f"Section {i}",
+                    "price": rng.randint(50, 500),
+                    "rows": [{"row": r, "seats": [rng.randint(0, 1) for _ in range(20)]} for r in range(10)],
+                }
+                for i in range(sections)
+            ],
+            "ticketsAvailable": rng.randint(1, 5000),
+        }
+
+    payloads = {}
+
+    # Pure JSON assignment: the one case the old approach could handle
+    blob = json.dumps(state_blob(200))
+    payloads['json-state'] = [f"window.__STATE__ = {blob};"]
+
+    # Webpack-style bundle: state followed by more code, so '{'..'}' is not JSON
+    code = "function f%d(a){return a&&a.x?{y:a.x}:null}\n"
+    bundle = "".join(code % i for i in range(20000))
+    payloads['webpack-bundle'] = [
+        "(function(){var t=" + json.dumps(state_blob(100)) + ";" + bundle + "})();"
+    ]
+
+    # JS object literal with bare keys (never valid JSON)
+    literal = "var cfg = {ticketsAvailable: 42, soldOut: false, sections: [" + \
+        ",".join("{id:%d,stockLevel:%d}" % (i, i % 7) for i in range(50000)) + "]};"
+    payloads['js-object-literal'] = [literal]
+
+    # Many small scripts, only the last one interesting
+    scripts = ["console.log(%d);" % i for i in range(2000)]
+    scripts.append('dataLayer.push({"availableCount": "17"});')
+    payloads['many-small-scripts'] = scripts
+
+    return payloads
+
+
+def recorded_payloads(directory):
+    """Load scripts from recorded .html and .js files"""
+    payloads = {}
+    for name in sorted(os.listdir(directory)):
+        path = os.path.join(directory, name)
+        if name.endswith('.html'):
+            with open(path, encoding='utf-8', errors='replace') as f:
+                soup = BeautifulSoup(f.read(), 'lxml')
+            payloads[name] = [script.string or "" for script in soup.find_all('script')]
+        elif name.endswith('.js'):
+            with open(path, encoding='utf-8', errors='replace') as f:
+                payloads[name] = [f.read()]
+    return payloads
+
+
+def measure(func, scripts, repeat):
+    """Return (result, best seconds per call, peak traced bytes)"""
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(scripts)
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    func(scripts)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, best, peak
+
+
+def main():
+    if len(sys.argv) > 1:
+        payloads = recorded_payloads(sys.argv[1])
+        if not payloads:
+            print(f"No .html or .js files found in {sys.argv[1]}")
+            return
+    else:
+        payloads = synthetic_payloads()
+
+    print(f"{'payload':<24}{'size':>10}  {'impl':<8}{'result':>10}{'time':>12}{'peak mem':>12}")
+    print("-" * 76)
+    for name, scripts in payloads.items():
+        size = sum(len(s or "") for s in scripts)
+        for label, func in (('legacy', legacy_extract), ('scanner', extract_inventory_count)):
+            result, seconds, peak = measure(func, scripts, repeat=5)
+            print(f"{name:<24}{size / 1024:>8.0f}KB  {label:<8}{str(result):>10}"
+                  f"{seconds * 1000:>10.2f}ms{peak / 1024:>10.0f}KB")
+    print()
+
+
+if __name__ == "__main__":
+    main()
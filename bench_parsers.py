@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Parser Backend Benchmark
+
+Runs the classifier over the same pages with each parser backend (see
+page_parser.py) and compares speed, memory and verdicts. Any page on which
+the backends disagree is listed; a backend should only be switched to when
+there are none.
+
+Each backend runs in its own process, so peak RSS growth covers libxml2's C
+allocations as well as Python objects.
+
+Usage:
+    python bench_parsers.py                  # synthetic pages
+    python bench_parsers.py recorded_pages/  # .html files from a capture
+    python bench_parsers.py --archive page_archive
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import resource
+from concurrent.futures import ProcessPoolExecutor
+
+from page_classifier import classify_ticketera_page
+from page_parser import BACKENDS
+from page_archive import load_page, page_files
+
+
+def synthetic_pages(seed=2025):
+    """Pages shaped like the ones the classifier sees, from tiny to script-heavy"""
+    rng = random.Random(seed)
+
+    def page(body, head=""):
+        return f"<html><head><title>Ticketera</title>{head}</head><body>{body}</body></html>"
+
+    filler = "".join(
+        f'<div class="section s{i}"><span class="price">${rng.randint(50, 500)}</span>'
+        f'<a href="/events/{i}">Section {i}</a><p>Row {i % 30}, seats {i % 12}-{i % 12 + 4}</p></div>'
+        for i in range(3000)
+    )
+    state = json.dumps({"sections": [{"id": i, "seats": [rng.randint(0, 1) for _ in range(20)]}
+                                     for i in range(300)], "ticketsAvailable": 321})
+    bundle = "".join("function f%d(a){return a&&a.x?{y:a.x}:null}\n" % i for i in range(5000))
+
+    return {
+        'not-yet': page("<h1>Bad Bunny</h1><p>Stay tuned</p>"),
+        'sold-out': page("<h1>Bad Bunny</h1><div class='status'>Agotado</div>" + filler),
+        'coming-soon': page("<h1>Bad Bunny</h1><p>Próximamente</p>" + filler),
+        'on-sale-json': page("<p>¡Entradas disponibles!</p>" + filler,
+                             f"<script>window.__STATE__ = {state};</script><script>{bundle}</script>"),
+        'on-sale-element': page("<p>Comprar ahora</p><div class='stock-level'>Only 12 left</div>" + filler),
+        'buy-button': page(filler + "<button class='btn buy-button'>Buy</button>"),
+        'queue': page("<div class='waiting-room'>You are in line</div>"),
+        'checkout-link': page(filler + "<a href='https://choli.ticketera.com/checkout/abc123'>Pay</a>"),
+        'checkout-script': page("<p>x</p>", "<script>var next = \"/checkout/xyz789\";</script>"),
+        'large-filler': page(filler * 5),
+    }
+
+
+def recorded_pages(directory):
+    pages = {}
+    for name in sorted(os.listdir(directory)):
+        if name.endswith(('.html', '.htm')):
+            with open(os.path.join(directory, name), encoding='utf-8', errors='replace') as f:
+                pages[name] = f.read()
+    return pages
+
+
+def archived_pages(root, limit):
+    pages = {}
+    for _, path, _ in sorted(page_files(root), reverse=True)[:limit]:
+        digest = os.path.basename(path).split('.')[0]
+        pages[digest[:16]] = load_page(root, digest).decode('utf-8', errors='replace')
+    return pages
+
+
+def run_backend(name, pages, repeat):
+    """Worker: (verdicts, seconds per page, peak RSS growth in KB) for one backend"""
+    document_class = BACKENDS[name]
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    verdicts = {}
+    seconds = {}
+    for page_name, page_html in pages.items():
+        best = float('inf')
+        for _ in range(repeat):
+            start = time.perf_counter()
+            verdicts[page_name] = classify_ticketera_page(page_html, page_name, document_class)
+            best = min(best, time.perf_counter() - start)
+        seconds[page_name] = best
+    rss_growth = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - rss_before
+    return verdicts, seconds, rss_growth
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the classifier's parser backends")
+    parser.add_argument('directory', nargs='?', help="Directory of recorded .html pages")
+    parser.add_argument('--archive', help="Use the newest pages of a page archive")
+    parser.add_argument('--limit', type=int, default=200, help="Pages to take from the archive")
+    parser.add_argument('--repeat', type=int, default=5, help="Runs per page; the best is kept")
+    args = parser.parse_args()
+
+    if args.archive:
+        pages = archived_pages(args.archive, args.limit)
+    elif args.directory:
+        pages = recorded_pages(args.directory)
+    else:
+        pages = synthetic_pages()
+    if not pages:
+        print("No pages found")
+        return
+
+    results = {}
+    for name in BACKENDS:
+        # A fresh process per backend keeps the RSS figures apart
+        with ProcessPoolExecutor(max_workers=1) as pool:
+            results[name] = pool.submit(run_backend, name, pages, args.repeat).result()
+
+    names = list(BACKENDS)
+    print(f"{'page':<24}{'size':>9}  " + "".join(f"{name:>12}" for name in names) + "  verdict")
+    print("-" * (37 + 12 * len(names) + 30))
+    for page_name, page_html in pages.items():
+        times = "".join(f"{results[name][1][page_name] * 1000:>10.2f}ms" for name in names)
+        verdict = results[names[0]][0][page_name]
+        print(f"{page_name[:23]:<24}{len(page_html) / 1024:>7.0f}KB  {times}  {verdict[:40]}")
+
+    print()
+    baseline = names[0]
+    for name in names:
+        total = sum(results[name][1].values())
+        speedup = sum(results[baseline][1].values()) / total if total else 0
+        print(f"{name:<8} total {total * 1000:>9.2f}ms  ({speedup:.1f}x {baseline})  "
+              f"peak RSS growth {results[name][2] / 1024:>7.1f}MB")
+
+    mismatches = [
+        (page_name, {name: results[name][0][page_name] for name in names})
+        for page_name in pages
+        if len({results[name][0][page_name] for name in names}) > 1
+    ]
+    print()
+    if mismatches:
+        print(f"{len(mismatches)} of {len(pages)} pages got different verdicts:")
+        for page_name, verdicts in mismatches:
+            print(f"  {page_name}")
+            for name, verdict in verdicts.items():
+                print(f"    {name:<8}{verdict}")
+        sys.exit(1)
+    print(f"Identical verdicts on all {len(pages)} pages")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""
+Circuit Breakers
+
+One breaker per event keeps URLs that keep failing (403 blocks, 5xx, network
+errors, or placeholder URLs) out of the sweep rotation, so the check budget
+goes to events that can actually change.
+
+    closed     every sweep may check the event; consecutive failures are counted
+    open       after FAILURE_THRESHOLD failures in a row: the event is skipped
+    half-open  once the open period has passed: one probe check is allowed.
+               Success closes the breaker. Failure re-opens it for twice as
+               long, up to MAX_OPEN_SECONDS. Other callers are refused while
+               the probe is out; a probe that never reports back is given up
+               on after another open period.
+
+A breaker resets when its event's URL changes (for example after a config
+reload replaces a placeholder).
+"""
+import time
+import threading
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half-open'
+
+FAILURE_THRESHOLD = 3
+OPEN_SECONDS = 300
+MAX_OPEN_SECONDS = 3600
+
+# Markers of statuses that mean "the check failed", not "the page said X"
+FAILURE_MARKERS = ('Access Blocked', 'Error Checking', 'Error checking', 'Error Loading')
+
+
+def is_check_failure(status):
+    return any(marker in status for marker in FAILURE_MARKERS)
+
+
+class CircuitBreaker:
+    """Closed/open/half-open state for one event"""
+
+    def __init__(self, url, failure_threshold=FAILURE_THRESHOLD, open_seconds=OPEN_SECONDS,
+                 max_open_seconds=MAX_OPEN_SECONDS):
+        self.url = url
+        self.failure_threshold = failure_threshold
+        self.base_open_seconds = open_seconds
+        self.max_open_seconds = max_open_seconds
+        self.reset(url)
+
+    def reset(self, url):
+        self.url = url
+        self.state = CLOSED
+        self.failures = 0
+        self.open_seconds = self.base_open_seconds
+        self.opened_at = None
+        self.last_failure = None
+        self.trips = 0
+        self.probe_started = None
+
+    def allow(self, now):
+        """Whether the event may be checked now; moves open -> half-open when due"""
+        if self.state == OPEN and now - self.opened_at >= self.open_seconds:
+            self.state = HALF_OPEN
+        if self.state == HALF_OPEN:
+            if self.probe_started is not None and now - self.probe_started < self.open_seconds:
+                return False
+            self.probe_started = now
+        return self.state != OPEN
+
+    def record(self, success, now, reason=None, trip_now=False):
+        """
+        Record a check outcome.
+
+        Returns:
+            True if this outcome opened the breaker
+        """
+        self.probe_started = None
+        if success:
+            self.state = CLOSED
+            self.failures = 0
+            self.open_seconds = self.base_open_seconds
+            self.opened_at = None
+            return False
+
+        self.failures += 1
+        self.last_failure = reason
+        if self.state == HALF_OPEN:
+            # The probe failed: stay away twice as long
+            self.open_seconds = min(self.open_seconds * 2, self.max_open_seconds)
+            return self._open(now)
+        if self.state == CLOSED and (trip_now or self.failures >= self.failure_threshold):
+            return self._open(now)
+        return False
+
+    def _open(self, now):
+        self.state = OPEN
+        self.opened_at = now
+        self.trips += 1
+        return True
+
+    def describe(self, now):
+        info = {
+            'state': self.state,
+            'failures': self.failures,
+            'trips': self.trips,
+            'lastFailure': self.last_failure,
+            'url': self.url,
+        }
+        if self.state == OPEN:
+            info['retryIn'] = round(max(0.0, self.opened_at + self.open_seconds - now), 1)
+        elif self.state == HALF_OPEN:
+            info['probeInFlight'] = self.probe_started is not None
+        return info
+
+
+class BreakerRegistry:
+    """Breakers by event id, created on first use"""
+
+    def __init__(self, **settings):
+        self.settings = settings
+        self._breakers = {}
+        self._lock = threading.Lock()
+
+    def get(self, event_id, url):
+        with self._lock:
+            breaker = self._breakers.get(event_id)
+            if breaker is None:
+                breaker = self._breakers[event_id] = CircuitBreaker(url, **self.settings)
+            elif breaker.url != url:
+                breaker.reset(url)
+            return breaker
+
+    def allow(self, event_id, url, now=None):
+        now = time.time() if now is None else now
+        breaker = self.get(event_id, url)
+        with self._lock:
+            return breaker.allow(now)
+
+    def record(self, event_id, url, success, now=None, reason=None, trip_now=False):
+        now = time.time() if now is None else now
+        breaker = self.get(event_id, url)
+        with self._lock:
+            return breaker.record(success, now, reason, trip_now)
+
+    def state(self, event_id):
+        with self._lock:
+            breaker = self._breakers.get(event_id)
+            return breaker.state if breaker else CLOSED
+
+    def describe(self, event_id, now=None):
+        now = time.time() if now is None else now
+        with self._lock:
+            breaker = self._breakers.get(event_id)
+            return breaker.describe(now) if breaker else None
+
+    def snapshot(self, now=None):
+        now = time.time() if now is None else now
+        with self._lock:
+            return {event_id: breaker.describe(now) for event_id, breaker in sorted(self._breakers.items())}
@@ -0,0 +1,160 @@
+"""
+Compact Status Encoding
+
+Binary alternative to the /api/tickets JSON for programmatic consumers,
+selected by content negotiation:
+
+    Accept: application/msgpack   (or application/x-msgpack)
+    Accept: application/cbor
+
+The JSON payload repeats every event's name, date, URL and emoji status on
+each poll. The compact payload splits that into:
+
+- an event dictionary, [[event_id, name, date, url], ...], identified by a
+  short content hash. It is sent only when the client's X-Event-Dictionary
+  request header does not name the current one, i.e. once per dictionary
+  version (it changes only when events or their URLs change).
+- one row per event, in dictionary order: [status_code, lastChecked] or
+  [status_code, lastChecked, status_text] when the text carries extra detail
+  (such as a stock count) beyond the code's canonical label.
+
+    {
+        "v": 42,                       # snapshot version
+        "d": "3f9c2a71b0de",           # event dictionary version
+        "events": [...],               # only when the client lacks "d"
+        "codes": {"0": "⚡ Not Yet Available", ...},   # sent with "events"
+        "s": [[2, "14:03:11"], [5, "14:03:27", "🔥 TICKETS AVAILABLE! 12 tickets in stock 🔥"], ...]
+    }
+
+msgpack and cbor2 are optional; a format whose library is missing is simply
+not offered and the client gets JSON.
+"""
+import json
+import hashlib
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import cbor2
+except ImportError:
+    cbor2 = None
+
+MSGPACK_TYPES = ('application/msgpack', 'application/x-msgpack')
+CBOR_TYPE = 'application/cbor'
+
+# Integer codes for display statuses, with each code's canonical label
+STATUS_CODES = {
+    0: "⚡ Not Yet Available",
+    1: "⚡ Coming Soon",
+    2: "❌ Sold Out",
+    3: "⏳ In Queue/Waitlist",
+    4: "⚠️ Possible Availability - CHECK NOW",
+    5: "🔥 TICKETS AVAILABLE! CHECK NOW 🔥",
+    6: "🛒 TICKETS IN CART! CHECK DISCORD!",
+    7: "🚫 Access Blocked - Using Cached Status",
+    8: "⚠️ Error Checking - Using Cached Status",
+    9: "⚡ Error checking availability",
+    255: "Other",
+}
+_CODE_BY_LABEL = {label: code for code, label in STATUS_CODES.items()}
+
+# Variable statuses that still map onto a known code, matched in order
+_STATUS_PATTERNS = (
+    ("TICKETS AVAILABLE", 5),
+    ("TICKETS IN CART", 6),
+    ("Error Checking", 8),
+    ("Error Loading Page", 8),
+)
+
+
+def status_code(status):
+    """Return (code, text) where text is None when the code's label says it all"""
+    code = _CODE_BY_LABEL.get(status)
+    if code is not None:
+        return code, None
+    for needle, code in _STATUS_PATTERNS:
+        if needle in status:
+            return code, status
+    return 255, status
+
+
+def event_dictionary(ticket_status):
+    """Static event fields in a stable order, plus the dictionary's version hash"""
+    events = [
+        [event_id, entry.get('name'), entry.get('date'), entry.get('url')]
+        for event_id, entry in sorted(ticket_status.items())
+    ]
+    canonical = json.dumps(events, ensure_ascii=False, separators=(',', ':'))
+    return events, hashlib.sha256(canonical.encode('utf-8')).hexdigest()[:12]
+
+
+def compact_snapshot(ticket_status, snapshot_version, client_dictionary=None):
+    """Build the compact payload; the dictionary is included only if the client lacks it"""
+    events, dictionary_version = event_dictionary(ticket_status)
+    rows = []
+    for event_id, _, _, _ in events:
+        entry = ticket_status[event_id]
+        code, text = status_code(entry.get('status', ''))
+        row = [code, entry.get('lastChecked')]
+        if text is not None:
+            row.append(text)
+        rows.append(row)
+
+    payload = {'v': snapshot_version, 'd': dictionary_version, 's': rows}
+    if client_dictionary != dictionary_version:
+        payload['events'] = events
+        payload['codes'] = {str(code): label for code, label in STATUS_CODES.items()}
+    return payload
+
+
+def available_types():
+    """Compact media types this server can produce"""
+    types = []
+    if msgpack is not None:
+        types.extend(MSGPACK_TYPES)
+    if cbor2 is not None:
+        types.append(CBOR_TYPE)
+    return types
+
+
+def negotiate(accept_mimetypes):
+    """
+    Pick a compact media type from a werkzeug MIMEAccept, or None for JSON.
+
+    JSON stays the default: a compact type is chosen only when the client
+    names it explicitly with a higher quality than application/json.
+    """
+    best = accept_mimetypes.best_match(['application/json'] + available_types())
+    if best in available_types() and accept_mimetypes[best] > accept_mimetypes['application/json']:
+        return best
+    return None
+
+
+def encode(payload, media_type):
+    if media_type in MSGPACK_TYPES:
+        return msgpack.packb(payload, use_bin_type=True)
+    if media_type == CBOR_TYPE:
+        return cbor2.dumps(payload)
+    raise ValueError(f"Unsupported media type {media_type!r}")
+
+
+def decode(data, media_type):
+    if media_type in MSGPACK_TYPES:
+        return msgpack.unpackb(data, raw=False, strict_map_key=False)
+    if media_type == CBOR_TYPE:
+        return cbor2.loads(data)
+    raise ValueError(f"Unsupported media type {media_type!r}")
+
+
+def expand(payload, dictionary):
+    """Turn a compact payload back into the /api/tickets JSON shape (for clients and tests)"""
+    events = payload.get('events') or dictionary['events']
+    codes = payload.get('codes') or dictionary['codes']
+    status = {}
+    for (event_id, name, date, url), row in zip(events, payload['s']):
+        text = row[2] if len(row) > 2 else codes[str(row[0])]
+        status[event_id] = {'name': name, 'date': date, 'url': url, 'status': text, 'lastChecked': row[1]}
+    return status
@@ -0,0 +1,157 @@
+"""
+Check History
+
+SQLite record of every check result and of events retired from the active
+rotation (see lifecycle.py). The live snapshot only holds active events;
+anything older is answered from here.
+
+    checks            one row per check: event, time, status, URL, whether the
+                      page was cut short at MAX_PAGE_KB and, when the page
+                      archive is on, the hash of the page classified
+    archived_events   final state of each retired event and why it was retired
+
+Every gunicorn worker opens the same file; WAL mode lets them write while
+others read.
+"""
+import sqlite3
+import threading
+
+EXPORT_BATCH_SIZE = 1000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS checks (
+    id INTEGER PRIMARY KEY,
+    event_id TEXT NOT NULL,
+    checked_at REAL NOT NULL,
+    status TEXT NOT NULL,
+    url TEXT,
+    page_hash TEXT,
+    truncated INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS checks_event_time ON checks (event_id, checked_at);
+CREATE TABLE IF NOT EXISTS archived_events (
+    event_id TEXT PRIMARY KEY,
+    name TEXT,
+    date TEXT,
+    url TEXT,
+    final_status TEXT,
+    last_checked TEXT,
+    archived_at REAL NOT NULL,
+    reason TEXT NOT NULL
+);
+"""
+
+
+class HistoryStore:
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, timeout=10, check_same_thread=False, isolation_level=None)
+        self._db.row_factory = sqlite3.Row
+        if path != ':memory:':
+            self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.executescript(SCHEMA)
+        # Databases created before pages were archived lack the hash and truncation columns
+        columns = {row['name'] for row in self._db.execute('PRAGMA table_info(checks)')}
+        if 'page_hash' not in columns:
+            self._db.execute('ALTER TABLE checks ADD COLUMN page_hash TEXT')
+        if 'truncated' not in columns:
+            self._db.execute('ALTER TABLE checks ADD COLUMN truncated INTEGER NOT NULL DEFAULT 0')
+
+    def record_check(self, event_id, status, url, checked_at, page_hash=None, truncated=False):
+        with self._lock:
+            self._db.execute(
+                'INSERT INTO checks (event_id, checked_at, status, url, page_hash, truncated) VALUES (?, ?, ?, ?, ?, ?)',
+                (event_id, checked_at, status, url, page_hash, int(bool(truncated))))
+
+    def checks(self, event_id, since=None, until=None, limit=100):
+        """Check rows for one event, newest first"""
+        query = 'SELECT checked_at, status, url, page_hash, truncated FROM checks WHERE event_id = ?'
+        params = [event_id]
+        if since is not None:
+            query += ' AND checked_at >= ?'
+            params.append(since)
+        if until is not None:
+            query += ' AND checked_at < ?'
+            params.append(until)
+        query += ' ORDER BY checked_at DESC LIMIT ?'
+        params.append(limit)
+        with self._lock:
+            return [dict(row, truncated=bool(row['truncated'])) for row in self._db.execute(query, params)]
+
+    def iter_checks(self, event_ids=None, since=None, until=None, batch_size=EXPORT_BATCH_SIZE):
+        """
+        Yield check rows ordered by event, then time, in batches.
+
+        Each batch is a keyset query along the (event_id, checked_at) index
+        that resumes after the last row seen. The connection lock is only
+        held per batch, so writers keep going during a long export, and
+        memory stays at one batch however many rows match.
+        """
+        conditions = []
+        params = []
+        if event_ids is not None:
+            conditions.append(f"event_id IN ({', '.join('?' * len(event_ids))})")
+            params.extend(event_ids)
+        if since is not None:
+            conditions.append('checked_at >= ?')
+            params.append(since)
+        if until is not None:
+            conditions.append('checked_at < ?')
+            params.append(until)
+
+        last = None
+        while True:
+            where = list(conditions)
+            batch_params = list(params)
+            if last is not None:
+                where.append('(event_id, checked_at, id) > (?, ?, ?)')
+                batch_params.extend(last)
+            query = 'SELECT id, event_id, checked_at, status, url, page_hash, truncated FROM checks'
+            if where:
+                query += ' WHERE ' + ' AND '.join(where)
+            query += ' ORDER BY event_id, checked_at, id LIMIT ?'
+            batch_params.append(batch_size)
+            with self._lock:
+                rows = self._db.execute(query, batch_params).fetchall()
+            for row in rows:
+                yield row
+            if len(rows) < batch_size:
+                return
+            last = (rows[-1]['event_id'], rows[-1]['checked_at'], rows[-1]['id'])
+
+    def page_verdicts(self):
+        """
+        One row per (archived page, status it was classified as): page_hash,
+        status, checks, plus event_id, url and checked_at of the latest such check
+        """
+        query = (
+            'SELECT page_hash, status, COUNT(*) AS checks, MAX(checked_at) AS checked_at, event_id, url '
+            'FROM checks WHERE page_hash IS NOT NULL GROUP BY page_hash, status'
+        )
+        with self._lock:
+            return [dict(row) for row in self._db.execute(query)]
+
+    def archive(self, event_id, entry, reason, archived_at):
+        """Record an event's final snapshot entry; archiving twice keeps the first record"""
+        with self._lock:
+            self._db.execute(
+                'INSERT OR IGNORE INTO archived_events '
+                '(event_id, name, date, url, final_status, last_checked, archived_at, reason) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                (event_id, entry.get('name'), entry.get('date'), entry.get('url'), entry.get('status'),
+                 entry.get('lastChecked'), archived_at, reason))
+
+    def archived(self):
+        """Archived events by id"""
+        with self._lock:
+            rows = self._db.execute('SELECT * FROM archived_events ORDER BY archived_at').fetchall()
+        return {row['event_id']: dict(row) for row in rows}
+
+    def archived_ids(self):
+        with self._lock:
+            return {row[0] for row in self._db.execute('SELECT event_id FROM archived_events')}
+
+    def close(self):
+        with self._lock:
+            self._db.close()
@@ -0,0 +1,131 @@
+"""
+Inventory Scanner
+
+Pulls inventory counts out of inline <script> text without parsing the whole
+script as JSON. Ticketera pages embed their state in large JS bundles, so
+slicing from the first '{' to the last '}' and calling json.loads on it almost
+never works and allocates the full object graph when it does.
+
+The scanner searches the script for each known inventory key in priority order,
+keeps only occurrences used as object properties (quoted or bare JS
+identifiers opening an object member, so `ok ? stock : 0` is not one) and
+reads just the literal that follows the match.
+"""
+import json
+import re
+
+# Inventory fields in priority order (highest priority first)
+INVENTORY_FIELDS = ['ticketsAvailable', 'availableCount', 'stockLevel', 'inventory', 'available', 'stock']
+
+# Cheap substring markers used to skip scripts that cannot contain a count
+INVENTORY_MARKERS = ('ticketsAvailable', 'availableCount', 'stockLevel')
+
+_NUMBER_RE = re.compile(r'-?\d+(?:\.\d+)?(?:[eE][+-]?\d+)?')
+_STRING_RE = re.compile(r'"(?:[^"\\]|\\.)*"|\'(?:[^\'\\]|\\.)*\'')
+_COLON_RE = re.compile(r'\s*:\s*')
+_MEMBER_STARTS = ('{', ',')
+_IDENT_CHARS = frozenset('abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_$')
+
+
+def _property_value_pos(text, pos, length):
+    """
+    If the key at text[pos:pos + length] is used as a property name
+    ("key":, 'key': or key:), return where its value starts, else None.
+    """
+    start, end = pos, pos + length
+    before = text[pos - 1] if pos > 0 else ''
+    after = text[end] if end < len(text) else ''
+
+    if before in ('"', "'"):
+        # Quoted key: the closing quote must match the opening one
+        if after != before:
+            return None
+        start -= 1
+        end += 1
+    elif before in _IDENT_CHARS or after in _IDENT_CHARS:
+        # Part of a longer identifier (e.g. 'stock' inside 'inStock')
+        return None
+
+    # A property name opens an object member; anything else (a ternary's
+    # middle operand, a switch case, a label) is an expression
+    start -= 1
+    while start >= 0 and text[start].isspace():
+        start -= 1
+    if start < 0 or text[start] not in _MEMBER_STARTS:
+        return None
+
+    match = _COLON_RE.match(text, end)
+    if not match or not match.group(0).strip():
+        return None
+    return match.end()
+
+
+def _read_count(text, pos):
+    """
+    Read the literal at text[pos:] and return it if it is a usable count.
+
+    Only numbers and numeric strings are accepted; booleans, null, objects and
+    arrays are skipped so the scan can move on to the next occurrence.
+    """
+    match = _NUMBER_RE.match(text, pos)
+    if match:
+        literal = match.group(0)
+        return int(literal) if literal.lstrip('-').isdigit() else float(literal)
+
+    match = _STRING_RE.match(text, pos)
+    if match:
+        literal = match.group(0)
+        if literal[0] == "'":
+            literal = '"' + literal[1:-1].replace('"', '\\"') + '"'
+        try:
+            value = json.loads(literal).strip()
+        except ValueError:
+            return None
+        if value and _NUMBER_RE.fullmatch(value):
+            return value
+
+    return None
+
+
+def scan_inventory(script_text, fields=None):
+    """
+    Find the inventory count in a script without building its object tree.
+
+    Args:
+        script_text: Raw text of a <script> element
+        fields: Inventory keys in priority order (defaults to INVENTORY_FIELDS)
+
+    Returns:
+        (field, value) for the highest-priority key that has a numeric value,
+        or None if no key matched.
+    """
+    if not script_text:
+        return None
+
+    for field in fields or INVENTORY_FIELDS:
+        pos = script_text.find(field)
+        while pos != -1:
+            value_pos = _property_value_pos(script_text, pos, len(field))
+            if value_pos is not None:
+                value = _read_count(script_text, value_pos)
+                if value is not None:
+                    return field, value
+            pos = script_text.find(field, pos + len(field))
+
+    return None
+
+
+def extract_inventory_count(script_texts, fields=None):
+    """
+    Return the first inventory count found across a page's scripts, or None.
+
+    Scripts that do not contain any of the inventory markers are skipped
+    without scanning.
+    """
+    for script_text in script_texts:
+        if not script_text or not any(marker in script_text for marker in INVENTORY_MARKERS):
+            continue
+        found = scan_inventory(script_text, fields)
+        if found is not None:
+            return found[1]
+    return None
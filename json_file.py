@@ -0,0 +1,72 @@
+"""
+Shared JSON Files
+
+Helpers for the small JSON stores (push subscriptions, alert rules,
+watchlists) that every gunicorn worker reads and writes:
+
+- locked(path) holds an exclusive fcntl lock on "<path>.lock" around a
+  reload-modify-save cycle, so two workers cannot lose each other's updates.
+- write_json() writes to a unique temp file in the same directory and renames
+  it over the store, so a crash or a concurrent writer never leaves a
+  half-written file.
+- file_version() identifies the file on disk by inode, mtime and size. Every
+  save is a rename to a new inode, so a change is noticed even when two saves
+  land within one mtime tick.
+"""
+import os
+import json
+import tempfile
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Not on Windows; stores are then only safe within one process
+    fcntl = None
+
+
+class StoreFull(Exception):
+    """The store already holds as many entries as it is allowed to"""
+
+
+@contextmanager
+def locked(path):
+    """Exclusive lock shared by every process using the file at path"""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(f"{path}.lock", 'a') as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def file_version(path):
+    """Identity of the file's current contents, or None if it does not exist"""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+
+def write_json(path, data, **dump_options):
+    """Atomically replace path with data as JSON; returns the new file_version"""
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(prefix=f".{os.path.basename(path)}.{os.getpid()}.",
+                                     suffix='.tmp', dir=directory)
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, **dump_options)
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except FileNotFoundError:
+            pass
+        raise
+    return file_version(path)
@@ -0,0 +1,50 @@
+"""
+Event Lifecycle
+
+Decides when an event leaves the active rotation. An event is retired once
+its concert date is `grace_days` behind us, or once its confirmed status
+(see transitions.py) has been sold out for `sold_out_seconds`. Retired
+events are no longer checked or served in /api/tickets. Their final state
+lives in the history store.
+
+Event ids carry no year. Dates only retire events when the manager is given
+the tour's year; without one, only the sold-out rule applies.
+"""
+from datetime import datetime, timedelta
+
+# Year the dashboard lists the dates under; used to name weekdays when no
+# tour year is configured, never to retire events
+DEFAULT_TOUR_YEAR = 2025
+
+
+def event_date(event_id, year=DEFAULT_TOUR_YEAR):
+    """Concert date for an event id like 'july-12'"""
+    month, day = event_id.split('-')
+    return datetime.strptime(f"{month} {day} {year}", "%B %d %Y").date()
+
+
+class LifecycleManager:
+    def __init__(self, grace_days=1, sold_out_seconds=86400, year=None):
+        self.year = year  # None: the concert dates' year is unknown, so dates never retire events
+        self.grace_days = grace_days
+        self.sold_out_seconds = sold_out_seconds  # 0 keeps sold-out events active
+        self._sold_out_since = {}
+
+    def retirement_reason(self, event_id, confirmed_status, now):
+        """
+        Why the event should be retired at `now` (a timestamp), or None to keep it.
+
+        Call once per sweep for every active event: sold-out time is measured
+        from the first call that saw the event confirmed sold out.
+        """
+        if (self.year is not None and
+                datetime.fromtimestamp(now).date() >= event_date(event_id, self.year) + timedelta(days=self.grace_days)):
+            return 'date passed'
+
+        if confirmed_status and 'Sold Out' in confirmed_status:
+            since = self._sold_out_since.setdefault(event_id, now)
+            if self.sold_out_seconds and now - since >= self.sold_out_seconds:
+                return 'sold out'
+        else:
+            self._sold_out_since.pop(event_id, None)
+        return None
@@ -0,0 +1,433 @@
+#!/usr/bin/env python3
+"""
+Dashboard Load Test
+
+Simulates N dashboard viewers against a local instance of the monitor and
+reports throughput, latency percentiles and error rate, optionally for
+several gunicorn configurations in one run.
+
+For each configuration the harness:
+1. Starts a fixture server that stands in for Ticketera (a fixed page with
+   configurable latency), so sweeps run without touching the real site.
+2. Starts gunicorn with gunicorn_config.py plus the given workers/threads,
+   loading the app through fixture_app(), which points every event at the
+   fixture server and stubs Discord and Playwright. The "asgi" configuration
+   starts uvicorn with the ASGI serving mode (asgi_app.py) instead.
+3. Runs the simulated clients for --duration seconds after a --ramp.
+
+Clients behave like the dashboard:
+- poll: load "/" once, then fetch /api/tickets following the server's
+  X-Next-Check schedule (at least every 5 s, like dashboard.js), sending the
+  last ETag so unchanged snapshots come back as 304. A --hidden-share of the
+  clients behave like background tabs and poll every 60 s.
+- sse: hold one streaming connection open (--sse-path) and count events;
+  latency is time to the first byte of each connection.
+
+Sweeps run inline in /api/tickets and sleep for jitter between events, so
+with the default JITTER_MAX a request that triggers a sweep holds a worker
+thread for a long time. Use --jitter-max to separate that from raw serving
+capacity.
+
+Usage:
+    python load_test.py --clients 200 --duration 60
+    python load_test.py --clients 500 --config 2x2 --config 4x4 --config 2x8:gthread
+    python load_test.py --clients 2000 --mode sse --config asgi    # uvicorn, asgi_app.py
+    python load_test.py --url http://127.0.0.1:8000 --clients 100   # existing instance
+"""
+import os
+import sys
+import json
+import time
+import random
+import signal
+import socket
+import asyncio
+import argparse
+import tempfile
+import threading
+import subprocess
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import aiohttp
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Mirrors the dashboard's fetch schedule (static/js/dashboard.js)
+MIN_FETCH_INTERVAL = 5.0
+HIDDEN_FETCH_INTERVAL = 60.0
+FETCH_AFTER_CHECK_DELAY = 1.0
+SSE_RECONNECT_DELAY = 3.0  # EventSource default retry
+
+FIXTURE_PAGE = (
+    "<html><head><title>Bad Bunny - Ticketera</title></head>"
+    "<body><h1>Bad Bunny</h1><p>Sold Out</p></body></html>"
+)
+
+
+def fixture_app():
+    """
+    Gunicorn app factory: the real app with checks pointed at the fixture server.
+
+    Configured through LOADTEST_FIXTURE_URL and, optionally, LOADTEST_JITTER_MAX.
+    """
+    import app as monitor
+    from history_store import HistoryStore
+    from alert_rules import RuleStore
+
+    # Keep the fixture URLs even if a monitor_config.json is edited during the run
+    monitor.config_watcher.stop()
+    fixture_url = os.environ['LOADTEST_FIXTURE_URL']
+    urls = {}
+    for event_id in monitor.BAD_BUNNY_EVENT_IDS:
+        month, day = event_id.split('-')
+        urls.setdefault(month.capitalize(), {})[day] = f"{fixture_url}/{event_id}"
+    monitor.TICKETERA_URLS = urls
+    monitor.PLAYWRIGHT_AVAILABLE = False
+    monitor.cart_config['enabled'] = False
+    monitor.send_discord_notification = lambda *args, **kwargs: True
+    # Every tour date is served, past or not, and load-test checks stay out of the real history
+    monitor.ARCHIVE_EVENTS = False
+    monitor.history = HistoryStore(':memory:')
+    monitor.page_archive = None
+    monitor.alert_rules = RuleStore(os.path.join(tempfile.mkdtemp(prefix='loadtest-'), 'alert_rules.json'),
+                                    monitor.BAD_BUNNY_EVENT_IDS)
+    if os.environ.get('LOADTEST_JITTER_MAX'):
+        monitor.JITTER_MAX = float(os.environ['LOADTEST_JITTER_MAX'])
+    return monitor.app
+
+
+def fixture_asgi_app():
+    """Uvicorn app factory: the ASGI serving mode on top of fixture_app()"""
+    fixture_app()
+    import asgi_app
+    return asgi_app.create_app()
+
+
+class FixtureServer:
+    """Stands in for Ticketera: every path returns the same page after a delay"""
+
+    def __init__(self, latency=0.0):
+        self.requests = 0
+        self._lock = threading.Lock()
+        fixture = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                with fixture._lock:
+                    fixture.requests += 1
+                if latency:
+                    time.sleep(latency)
+                body = FIXTURE_PAGE.encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.httpd.daemon_threads = True
+        self.base_url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_server(config, fixture_url, args, log_file):
+    """Start the server for one configuration and wait until it accepts connections"""
+    port = free_port()
+    if config.get('asgi'):
+        command = [
+            sys.executable, '-m', 'uvicorn', '--factory', 'load_test:fixture_asgi_app',
+            '--host', '127.0.0.1', '--port', str(port), '--no-access-log', '--timeout-keep-alive', '65',
+        ]
+    else:
+        command = [
+            sys.executable, '-m', 'gunicorn', '-c', os.path.join(BASE_DIR, 'gunicorn_config.py'),
+            '--bind', f"127.0.0.1:{port}",
+            '--workers', str(config['workers']),
+            '--threads', str(config['threads']),
+            '--worker-class', config['worker_class'],
+            '--access-logfile', '/dev/null',
+            'load_test:fixture_app()',
+        ]
+    env = dict(os.environ, LOADTEST_FIXTURE_URL=fixture_url, CHECK_INTERVAL=str(args.check_interval))
+    if args.jitter_max is not None:
+        env['LOADTEST_JITTER_MAX'] = str(args.jitter_max)
+
+    process = subprocess.Popen(command, cwd=BASE_DIR, env=env, stdout=log_file, stderr=subprocess.STDOUT)
+    base_url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"server exited with {process.returncode}; see {log_file.name}")
+        try:
+            with socket.create_connection(('127.0.0.1', port), timeout=0.5):
+                return process, base_url
+        except OSError:
+            time.sleep(0.2)
+    stop_server(process)
+    raise RuntimeError(f"server did not start within 30s; see {log_file.name}")
+
+
+def stop_server(process):
+    process.send_signal(signal.SIGTERM)
+    try:
+        process.wait(timeout=30)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+
+
+class Stats:
+    """Latency samples and outcomes per endpoint, collected inside the measurement window"""
+
+    def __init__(self):
+        self.latencies = {}
+        self.statuses = Counter()
+        self.errors = Counter()
+        self.events = 0
+        self.measuring = False
+
+    def record(self, endpoint, status, latency):
+        if not self.measuring:
+            return
+        self.latencies.setdefault(endpoint, []).append(latency)
+        self.statuses[status] += 1
+        if status >= 400:
+            self.errors[f"HTTP {status}"] += 1
+
+    def record_error(self, endpoint, error):
+        if not self.measuring:
+            return
+        self.latencies.setdefault(endpoint, [])
+        self.errors[type(error).__name__] += 1
+
+
+def next_fetch_delay(headers, hidden):
+    """Seconds until the next poll, following the server's published schedule"""
+    try:
+        server_time = int(headers.get('X-Server-Time', 0)) / 1000.0
+        next_check = int(headers.get('X-Next-Check', 0)) / 1000.0
+    except ValueError:
+        server_time = next_check = 0
+    delay = MIN_FETCH_INTERVAL
+    if server_time and next_check:
+        delay = max(next_check - server_time + FETCH_AFTER_CHECK_DELAY, MIN_FETCH_INTERVAL)
+    if hidden:
+        delay = max(delay, HIDDEN_FETCH_INTERVAL)
+    return delay
+
+
+async def timed_get(session, stats, base_url, path, headers=None):
+    started = time.perf_counter()
+    try:
+        async with session.get(base_url + path, headers=headers) as response:
+            await response.read()
+            stats.record(path, response.status, time.perf_counter() - started)
+            return response
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        stats.record_error(path, e)
+        return None
+
+
+async def poll_client(session, stats, base_url, stop_at, hidden):
+    await timed_get(session, stats, base_url, '/')
+    etag = None
+    loop = asyncio.get_running_loop()
+    while loop.time() < stop_at:
+        response = await timed_get(session, stats, base_url, '/api/tickets',
+                                   headers={'If-None-Match': etag} if etag else None)
+        if response is not None:
+            etag = response.headers.get('ETag', etag)
+            delay = next_fetch_delay(response.headers, hidden)
+        else:
+            delay = MIN_FETCH_INTERVAL
+        await asyncio.sleep(min(delay, max(0.0, stop_at - loop.time())))
+
+
+async def sse_client(session, stats, base_url, path, stop_at):
+    await timed_get(session, stats, base_url, '/')
+    loop = asyncio.get_running_loop()
+    while loop.time() < stop_at:
+        started = time.perf_counter()
+        try:
+            timeout = aiohttp.ClientTimeout(total=max(0.1, stop_at - loop.time()), sock_read=None)
+            async with session.get(base_url + path, timeout=timeout) as response:
+                stats.record(path, response.status, time.perf_counter() - started)
+                if response.status != 200:
+                    await asyncio.sleep(SSE_RECONNECT_DELAY)
+                    continue
+                async for line in response.content:
+                    if line.startswith(b'data:') and stats.measuring:
+                        stats.events += 1
+        except asyncio.TimeoutError:
+            # The measurement window closed while the stream was open
+            if loop.time() < stop_at:
+                stats.record_error(path, asyncio.TimeoutError())
+        except aiohttp.ClientError as e:
+            stats.record_error(path, e)
+            await asyncio.sleep(SSE_RECONNECT_DELAY)
+
+
+async def run_clients(base_url, args):
+    stats = Stats()
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    stop_at = start + args.ramp + args.duration
+    rng = random.Random(args.seed)
+
+    connector = aiohttp.TCPConnector(limit=0)
+    timeout = aiohttp.ClientTimeout(total=args.timeout)
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        async def client(index):
+            # Spread client start-up over the ramp, like viewers arriving
+            await asyncio.sleep(args.ramp * index / max(1, args.clients))
+            if args.mode == 'sse':
+                await sse_client(session, stats, base_url, args.sse_path, stop_at)
+            else:
+                await poll_client(session, stats, base_url, stop_at, rng.random() < args.hidden_share)
+
+        async def open_window():
+            await asyncio.sleep(args.ramp)
+            stats.measuring = True
+
+        await asyncio.gather(open_window(), *(client(i) for i in range(args.clients)))
+    return stats
+
+
+def percentile(values, pct):
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def summarize(label, stats, duration):
+    all_latencies = [value for values in stats.latencies.values() for value in values]
+    completed = len(all_latencies)
+    errors = sum(stats.errors.values())
+    attempts = completed + sum(count for name, count in stats.errors.items() if not name.startswith('HTTP '))
+    report = {
+        'config': label,
+        'requests': completed,
+        'throughput': completed / duration if duration else 0.0,
+        'error_rate': errors / attempts if attempts else 0.0,
+        'errors': dict(stats.errors),
+        'statuses': {str(status): count for status, count in sorted(stats.statuses.items())},
+        'sse_events': stats.events,
+        'endpoints': {},
+    }
+    for endpoint, values in sorted(stats.latencies.items()):
+        report['endpoints'][endpoint] = {
+            'requests': len(values),
+            'p50_ms': _ms(percentile(values, 50)),
+            'p99_ms': _ms(percentile(values, 99)),
+            'max_ms': _ms(max(values) if values else None),
+        }
+    report['p50_ms'] = _ms(percentile(all_latencies, 50))
+    report['p99_ms'] = _ms(percentile(all_latencies, 99))
+    return report
+
+
+def _ms(value):
+    return None if value is None else round(value * 1000, 1)
+
+
+def parse_config(text):
+    """Parse 'WORKERSxTHREADS[:worker_class]', e.g. '2x2' or '4x8:gthread', or 'asgi'"""
+    if text == 'asgi':
+        return {'asgi': True, 'label': text}
+    shape, _, worker_class = text.partition(':')
+    try:
+        workers, threads = (int(part) for part in shape.lower().split('x'))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Expected WORKERSxTHREADS[:worker_class], got {text!r}")
+    return {'workers': workers, 'threads': threads, 'worker_class': worker_class or 'gthread', 'label': text}
+
+
+def format_ms(value):
+    return "-" if value is None else f"{value:.0f}ms"
+
+
+def print_report(reports, args):
+    print()
+    print(f"{args.clients} {args.mode} clients, {args.duration:.0f}s measured after {args.ramp:.0f}s ramp")
+    print(f"{'config':<18}{'endpoint':<16}{'reqs':>8}{'req/s':>9}{'p50':>9}{'p99':>9}{'max':>9}{'errors':>9}")
+    print("-" * 87)
+    for report in reports:
+        for endpoint, numbers in report['endpoints'].items():
+            print(f"{report['config']:<18}{endpoint:<16}{numbers['requests']:>8}"
+                  f"{numbers['requests'] / args.duration:>9.1f}{format_ms(numbers['p50_ms']):>9}"
+                  f"{format_ms(numbers['p99_ms']):>9}{format_ms(numbers['max_ms']):>9}{'':>9}")
+        print(f"{report['config']:<18}{'(all)':<16}{report['requests']:>8}{report['throughput']:>9.1f}"
+              f"{format_ms(report['p50_ms']):>9}{format_ms(report['p99_ms']):>9}{'':>9}"
+              f"{report['error_rate']:>8.1%}")
+        if report['errors']:
+            print(f"{'':<18}errors: " + ", ".join(f"{name} x{count}" for name, count in report['errors'].items()))
+        if args.mode == 'sse':
+            print(f"{'':<18}events received: {report['sse_events']}")
+    print()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the dashboard API with simulated viewers")
+    parser.add_argument('--clients', type=int, default=100, help="Simulated dashboard clients")
+    parser.add_argument('--duration', type=float, default=60, help="Seconds measured after the ramp")
+    parser.add_argument('--ramp', type=float, default=10, help="Seconds over which clients start")
+    parser.add_argument('--mode', choices=('poll', 'sse'), default='poll', help="Client behaviour")
+    parser.add_argument('--sse-path', default='/api/stream', help="Streaming endpoint for --mode sse")
+    parser.add_argument('--hidden-share', type=float, default=0.0,
+                        help="Fraction of poll clients acting as background tabs")
+    parser.add_argument('--config', action='append', type=parse_config, default=[],
+                        help="gunicorn WORKERSxTHREADS[:worker_class] or 'asgi' to test (repeatable, default 2x2)")
+    parser.add_argument('--url', help="Test an already running instance instead of starting gunicorn")
+    parser.add_argument('--check-interval', type=int, default=15, help="CHECK_INTERVAL for started servers")
+    parser.add_argument('--jitter-max', type=float, help="Override JITTER_MAX in started servers")
+    parser.add_argument('--fixture-latency', type=float, default=0.2, help="Seconds the fixture page takes")
+    parser.add_argument('--timeout', type=float, default=30, help="Client request timeout in seconds")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', action='store_true', help="Print reports as JSON")
+    args = parser.parse_args()
+
+    reports = []
+    if args.url:
+        stats = asyncio.run(run_clients(args.url.rstrip('/'), args))
+        reports.append(summarize(args.url, stats, args.duration))
+    else:
+        fixture = FixtureServer(latency=args.fixture_latency)
+        try:
+            for config in args.config or [parse_config('2x2')]:
+                with tempfile.NamedTemporaryFile('w', prefix='load-test-', suffix='.log', delete=False) as log_file:
+                    process, base_url = start_server(config, fixture.base_url, args, log_file)
+                    try:
+                        stats = asyncio.run(run_clients(base_url, args))
+                    finally:
+                        stop_server(process)
+                report = summarize(config['label'], stats, args.duration)
+                report['server_log'] = log_file.name
+                reports.append(report)
+        finally:
+            fixture.close()
+
+    if args.json:
+        json.dump(reports, sys.stdout, indent=2)
+        print()
+    else:
+        print_report(reports, args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""
+Logging Pipeline
+
+Non-blocking logging for the monitor. Callers only pay for putting a record on
+an in-memory queue; a background QueueListener thread formats the record and
+writes it to stdout. Formatting is lazy: %-style args are merged into the
+message on the writer thread, not on the check or request thread.
+
+Records are emitted as one JSON object per line. Fields passed through
+``extra=`` (event_id, status, ...) become top-level keys.
+
+Repetitive lines can be sampled per key by passing
+``extra={'sample_key': ('requests-check', event_id)}``: only one record in
+every LOG_SAMPLE_EVERY with the same key is kept, and the kept record carries
+the number of records it stands for in "sampled".
+"""
+import sys
+import json
+import queue
+import atexit
+import logging
+import threading
+import traceback
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+
+# Attributes every LogRecord has; anything else came from extra=
+_RECORD_ATTRS = frozenset(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+_listener = None
+_atexit_registered = False
+
+
+class JsonFormatter(logging.Formatter):
+    """Format records as single-line JSON objects"""
+
+    def format(self, record):
+        entry = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'msg': record.getMessage(),
+            'thread': record.threadName,
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS and key != 'sample_key':
+                entry[key] = value
+        if record.exc_text:
+            entry['exc'] = record.exc_text
+        elif record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """Keep one record in every `every` records that share a sample_key"""
+
+    def __init__(self, every):
+        super().__init__()
+        self.every = max(1, every)
+        self._counts = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        key = getattr(record, 'sample_key', None)
+        if key is None or self.every == 1:
+            return True
+        with self._lock:
+            count = self._counts.get(key, 0)
+            self._counts[key] = count + 1
+        if count % self.every:
+            return False
+        record.sampled = self.every
+        return True
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """
+    QueueHandler that never blocks and defers formatting to the listener.
+
+    The stock QueueHandler formats the message in the calling thread; this one
+    only renders exception tracebacks (which hold frame references) and leaves
+    msg/args for the writer thread. When the queue is full, records are dropped
+    and counted instead of waiting.
+    """
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record):
+        if record.exc_info:
+            record.exc_text = ''.join(traceback.format_exception(*record.exc_info))
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def configure_logging(level=logging.INFO, fmt='json', sample_every=20, queue_size=10000, stream=None):
+    """
+    Route all logging through a bounded queue and a background writer thread.
+
+    Args:
+        level: Root log level
+        fmt: 'json' for structured lines, 'text' for human-readable lines
+        sample_every: Keep 1 in N records per sample_key
+        queue_size: Records buffered before new ones are dropped
+        stream: Output stream for the writer (defaults to sys.stdout)
+
+    Returns:
+        The NonBlockingQueueHandler installed on the root logger
+    """
+    global _listener, _atexit_registered
+
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+    output = logging.StreamHandler(stream or sys.stdout)
+    if fmt == 'json':
+        output.setFormatter(JsonFormatter())
+    else:
+        output.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(name)s - %(message)s'))
+
+    log_queue = queue.Queue(maxsize=queue_size)
+    handler = NonBlockingQueueHandler(log_queue)
+    handler.addFilter(SamplingFilter(sample_every))
+
+    root = logging.getLogger()
+    for existing in list(root.handlers):
+        root.removeHandler(existing)
+    root.addHandler(handler)
+    root.setLevel(level)
+
+    _listener = QueueListener(log_queue, output, respect_handler_level=True)
+    _listener.start()
+    if not _atexit_registered:
+        atexit.register(shutdown_logging)
+        _atexit_registered = True
+    return handler
+
+
+def shutdown_logging():
+    """Flush queued records and stop the writer thread"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
@@ -0,0 +1,66 @@
+"""
+Metrics
+
+Process-local counters rendered in the Prometheus text exposition format for
+GET /metrics. Gauges are not stored: the endpoint computes them from live
+state at scrape time and passes them to render().
+
+Each gunicorn worker keeps its own counters, so every sample carries a "pid"
+label; sum across pids when graphing.
+"""
+import os
+import threading
+
+_lock = threading.Lock()
+_counters = {}  # (name, sorted label items) -> value
+_help = {}  # name -> (type, help text)
+
+
+def describe(name, kind, help_text):
+    """Register HELP/TYPE lines for a metric ('counter' or 'gauge')"""
+    _help[name] = (kind, help_text)
+
+
+def inc(name, amount=1, **labels):
+    key = (name, tuple(sorted(labels.items())))
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + amount
+
+
+def counter_value(name, **labels):
+    with _lock:
+        return _counters.get((name, tuple(sorted(labels.items()))), 0)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _sample(name, labels, value):
+    labels = dict(labels, pid=os.getpid())
+    label_text = ','.join(f'{key}="{_escape(val)}"' for key, val in sorted(labels.items()))
+    return f"{name}{{{label_text}}} {value:g}"
+
+
+def render(gauges=()):
+    """
+    Render all counters plus the given gauges.
+
+    Args:
+        gauges: Iterable of (name, labels dict, value) computed by the caller
+    """
+    samples = {}
+    with _lock:
+        for (name, labels), value in _counters.items():
+            samples.setdefault(name, []).append(_sample(name, dict(labels), value))
+    for name, labels, value in gauges:
+        samples.setdefault(name, []).append(_sample(name, labels, value))
+
+    lines = []
+    for name in sorted(samples):
+        if name in _help:
+            kind, help_text = _help[name]
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+        lines.extend(sorted(samples[name]))
+    return '\n'.join(lines) + '\n'
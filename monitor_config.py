@@ -0,0 +1,187 @@
+"""
+Monitor Configuration
+
+Hot-reloadable settings for the running monitor. A JSON file (by default
+monitor_config.json next to app.py, or MONITOR_CONFIG_PATH) may set any of:
+
+    {
+        "CHECK_INTERVAL": 15,
+        "MAX_DATES_PER_CHECK": 3,
+        "JITTER_MAX": 10,
+        "event_urls": {"July": {"12": "https://choli.ticketera.com/..."}}
+    }
+
+Keys left out keep their built-in defaults. A ConfigWatcher polls the file's
+mtime and size; when they change the file is parsed and validated, and only a
+fully valid file is handed to the apply callback as one versioned object. An
+invalid edit is logged and reported, and the previous config stays in force.
+"""
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POLL_INTERVAL = 2.0
+
+# Setting -> (type, minimum, maximum)
+SETTING_RULES = {
+    'CHECK_INTERVAL': (int, 5, 3600),
+    'MAX_DATES_PER_CHECK': (int, 1, 100),
+    'JITTER_MAX': (float, 1.0, 300.0),
+}
+
+
+def validate_config(data, known_dates):
+    """
+    Check a parsed config file and return its normalised settings.
+
+    Args:
+        data: Parsed JSON object
+        known_dates: {'July': ['12', ...], ...}; event_urls may only name these
+
+    Returns:
+        Dictionary with the settings present in data
+
+    Raises:
+        ValueError listing every problem found
+    """
+    if not isinstance(data, dict):
+        raise ValueError("config must be a JSON object")
+
+    errors = []
+    settings = {}
+    for key, value in data.items():
+        if key in SETTING_RULES:
+            kind, low, high = SETTING_RULES[key]
+            # bool is an int subclass; "true" is never a valid interval
+            if isinstance(value, bool) or not isinstance(value, (int, float)) or (kind is int and value != int(value)):
+                errors.append(f"{key} must be {'an integer' if kind is int else 'a number'}")
+            elif not low <= value <= high:
+                errors.append(f"{key} must be between {low:g} and {high:g}")
+            else:
+                settings[key] = kind(value)
+        elif key == 'event_urls':
+            urls = _validate_event_urls(value, known_dates, errors)
+            if urls is not None:
+                settings['event_urls'] = urls
+        else:
+            errors.append(f"unknown setting {key!r}")
+
+    if errors:
+        raise ValueError("; ".join(errors))
+    return settings
+
+
+def _validate_event_urls(value, known_dates, errors):
+    if not isinstance(value, dict):
+        errors.append("event_urls must map months to {day: url}")
+        return None
+    urls = {}
+    for month, days in value.items():
+        if month not in known_dates:
+            errors.append(f"event_urls: unknown month {month!r}")
+            continue
+        if not isinstance(days, dict):
+            errors.append(f"event_urls[{month!r}] must map days to urls")
+            continue
+        for day, url in days.items():
+            day = str(day)
+            if day not in known_dates[month]:
+                errors.append(f"event_urls: no event on {month} {day}")
+            elif not isinstance(url, str) or not url.startswith(('https://', 'http://')):
+                errors.append(f"event_urls[{month!r}][{day!r}] must be an http(s) URL")
+            else:
+                urls.setdefault(month, {})[day] = url
+    return urls
+
+
+def config_hash(settings):
+    """Content hash of the settings; identical across workers that loaded the same file"""
+    canonical = json.dumps(settings, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()[:12]
+
+
+class ConfigWatcher:
+    """Polls a config file and applies each valid revision through a callback"""
+
+    def __init__(self, path, known_dates, apply, poll_interval=DEFAULT_POLL_INTERVAL):
+        self.path = path
+        self.known_dates = known_dates
+        self.apply = apply
+        self.poll_interval = poll_interval
+        self.version = 0
+        self.hash = None
+        self.loaded_at = None
+        self.last_error = None
+        self._signature = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def check(self):
+        """Reload the file if it changed; returns True when a new config was applied"""
+        with self._lock:
+            try:
+                stat = os.stat(self.path)
+                signature = (stat.st_mtime_ns, stat.st_size)
+            except FileNotFoundError:
+                signature = None
+            if signature == self._signature:
+                return False
+            self._signature = signature
+
+            if signature is None:
+                # Removing the file goes back to the built-in defaults
+                settings = {}
+            else:
+                try:
+                    with open(self.path, encoding='utf-8') as f:
+                        settings = validate_config(json.load(f), self.known_dates)
+                except (OSError, ValueError) as e:
+                    self.last_error = f"{type(e).__name__}: {e}"
+                    logger.error("Rejected monitor config %s (keeping version %d): %s",
+                                 self.path, self.version, e)
+                    return False
+
+            digest = config_hash(settings)
+            self.last_error = None
+            if digest == self.hash:
+                return False
+            self.apply(settings)
+            self.version += 1
+            self.hash = digest
+            self.loaded_at = time.time()
+            logger.info("Applied monitor config version %d (%s) from %s", self.version, digest, self.path,
+                        extra={'config_version': self.version, 'config_hash': digest})
+            return True
+
+    def start(self):
+        """Load the current file now, then keep polling in a daemon thread"""
+        self.check()
+        self._thread = threading.Thread(target=self._run, name='config-watcher', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.wait(self.poll_interval):
+            try:
+                self.check()
+            except Exception:
+                logger.exception("Monitor config check failed")
+
+    def describe(self):
+        return {
+            'version': self.version,
+            'hash': self.hash,
+            'loadedAt': self.loaded_at,
+            'source': self.path,
+            'sourceExists': self._signature is not None,
+            'lastError': self.last_error,
+        }
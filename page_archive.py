@@ -0,0 +1,160 @@
+"""
+Page Archive
+
+Keeps a copy of every distinct page the checker fetched, so a wrong verdict
+can be traced back to exactly what the classifier saw.
+
+Pages are content-addressed: the key is the SHA-256 of the raw response
+body, and the file lives at <root>/<first two hex digits>/<hash>.<codec>.
+A page that has not changed since the last check costs one hash and no
+write. Bodies are compressed with zstd when the zstandard package is
+installed, and with zlib otherwise. Either codec can be read back regardless
+of which one wrote the file.
+
+The archive is bounded: once its files exceed max_bytes, the least recently
+seen files are deleted until it is back under 90% of the limit. Every
+duplicate hit refreshes the file's mtime, so a page that keeps being served
+(an event whose page has not changed) is never the one evicted.
+
+There is no in-memory index of what is on disk: several workers share the
+directory and any of them may evict a page, so the file itself is checked
+on every store.
+"""
+import os
+import zlib
+import hashlib
+import logging
+import threading
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+CODECS = ('zst', 'zz')
+ZSTD_LEVEL = 10  # Pages are written once and compress well; spend a little CPU for size
+ZLIB_LEVEL = 6
+
+
+def page_hash(body):
+    return hashlib.sha256(body).hexdigest()
+
+
+def compress(body):
+    """Return (codec, compressed bytes) using the best codec available"""
+    if zstandard is not None:
+        return 'zst', zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(body)
+    return 'zz', zlib.compress(body, ZLIB_LEVEL)
+
+
+def decompress(codec, data):
+    if codec == 'zst':
+        if zstandard is None:
+            raise RuntimeError("zstandard is not installed: pip install zstandard")
+        return zstandard.ZstdDecompressor().decompress(data)
+    if codec == 'zz':
+        return zlib.decompress(data)
+    raise ValueError(f"Unknown codec {codec!r}")
+
+
+def is_page_hash(digest):
+    return len(digest) == 64 and all(c in '0123456789abcdef' for c in digest)
+
+
+def find_page(root, digest):
+    """(codec, path) of an archived page, or None"""
+    for codec in CODECS:
+        path = os.path.join(root, digest[:2], f"{digest}.{codec}")
+        if os.path.exists(path):
+            return codec, path
+    return None
+
+
+def load_page(root, digest):
+    """Decompressed page body for a hash, or None if it is not archived"""
+    found = find_page(root, digest) if is_page_hash(digest) else None
+    if not found:
+        return None
+    codec, path = found
+    with open(path, 'rb') as f:
+        return decompress(codec, f.read())
+
+
+def page_files(root):
+    """(mtime, path, size) for every page archived under root"""
+    files = []
+    for directory in os.scandir(root):
+        if not directory.is_dir():
+            continue
+        for entry in os.scandir(directory.path):
+            if entry.name.endswith(CODECS):
+                stat = entry.stat()
+                files.append((stat.st_mtime, entry.path, stat.st_size))
+    return files
+
+
+class PageArchive:
+    def __init__(self, root, max_bytes=256 * 1024 * 1024):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.stats = {'stored': 0, 'duplicate': 0, 'evicted': 0}
+        self._lock = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+        self.total_bytes = sum(size for _, _, size in page_files(root))
+
+    def _path(self, digest, codec):
+        return os.path.join(self.root, digest[:2], f"{digest}.{codec}")
+
+    def store(self, body):
+        """Archive a page body (bytes) and return its hash"""
+        digest = page_hash(body)
+        found = find_page(self.root, digest)
+        if found:
+            try:
+                # Mark the page as recently seen so eviction keeps it
+                os.utime(found[1])
+                with self._lock:
+                    self.stats['duplicate'] += 1
+                return digest
+            except FileNotFoundError:
+                pass  # Another worker evicted it just now; write it again
+
+        codec, data = compress(body)
+        path = self._path(digest, codec)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write then rename so readers never see a partial file
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(data)
+        os.replace(temp_path, path)
+
+        with self._lock:
+            self.stats['stored'] += 1
+            self.total_bytes += len(data)
+            over_limit = self.total_bytes > self.max_bytes
+        if over_limit:
+            self.evict()
+        return digest
+
+    def load(self, digest):
+        return load_page(self.root, digest)
+
+    def evict(self):
+        """Delete the oldest pages until the archive is under 90% of max_bytes"""
+        with self._lock:
+            files = sorted(page_files(self.root))
+            total = sum(size for _, _, size in files)
+            target = self.max_bytes * 0.9
+            for _, path, size in files:
+                if total <= target:
+                    break
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                total -= size
+                self.stats['evicted'] += 1
+            # Rescanned totals also pick up pages other workers wrote
+            self.total_bytes = total
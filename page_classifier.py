@@ -0,0 +1,115 @@
+"""
+Ticketera Page Classifier
+
+Turns a fetched event page into the status shown on the dashboard. It only
+looks at the page it is given: importing this module starts no threads and
+opens no stores, so offline tools (reclassify.py, bench_parsers.py, the
+replay harness) can run the exact production rules without importing app.py.
+
+document_class picks the HTML parser backend (see page_parser.py); app.py
+passes the one selected by PARSER_BACKEND.
+"""
+import logging
+
+from inventory_scan import INVENTORY_MARKERS, extract_inventory_count
+from page_parser import SoupDocument
+
+logger = logging.getLogger(__name__)
+
+
+def classify_ticketera_page(page_html, event_url, document_class=SoupDocument):
+    """Classify a fetched Ticketera page into a display status."""
+    # Parse the html content
+    document = document_class(page_html)
+    scripts = document.scripts()
+    
+    # Look for checkout links
+    checkout_links = []
+    # Search for checkout links in href attributes
+    checkout_pattern = "/checkout/"
+    for href in document.links():
+        if checkout_pattern in href:
+            checkout_links.append(href)
+    
+    # Also look for checkout links in the page JavaScript
+    for script_text in scripts:
+        if script_text and checkout_pattern in script_text:
+            # Extract potential checkout URLs from JavaScript
+            start_idx = 0
+            while True:
+                start_idx = script_text.find(checkout_pattern, start_idx)
+                if start_idx == -1:
+                    break
+                # Try to extract the full URL
+                end_idx = script_text.find('"', start_idx)
+                if end_idx == -1:
+                    end_idx = script_text.find("'", start_idx)
+                if end_idx == -1:
+                    end_idx = script_text.find('\\', start_idx)
+                if end_idx == -1:
+                    end_idx = script_text.find(' ', start_idx)
+                if end_idx == -1:
+                    end_idx = start_idx + 100  # Limit to reasonable length
+                
+                potential_link = script_text[start_idx-20:end_idx].strip()
+                if 'http' in potential_link:
+                    http_start = potential_link.find('http')
+                    potential_link = potential_link[http_start:]
+                    checkout_links.append(potential_link)
+                else:
+                    checkout_links.append('https://choli.ticketera.com' + potential_link)
+                
+                start_idx = end_idx
+    
+    # If we found checkout links, this is highly valuable information
+    if checkout_links:
+        checkout_links = list(dict.fromkeys(checkout_links))  # Remove duplicates, keeping page order
+        # Format the first checkout link for display
+        formatted_link = checkout_links[0]
+        if len(formatted_link) > 60:
+            formatted_link = formatted_link[:60] + "..."
+        
+        # The full page is in the page archive when it is on; the links also go to the log
+        logger.info("Checkout links found: %s", ' '.join(checkout_links), extra={'url': event_url})
+        
+        # Return a special message with checkout link information
+        return f"🚨 DIRECT CHECKOUT AVAILABLE! 🚨 Link: {formatted_link}"
+    
+    # Look for indicators of ticket availability
+    if "¡Entradas disponibles!" in page_html or "Comprar ahora" in page_html:
+        # Try to extract actual inventory numbers if available
+        try:
+            # Look for the inventory counter in the JSON data that's often embedded in the page
+            if any(marker in page_html for marker in INVENTORY_MARKERS):
+                # Scan the scripts for the known inventory keys instead of
+                # parsing each one as a whole JSON document
+                inventory_count = extract_inventory_count(scripts)
+                
+                if inventory_count is not None:
+                    return f"🔥 TICKETS AVAILABLE! {inventory_count} tickets in stock 🔥"
+            
+            # If we couldn't get exact inventory, try to find inventory indicators in the HTML
+            for element_text in document.texts('inventory'):
+                if element_text.strip() and any(c.isdigit() for c in element_text):
+                    inventory_text = element_text.strip()
+                    return f"🔥 TICKETS AVAILABLE! Stock: {inventory_text} 🔥"
+        except Exception as e:
+            logger.warning("Error trying to extract inventory: %s", e, extra={'url': event_url})
+            
+        # If all inventory extraction fails, just return the basic availability message
+        return "🔥 TICKETS AVAILABLE! CHECK NOW 🔥"
+    elif "coming soon" in page_html.lower() or "próximamente" in page_html.lower():
+        return "⚡ Coming Soon"
+    elif "sold out" in page_html.lower() or "agotado" in page_html.lower():
+        return "❌ Sold Out"
+    else:
+        # Check for specific elements that might indicate availability
+        if document.exists('buy_buttons'):
+            return "⚠️ Possible Availability - CHECK NOW"
+        
+        # Check for waitlist or queue indicators
+        if document.exists('waitlist'):
+            return "⏳ In Queue/Waitlist"
+        
+        # Fallback message
+        return "⚡ Not Yet Available"
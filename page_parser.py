@@ -0,0 +1,124 @@
+"""
+Page Parser Backends
+
+The classifier only asks a few questions of a page: its link targets, its
+inline scripts, the text of the inventory elements, and whether any
+buy-button or waitlist element exists. Each backend answers them with
+selectors compiled once at import rather than on every call:
+
+    soup   BeautifulSoup over lxml with soupsieve-compiled CSS selectors
+           (the original classifier)
+    lxml   lxml's libxml2 tree queried with precompiled XPath; skips building
+           BeautifulSoup's Python object tree, so it is several times faster
+
+The backends give the same verdicts on the benchmark and replay pages. Run
+bench_parsers.py on a fresh capture before switching PARSER_BACKEND.
+"""
+import threading
+
+import soupsieve
+from bs4 import BeautifulSoup
+from lxml import etree
+
+# Name -> CSS selector used by the classifier
+SELECTORS = {
+    'inventory': '[data-inventory], [data-stock], .inventory-count, .stock-level, .tickets-available',
+    'buy_buttons': 'button.buy-button, .checkout-button, .buy-now',
+    'waitlist': '.waitlist, .queue, .waiting-room',
+}
+
+
+def _has_class(name):
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+# The same selectors as XPath, written out since cssselect is not a dependency
+XPATHS = {
+    'inventory': "//*[@data-inventory or @data-stock or {} or {} or {}]".format(
+        _has_class('inventory-count'), _has_class('stock-level'), _has_class('tickets-available')),
+    'buy_buttons': "//*[(self::button and {}) or {} or {}]".format(
+        _has_class('buy-button'), _has_class('checkout-button'), _has_class('buy-now')),
+    'waitlist': "//*[{} or {} or {}]".format(
+        _has_class('waitlist'), _has_class('queue'), _has_class('waiting-room')),
+}
+# BeautifulSoup's get_text() leaves out script, style and template contents
+ELEMENT_TEXT = ".//text()[not(ancestor::script or ancestor::style or ancestor::template)]"
+
+COMPILED_SELECTORS = {name: soupsieve.compile(css) for name, css in SELECTORS.items()}
+
+
+class SoupDocument:
+    def __init__(self, page_html):
+        self.soup = BeautifulSoup(page_html, 'lxml')
+
+    def links(self):
+        return [link['href'] for link in self.soup.find_all('a', href=True)]
+
+    def scripts(self):
+        """Text of each inline script (None for empty ones)"""
+        return [script.string for script in self.soup.find_all('script')]
+
+    def texts(self, name):
+        return [element.get_text() for element in COMPILED_SELECTORS[name].select(self.soup)]
+
+    def exists(self, name):
+        return COMPILED_SELECTORS[name].select_one(self.soup) is not None
+
+
+# lxml parsers must not be shared between threads; XPath objects are compiled
+# per thread alongside them
+_lxml_state = threading.local()
+
+
+def _lxml_compiled():
+    compiled = getattr(_lxml_state, 'compiled', None)
+    if compiled is None:
+        compiled = _lxml_state.compiled = {
+            'parser': etree.HTMLParser(),
+            'utf8_parser': etree.HTMLParser(encoding='utf-8'),
+            'links': etree.XPath('//a/@href'),
+            'scripts': etree.XPath('//script'),
+            'text': etree.XPath(ELEMENT_TEXT),
+            'selectors': {name: etree.XPath(xpath) for name, xpath in XPATHS.items()},
+        }
+    return compiled
+
+
+class LxmlDocument:
+    def __init__(self, page_html):
+        self._compiled = _lxml_compiled()
+        try:
+            self.root = etree.fromstring(page_html, self._compiled['parser'])
+        except ValueError:
+            # lxml refuses str input carrying an XML encoding declaration
+            self.root = etree.fromstring(page_html.encode('utf-8'), self._compiled['utf8_parser'])
+
+    def links(self):
+        if self.root is None:
+            return []
+        return [str(href) for href in self._compiled['links'](self.root)]
+
+    def scripts(self):
+        if self.root is None:
+            return []
+        return [script.text for script in self._compiled['scripts'](self.root)]
+
+    def texts(self, name):
+        if self.root is None:
+            return []
+        text = self._compiled['text']
+        return [''.join(text(element)) for element in self._compiled['selectors'][name](self.root)]
+
+    def exists(self, name):
+        return self.root is not None and bool(self._compiled['selectors'][name](self.root))
+
+
+BACKENDS = {'soup': SoupDocument, 'lxml': LxmlDocument}
+
+
+def parser_backend(name):
+    """Document class for a backend name; raises ValueError for unknown names"""
+    try:
+        return BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"Unknown parser backend {name!r}; expected one of {', '.join(BACKENDS)}")
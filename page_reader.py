@@ -0,0 +1,113 @@
+"""
+Bounded Page Reading
+
+Reads a streamed HTTP response in chunks instead of buffering the whole body,
+so an oversized error page or script bundle cannot blow up a worker's memory.
+
+- Bodies are cut off at max_bytes (decoded size). The truncated page is still
+  classified, since the status markers sit near the top of a Ticketera page,
+  but the caller gets the truncation reason so the check can be flagged.
+- A compressed response that inflates by more than max_ratio once past
+  RATIO_MIN_BYTES is treated as a decompression bomb and abandoned.
+- Text is decoded chunk by chunk with an incremental decoder, so a multi-byte
+  character split across chunks decodes correctly.
+
+The classifier still receives the page as one string rather than a stream:
+both parser backends (page_parser.py) build the whole tree before any
+selector runs, so feeding them chunks would not lower the peak. What bounds
+memory is the cap on the document itself.
+"""
+import codecs
+import threading
+
+MAX_PAGE_BYTES = 2 * 1024 * 1024
+MAX_COMPRESSION_RATIO = 100  # HTML compresses 5-10x; far beyond that is not a page
+RATIO_MIN_BYTES = 256 * 1024  # Small bodies cannot do harm, whatever their ratio
+CHUNK_SIZE = 64 * 1024
+
+TRUNCATED_SIZE = 'size'
+TRUNCATED_RATIO = 'ratio'
+
+
+class PageBuffer:
+    """Accumulates the chunks of one response body"""
+
+    def __init__(self, reader, encoding):
+        self.reader = reader
+        self.size = 0
+        self.truncated = None
+        self._chunks = []
+        self._text = []
+        try:
+            self._decoder = codecs.getincrementaldecoder(encoding or 'utf-8')(errors='replace')
+        except LookupError:
+            self._decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+
+    def add(self, chunk, wire_bytes=None):
+        """
+        Add a decoded (decompressed) chunk.
+
+        Args:
+            wire_bytes: Compressed bytes received so far, if known
+
+        Returns:
+            False once reading should stop
+        """
+        room = self.reader.max_bytes - self.size
+        if len(chunk) > room:
+            chunk = chunk[:room]
+            self.truncated = TRUNCATED_SIZE
+        self.size += len(chunk)
+        self._chunks.append(chunk)
+        self._text.append(self._decoder.decode(chunk))
+        if (wire_bytes and self.size > RATIO_MIN_BYTES and
+                self.size / wire_bytes > self.reader.max_ratio):
+            self.truncated = TRUNCATED_RATIO
+        return self.truncated is None
+
+    def finish(self):
+        """(body bytes, decoded text, truncation reason or None)"""
+        self._text.append(self._decoder.decode(b'', final=True))
+        self.reader._record(self.size, self.truncated)
+        return b''.join(self._chunks), ''.join(self._text), self.truncated
+
+
+class PageReader:
+    def __init__(self, max_bytes=MAX_PAGE_BYTES, max_ratio=MAX_COMPRESSION_RATIO, chunk_size=CHUNK_SIZE):
+        self.max_bytes = max_bytes
+        self.max_ratio = max_ratio
+        self.chunk_size = chunk_size
+        self.stats = {TRUNCATED_SIZE: 0, TRUNCATED_RATIO: 0}
+        self.peak_bytes = 0
+        self._lock = threading.Lock()
+
+    def buffer(self, encoding):
+        return PageBuffer(self, encoding)
+
+    def read(self, response):
+        """Read a requests response opened with stream=True"""
+        buffer = self.buffer(response.encoding)
+        for chunk in response.iter_content(self.chunk_size):
+            # tell() counts bytes taken off the wire, before decompression
+            if not buffer.add(chunk, response.raw.tell()):
+                break
+        return buffer.finish()
+
+    async def read_async(self, response):
+        """Read an aiohttp response"""
+        buffer = self.buffer(response.charset)
+        # aiohttp does not expose the compressed byte count; measuring against
+        # the declared compressed length never overstates the ratio
+        wire_bytes = None
+        if response.headers.get('Content-Encoding') and response.content_length:
+            wire_bytes = response.content_length
+        async for chunk in response.content.iter_chunked(self.chunk_size):
+            if not buffer.add(chunk, wire_bytes):
+                break
+        return buffer.finish()
+
+    def _record(self, size, truncated):
+        with self._lock:
+            self.peak_bytes = max(self.peak_bytes, size)
+            if truncated:
+                self.stats[truncated] += 1
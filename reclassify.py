@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""
+Bulk Re-classification
+
+Runs archived or saved pages through the current classifier
+(classify_ticketera_page) and reports how the verdicts differ from the old
+ones, so a change to the availability rules can be checked against real
+pages before it is deployed.
+
+Pages come from:
+
+- the page archive (PAGE_ARCHIVE_DIR). With --history, the pages referenced
+  by the check history are used, and each page's old verdict is the status
+  its latest check recorded. Without --history, every archived page is used.
+- HTML files or directories of *.html / *.htm files given on the command line.
+
+--baseline takes old verdicts from an earlier report instead, keyed by page.
+That is how saved HTML files get old verdicts: report once before changing
+the rules and once after.
+
+Pages are spread over a process pool in chunks. Workers load and decode the
+pages themselves, so only hashes and paths cross process boundaries. The
+number of chunks in flight is bounded, and the timing percentiles come from a
+fixed-size random sample, so memory stays flat however many pages there are.
+
+The classifier is imported from page_classifier.py, not app.py, so running
+this script starts no monitor threads and opens none of the monitor's stores.
+--parser picks the backend (default: PARSER_BACKEND, else soup).
+
+The report is newline-delimited JSON, one line per page:
+
+    {"page": ..., "event_id": ..., "old": ..., "new": ..., "changed": true,
+     "checks": 12, "bytes": 48213, "ms": 3.1}
+
+A summary of changed verdicts and timings is printed at the end.
+
+Usage:
+    python reclassify.py --archive page_archive --history history.db
+    python reclassify.py pages/ --output before.ndjson
+    python reclassify.py pages/ --baseline before.ndjson --changed-only
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+from history_store import HistoryStore
+from page_archive import load_page, page_files
+from page_classifier import classify_ticketera_page
+from page_parser import BACKENDS
+
+DEFAULT_CHUNK_SIZE = 64
+HTML_SUFFIXES = ('.html', '.htm')
+TIMING_SAMPLE = 10000  # Classify times kept for the percentiles
+
+_archive_root = None
+_document_class = None
+
+
+def _init_worker(archive_root, parser):
+    global _archive_root, _document_class
+    _archive_root = archive_root
+    _document_class = BACKENDS[parser]
+
+
+def _read_page(page):
+    if page['source'] == 'archive':
+        return load_page(_archive_root, page['page'])
+    with open(page['page'], 'rb') as f:
+        return f.read()
+
+
+def classify_chunk(pages):
+    """Worker: classify a list of page references, returning one result per page"""
+    results = []
+    for page in pages:
+        result = {'page': page['page'], 'new': None, 'bytes': None, 'ms': None}
+        try:
+            body = _read_page(page)
+            if body is None:
+                result['error'] = 'not archived'
+            else:
+                # Archived pages are raw response bodies; Ticketera serves UTF-8
+                page_html = body.decode('utf-8', errors='replace')
+                start = time.perf_counter()
+                result['new'] = classify_ticketera_page(page_html, page.get('url') or page['page'], _document_class)
+                result['ms'] = round((time.perf_counter() - start) * 1000, 3)
+                result['bytes'] = len(body)
+        except Exception as e:
+            result['error'] = f"{type(e).__name__}: {e}"
+        results.append(result)
+    return results
+
+
+def archived_pages(archive_root, history_path):
+    """Page references for the archive, with old verdicts from the history when given"""
+    if not history_path:
+        for _, path, _ in page_files(archive_root):
+            yield {'source': 'archive', 'page': os.path.basename(path).split('.')[0]}
+        return
+
+    history = HistoryStore(history_path)
+    pages = {}
+    for row in history.page_verdicts():
+        page = pages.setdefault(row['page_hash'], {
+            'source': 'archive', 'page': row['page_hash'], 'old_verdicts': {}, 'checks': 0,
+            'checked_at': -1,
+        })
+        page['old_verdicts'][row['status']] = row['checks']
+        page['checks'] += row['checks']
+        if row['checked_at'] > page['checked_at']:
+            page.update(old=row['status'], checked_at=row['checked_at'],
+                        event_id=row['event_id'], url=row['url'])
+    history.close()
+    for page in pages.values():
+        del page['checked_at']
+        yield page
+
+
+def file_pages(paths):
+    for path in paths:
+        if os.path.isdir(path):
+            for directory, _, names in os.walk(path):
+                for name in sorted(names):
+                    if name.endswith(HTML_SUFFIXES):
+                        yield {'source': 'file', 'page': os.path.join(directory, name)}
+        else:
+            yield {'source': 'file', 'page': path}
+
+
+def load_baseline(path):
+    """page -> verdict from an earlier report"""
+    verdicts = {}
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                row = json.loads(line)
+                verdicts[row['page']] = row.get('new')
+    return verdicts
+
+
+def chunked(pages, size):
+    chunk = []
+    for page in pages:
+        chunk.append(page)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def sample_timing(summary, ms, rng):
+    """Keep a uniform random sample of at most TIMING_SAMPLE classify times"""
+    summary['timed'] += 1
+    summary['max_ms'] = max(summary['max_ms'], ms)
+    if len(summary['ms']) < TIMING_SAMPLE:
+        summary['ms'].append(ms)
+    else:
+        slot = rng.randrange(summary['timed'])
+        if slot < TIMING_SAMPLE:
+            summary['ms'][slot] = ms
+
+
+def reclassify(pages, report, archive_root=None, baseline=None, workers=None,
+               chunk_size=DEFAULT_CHUNK_SIZE, changed_only=False, parser='soup'):
+    """
+    Classify pages in a process pool and write one report line per page.
+
+    Args:
+        pages: Iterable of page references (see archived_pages / file_pages)
+        report: Text file the NDJSON report is written to
+        baseline: page -> old verdict, overriding the verdicts from the history
+
+    Returns:
+        Summary dictionary
+    """
+    workers = workers or os.cpu_count() or 1
+    summary = {'pages': 0, 'changed': 0, 'errors': 0, 'changes': Counter(),
+               'ms': [], 'timed': 0, 'max_ms': 0, 'slowest': []}
+    rng = random.Random(0)
+
+    def write(page, result):
+        row = {
+            'page': page['page'],
+            'event_id': page.get('event_id'),
+            'old': baseline.get(page['page']) if baseline is not None else page.get('old'),
+            'new': result['new'],
+        }
+        row['changed'] = row['old'] is not None and row['new'] is not None and row['old'] != row['new']
+        row.update(checks=page.get('checks'), bytes=result['bytes'], ms=result['ms'])
+        if page.get('old_verdicts') and len(page['old_verdicts']) > 1:
+            row['old_verdicts'] = page['old_verdicts']
+        if 'error' in result:
+            row['error'] = result['error']
+            summary['errors'] += 1
+
+        summary['pages'] += 1
+        if row['changed']:
+            summary['changed'] += 1
+            summary['changes'][(row['old'], row['new'])] += 1
+        if row['ms'] is not None:
+            sample_timing(summary, row['ms'], rng)
+            summary['slowest'] = sorted(summary['slowest'] + [(row['ms'], row['page'])], reverse=True)[:5]
+        if row['changed'] or not changed_only:
+            report.write(json.dumps(row, ensure_ascii=False) + '\n')
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(archive_root, parser)) as pool:
+        # Keep a couple of chunks queued per worker; the page list is never materialized
+        pending = {}
+        chunks = chunked(pages, chunk_size)
+        for chunk in chunks:
+            pending[pool.submit(classify_chunk, chunk)] = chunk
+            if len(pending) < workers * 2:
+                continue
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                for page, result in zip(pending.pop(future), future.result()):
+                    write(page, result)
+        for future in list(pending):
+            for page, result in zip(pending.pop(future), future.result()):
+                write(page, result)
+    summary['seconds'] = time.perf_counter() - start
+    return summary
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))] if values else 0
+
+
+def print_summary(summary, out=sys.stdout):
+    timings = summary['ms']
+    rate = summary['pages'] / summary['seconds'] if summary['seconds'] else 0
+    out.write(f"{summary['pages']} pages in {summary['seconds']:.1f}s ({rate:.0f} pages/s), "
+              f"{summary['changed']} changed, {summary['errors']} errors\n")
+    if timings:
+        out.write(f"classify ms: p50 {percentile(timings, 0.5):.1f}  p95 {percentile(timings, 0.95):.1f}  "
+                  f"max {summary['max_ms']:.1f}\n")
+    if summary['changes']:
+        out.write("\nChanged verdicts:\n")
+        for (old, new), count in summary['changes'].most_common():
+            out.write(f"  {count:6d}  {old}  ->  {new}\n")
+    if summary['slowest']:
+        out.write("\nSlowest pages:\n")
+        for ms, page in summary['slowest']:
+            out.write(f"  {ms:8.1f} ms  {page}\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-run archived or saved pages through the classifier")
+    parser.add_argument('paths', nargs='*', help="HTML files or directories of saved pages")
+    parser.add_argument('--archive', help="Page archive directory (default without paths: PAGE_ARCHIVE_DIR)")
+    parser.add_argument('--history', help="Check history database holding the old verdicts")
+    parser.add_argument('--baseline', help="Earlier report to take the old verdicts from")
+    parser.add_argument('--output', '-o', default='reclassify_report.ndjson', help="NDJSON report path")
+    parser.add_argument('--changed-only', action='store_true', help="Only report pages whose verdict changed")
+    parser.add_argument('--workers', type=int, help="Worker processes (default: all cores)")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help="Pages per task")
+    parser.add_argument('--parser', choices=list(BACKENDS), default=os.environ.get('PARSER_BACKEND', 'soup'),
+                        help="HTML parser backend (default: PARSER_BACKEND, else soup)")
+    args = parser.parse_args()
+
+    if not args.paths and not args.archive:
+        args.archive = os.environ.get('PAGE_ARCHIVE_DIR')
+        if not args.archive:
+            parser.error("give HTML paths, --archive or PAGE_ARCHIVE_DIR")
+    if args.history and not args.archive:
+        parser.error("--history needs --archive")
+
+    def pages():
+        if args.archive:
+            yield from archived_pages(args.archive, args.history)
+        yield from file_pages(args.paths)
+
+    baseline = load_baseline(args.baseline) if args.baseline else None
+    with open(args.output, 'w', encoding='utf-8') as report:
+        summary = reclassify(pages(), report, archive_root=args.archive, baseline=baseline,
+                             workers=args.workers, chunk_size=args.chunk_size,
+                             changed_only=args.changed_only, parser=args.parser)
+    print_summary(summary)
+    print(f"\nReport written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,401 @@
+#!/usr/bin/env python3
+"""
+Monitor Replay Harness
+
+Replays a recorded sale-day timeline through the real monitoring pipeline
+(update_ticket_status -> check_ticketera_availability -> classifier ->
+transition/notification logic -> ticket_status snapshot) on a virtual clock,
+so scheduler and alerting changes can be compared offline before deploying.
+
+Pages are served by a local stand-in server that returns, for each event, the
+page that was current at the virtual time of the request. Discord is replaced
+by a stub sink and Playwright is disabled.
+
+Timeline format (JSON):
+
+    {
+        "duration": 7200,                 # optional, seconds of replay
+        "events": {
+            "july-12": [
+                {"t": 0,    "page": "pages/july-12-soon.html"},
+                {"t": 1800, "page": "pages/july-12-onsale.html"},
+                {"t": 5400, "status": 403}
+            ],
+            ...
+        }
+    }
+
+"t" is seconds from the start of the timeline. "page" paths are relative to
+the timeline file; "html" can be used for inline pages and "status" for HTTP
+error responses. Events missing from the timeline serve an empty page.
+
+Usage:
+    python replay.py timeline.json
+    python replay.py timeline.json --config CHECK_INTERVAL=15,MAX_DATES_PER_CHECK=3 \\
+                                   --config CHECK_INTERVAL=30,MAX_DATES_PER_CHECK=6
+    python replay.py --demo --json
+"""
+import os
+import sys
+import copy
+import json
+import logging
+import random
+import argparse
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import app as monitor
+from circuit_breaker import BreakerRegistry
+from single_flight import SingleFlight
+from transitions import TransitionDetector
+from history_store import HistoryStore
+from lifecycle import LifecycleManager
+from alert_rules import RuleStore
+
+# Settings a --config entry may override on the app module
+TUNABLE_SETTINGS = {
+    'CHECK_INTERVAL': int,
+    'MAX_DATES_PER_CHECK': int,
+    'JITTER_MAX': float,
+}
+
+DEFAULT_TAIL_SECONDS = 600
+
+
+class VirtualClock:
+    """Monotonic clock that only advances when something sleeps on it"""
+
+    def __init__(self, start=0.0):
+        self._now = float(start)
+        self._lock = threading.Lock()
+
+    def now(self):
+        with self._lock:
+            return self._now
+
+    def sleep(self, seconds):
+        with self._lock:
+            self._now += max(0.0, seconds)
+
+
+def load_timeline(path):
+    """Load a timeline file, resolving page paths to their contents"""
+    with open(path, encoding='utf-8') as f:
+        timeline = json.load(f)
+
+    base_dir = os.path.dirname(os.path.abspath(path))
+    for frames in timeline['events'].values():
+        for frame in frames:
+            if 'page' in frame:
+                with open(os.path.join(base_dir, frame['page']), encoding='utf-8', errors='replace') as f:
+                    frame['html'] = f.read()
+        frames.sort(key=lambda frame: frame['t'])
+    return timeline
+
+
+def demo_timeline(seed=7):
+    """Synthetic sale day: a few dates go on sale, sell out, or get blocked"""
+    rng = random.Random(seed)
+
+    def page(body):
+        return f"<html><head><title>Ticketera</title></head><body>{body}</body></html>"
+
+    not_yet = page("<div class='event'>Bad Bunny</div>")
+    soon = page("<div class='event'>Bad Bunny - Próximamente</div>")
+    on_sale = page("<div class='event'>¡Entradas disponibles!</div>"
+                   "<script>window.__STATE__={ticketsAvailable: %d};</script>")
+    sold_out = page("<div class='event'>Agotado</div>")
+
+    events = {}
+    for event_id in monitor.BAD_BUNNY_EVENT_IDS:
+        frames = [{"t": 0, "html": not_yet}]
+        roll = rng.random()
+        if roll < 0.5:
+            t = rng.randint(300, 1800)
+            frames.append({"t": t, "html": soon})
+            t += rng.randint(600, 2400)
+            frames.append({"t": t, "html": on_sale % rng.randint(50, 2000)})
+            t += rng.randint(120, 1800)
+            frames.append({"t": t, "html": sold_out})
+        elif roll < 0.6:
+            t = rng.randint(600, 3600)
+            frames.append({"t": t, "status": 403})
+            frames.append({"t": t + rng.randint(60, 600), "html": not_yet})
+        events[event_id] = frames
+
+    return {"duration": 7200, "events": events}
+
+
+class StandInServer:
+    """Serves each event's timeline frame for the current virtual time"""
+
+    def __init__(self, timeline, clock, start):
+        self.timeline = timeline
+        self.clock = clock
+        self.start = start
+        self.requests = {}
+        self._lock = threading.Lock()
+
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                event_id = self.path.strip('/').split('?')[0]
+                with stand_in._lock:
+                    stand_in.requests[event_id] = stand_in.requests.get(event_id, 0) + 1
+                frame = stand_in.frame_for(event_id)
+
+                status = frame.get('status', 200)
+                body = frame.get('html', '<html><body></body></html>').encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.httpd.daemon_threads = True
+        self.base_url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def frame_for(self, event_id):
+        elapsed = self.clock.now() - self.start
+        current = {}
+        for frame in self.timeline['events'].get(event_id, []):
+            if frame['t'] > elapsed:
+                break
+            current = frame
+        return current
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def frame_verdict(frame):
+    """The status the monitor should report for a timeline frame"""
+    status = frame.get('status', 200)
+    if status == 403:
+        return "🚫 Access Blocked - Using Cached Status"
+    if status >= 400:
+        return "⚠️ Error Checking - Using Cached Status"
+    return monitor.classify_ticketera_page(frame.get('html', ''), '')
+
+
+def expected_transitions(timeline):
+    """List (event_id, t, verdict) for every frame that changes the verdict"""
+    transitions = []
+    for event_id, frames in timeline['events'].items():
+        previous = "⚡ Not Yet Available"
+        for frame in frames:
+            verdict = frame_verdict(frame)
+            if verdict != previous:
+                transitions.append((event_id, frame['t'], verdict))
+                previous = verdict
+    return transitions
+
+
+def percentile(values, pct):
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def run_replay(timeline, settings, seed=0):
+    """Replay the timeline once with the given settings and return a report"""
+    clock = VirtualClock(start=0.0)
+    server = StandInServer(timeline, clock, start=0.0)
+    url_to_event = {}
+    observations = []
+    notifications = []
+
+    duration = timeline.get('duration')
+    if duration is None:
+        last_t = max((frames[-1]['t'] for frames in timeline['events'].values() if frames), default=0)
+        duration = last_t + DEFAULT_TAIL_SECONDS
+
+    saved = {
+        name: getattr(monitor, name)
+        for name in list(TUNABLE_SETTINGS) + [
+            'TICKETERA_URLS', 'ticket_status', 'last_update_time', 'last_check',
+            'monitor_clock', 'monitor_sleep', 'PLAYWRIGHT_AVAILABLE',
+            'check_ticketera_availability', 'send_discord_notification', 'event_breakers', 'url_checks',
+            'status_transitions', 'history', 'lifecycle', 'archived_event_ids',
+            'alert_rules', 'page_archive', 'checked_pages',
+        ]
+    }
+    saved_cart_enabled = monitor.cart_config['enabled']
+    real_check = monitor.check_ticketera_availability
+
+    def observed_check(event_url, **kwargs):
+        status = real_check(event_url, **kwargs)
+        observations.append((url_to_event.get(event_url), clock.now(), status))
+        return status
+
+    def sink(message, use_mentions=False, **kwargs):
+        notifications.append((clock.now(), message, use_mentions))
+        return True
+
+    workdir = tempfile.TemporaryDirectory(prefix='replay-')
+    try:
+        # Point every event at the stand-in server
+        urls = {}
+        for event_id in monitor.BAD_BUNNY_EVENT_IDS:
+            month, day = event_id.split('-')
+            url = f"{server.base_url}/{event_id}"
+            urls.setdefault(month.capitalize(), {})[day] = url
+            url_to_event[url] = event_id
+        monitor.TICKETERA_URLS = urls
+
+        monitor.ticket_status = {}
+        monitor.last_update_time = {event_id: 0 for event_id in monitor.BAD_BUNNY_EVENT_IDS}
+        monitor.last_check = None
+        monitor.monitor_clock = clock.now
+        monitor.monitor_sleep = clock.sleep
+        monitor.PLAYWRIGHT_AVAILABLE = False
+        monitor.cart_config['enabled'] = False
+        monitor.check_ticketera_availability = observed_check
+        monitor.send_discord_notification = sink
+        monitor.event_breakers = BreakerRegistry(**monitor.event_breakers.settings)
+        monitor.url_checks = SingleFlight(ttl=monitor.url_checks.ttl, clock=clock.now)
+        monitor.status_transitions = TransitionDetector(monitor.status_transitions.confirmations,
+                                                        monitor.status_transitions.window)
+        monitor.history = HistoryStore(':memory:')
+        monitor.lifecycle = LifecycleManager(monitor.lifecycle.grace_days, monitor.lifecycle.sold_out_seconds,
+                                             monitor.lifecycle.year)
+        monitor.archived_event_ids = set()
+        # No subscriber webhooks: routing rules start empty
+        monitor.alert_rules = RuleStore(os.path.join(workdir.name, 'alert_rules.json'), monitor.BAD_BUNNY_EVENT_IDS)
+        # Replayed pages are synthetic; keep them out of the real page archive
+        monitor.page_archive = None
+        monitor.checked_pages = {}
+        for name, value in settings.items():
+            setattr(monitor, name, value)
+
+        random.seed(seed)
+
+        sweeps = 0
+        while clock.now() < duration:
+            sweep_start = clock.now()
+            monitor.update_ticket_status()
+            sweeps += 1
+            clock.sleep(monitor.CHECK_INTERVAL - (clock.now() - sweep_start))
+    finally:
+        workdir.cleanup()
+        for name, value in saved.items():
+            setattr(monitor, name, value)
+        monitor.cart_config['enabled'] = saved_cart_enabled
+        server.close()
+
+    # Match expected transitions against what the monitor observed
+    transitions = expected_transitions(timeline)
+    frame_times = {
+        event_id: [frame['t'] for frame in frames]
+        for event_id, frames in timeline['events'].items()
+    }
+
+    latencies = []
+    missed = []
+    for event_id, t, verdict in transitions:
+        later = [ft for ft in frame_times[event_id] if ft > t]
+        window_end = later[0] if later else duration
+        seen = [obs_t for obs_event, obs_t, status in observations
+                if obs_event == event_id and t <= obs_t < window_end and status == verdict]
+        if seen:
+            latencies.append(seen[0] - t)
+        else:
+            missed.append({'event': event_id, 't': t, 'verdict': verdict})
+
+    return {
+        'settings': settings,
+        'duration': duration,
+        'sweeps': sweeps,
+        'requests': sum(server.requests.values()),
+        'checks': len(observations),
+        'transitions': len(transitions),
+        'detected': len(latencies),
+        'missed': len(missed),
+        'missed_transitions': missed,
+        'latency_mean': sum(latencies) / len(latencies) if latencies else None,
+        'latency_p50': percentile(latencies, 50),
+        'latency_p95': percentile(latencies, 95),
+        'latency_max': max(latencies) if latencies else None,
+        'notifications': len(notifications),
+        'mentions': sum(1 for _, _, use_mentions in notifications if use_mentions),
+    }
+
+
+def parse_config(text):
+    """Parse 'NAME=VALUE,NAME=VALUE' into typed app settings"""
+    settings = {}
+    for item in filter(None, (part.strip() for part in text.split(','))):
+        name, _, value = item.partition('=')
+        name = name.strip()
+        if name not in TUNABLE_SETTINGS:
+            raise argparse.ArgumentTypeError(
+                f"Unknown setting {name!r}; expected one of {', '.join(TUNABLE_SETTINGS)}"
+            )
+        settings[name] = TUNABLE_SETTINGS[name](value)
+    return settings
+
+
+def format_seconds(value):
+    return "-" if value is None else f"{value:.0f}s"
+
+
+def print_report(reports):
+    print()
+    print(f"{'config':<56}{'sweeps':>7}{'reqs':>7}{'found':>8}{'missed':>8}"
+          f"{'p50':>7}{'p95':>7}{'max':>7}{'alerts':>8}")
+    print("-" * 115)
+    for report in reports:
+        label = ",".join(f"{k}={v}" for k, v in report['settings'].items()) or "(current settings)"
+        print(f"{label:<56}{report['sweeps']:>7}{report['requests']:>7}"
+              f"{report['detected']:>4}/{report['transitions']:<3}{report['missed']:>8}"
+              f"{format_seconds(report['latency_p50']):>7}{format_seconds(report['latency_p95']):>7}"
+              f"{format_seconds(report['latency_max']):>7}{report['notifications']:>8}")
+    print()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a sale-day timeline through the monitor")
+    parser.add_argument('timeline', nargs='?', help="Timeline JSON file")
+    parser.add_argument('--demo', action='store_true', help="Use a synthetic timeline")
+    parser.add_argument('--config', action='append', type=parse_config, default=[],
+                        help="Settings for one run, e.g. CHECK_INTERVAL=15,MAX_DATES_PER_CHECK=3")
+    parser.add_argument('--seed', type=int, default=0, help="Random seed for jitter and user agents")
+    parser.add_argument('--json', action='store_true', help="Print reports as JSON")
+    parser.add_argument('--verbose', action='store_true', help="Show the monitor's own log output")
+    args = parser.parse_args()
+
+    if not args.verbose:
+        monitor.logger.setLevel(logging.CRITICAL)
+
+    # Replays set their own settings; a config file edit must not change them mid-run
+    monitor.config_watcher.stop()
+
+    if args.demo:
+        timeline = demo_timeline()
+    elif args.timeline:
+        timeline = load_timeline(args.timeline)
+    else:
+        parser.error("a timeline file or --demo is required")
+
+    reports = [run_replay(copy.deepcopy(timeline), settings, args.seed) for settings in (args.config or [{}])]
+
+    if args.json:
+        json.dump(reports, sys.stdout, indent=2, ensure_ascii=False)
+        print()
+    else:
+        print_report(reports)
+
+
+if __name__ == "__main__":
+    main()
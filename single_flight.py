@@ -0,0 +1,121 @@
+"""
+Single-Flight Checks
+
+Collapses concurrent checks of the same URL into one fetch and one verdict.
+The first caller for a key runs the work. Callers that arrive while it is in
+flight wait for it and get the same result. Callers that arrive within `ttl`
+seconds after it finished get the stored result without any request.
+
+Used in front of the fetch/classify step: events falling back to the same
+URL, or two request threads sweeping at once, then cost one download and
+one parse. Sharing is per process; each gunicorn worker has its own table.
+
+    checks = SingleFlight(ttl=10)
+    status = checks.do(url, lambda: check_ticketera_availability(url))
+    status = await checks.do_async(url, lambda: engine.check(session, url))
+
+`stats` counts leaders (work actually run), in-flight joins and TTL hits.
+"""
+import time
+import asyncio
+import threading
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class SingleFlight:
+    def __init__(self, ttl=10.0, clock=time.monotonic):
+        self.ttl = ttl
+        self.clock = clock
+        self.stats = {'leader': 0, 'inflight': 0, 'cached': 0}
+        self._lock = threading.Lock()
+        self._calls = {}  # key -> _Call, threaded callers
+        self._futures = {}  # key -> asyncio.Future, callers on the event loop
+        self._results = {}  # key -> (expires, value)
+
+    def _cached(self, key):
+        """Stored result for key, or None. Call with the lock held."""
+        hit = self._results.get(key)
+        if hit and hit[0] > self.clock():
+            self.stats['cached'] += 1
+            return hit
+        return None
+
+    def _store(self, key, value):
+        now = self.clock()
+        with self._lock:
+            if self.ttl > 0:
+                self._results[key] = (now + self.ttl, value)
+            # Drop expired entries so retired URLs do not pile up
+            for stale in [k for k, (expires, _) in self._results.items() if expires <= now]:
+                del self._results[stale]
+
+    def do(self, key, func):
+        """Run func() for key unless an identical call is in flight or fresh"""
+        with self._lock:
+            hit = self._cached(key)
+            if hit:
+                return hit[1]
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.stats['leader'] += 1
+            else:
+                self.stats['inflight'] += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value
+
+        try:
+            call.value = func()
+            self._store(key, call.value)
+            return call.value
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    async def do_async(self, key, coro_func):
+        """Coroutine version of do() for callers on one event loop"""
+        with self._lock:
+            hit = self._cached(key)
+            if hit:
+                return hit[1]
+            future = self._futures.get(key)
+            leader = future is None
+            if leader:
+                future = self._futures[key] = asyncio.get_running_loop().create_future()
+                self.stats['leader'] += 1
+            else:
+                self.stats['inflight'] += 1
+
+        if not leader:
+            # Shielded so a cancelled follower does not cancel the shared call
+            return await asyncio.shield(future)
+
+        try:
+            value = await coro_func()
+            future.set_result(value)
+            self._store(key, value)
+            return value
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()  # Mark retrieved in case nobody else was waiting
+            raise
+        finally:
+            del self._futures[key]
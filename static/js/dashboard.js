@@ -0,0 +1,1431 @@
+// On page load, immediately display all concert dates
+document.addEventListener('DOMContentLoaded', function() {
+    // Hardcoded dates
+    const dates = {
+        'July': ['12', '18', '19'],
+        'August': ['1', '2', '3', '8', '9', '10', '15', '16', '17', '22', '23', '24', '29', '30', '31'],
+        'September': ['5', '6', '7', '12', '13', '14']
+    };
+
+    // Initialize container
+    const container = document.getElementById('tickets-container');
+    if (!container) return;
+    container.innerHTML = '';
+
+    // For each month
+    ['July', 'August', 'September'].forEach(month => {
+        if (dates[month] && dates[month].length > 0) {
+            // Create month header
+            const monthDiv = document.createElement('div');
+            monthDiv.className = 'month-section mb-4';
+            monthDiv.innerHTML = `<h2 class="month-title">${month} 2025</h2>
+            <div class="row">
+                ${dates[month].map(day => {
+                    const id = `${month.toLowerCase()}-${day}`;
+                    const date = `${month} ${day}, 2025`;
+                    const ticketUrl = getDirectUrl(month, day);
+
+                    return `
+                        <div class="col-md-4 mb-4">
+                            <div class="card ticket-card" data-event-id="${id}">
+                                <div class="status-alert alert-info"></div>
+                                <div class="card-body">
+                                    <h5 class="card-title">Bad Bunny - ${date}</h5>
+                                    <div class="d-flex justify-content-between align-items-center mb-3">
+                                        <span class="badge alert-info status-badge">⚡ Loading...</span>
+                                    </div>
+                                    <p class="card-text">Last checked: Initializing...</p>
+                                    <a href="${ticketUrl}" class="btn btn-primary" target="_blank">Check Tickets</a>
+                                    <div class="dropdown mt-2 mb-2">
+                                        <button class="btn btn-sm btn-outline-success dropdown-toggle" type="button" id="cart-options-${id}" data-toggle="dropdown" aria-haspopup="true" aria-expanded="false">
+                                            <i class="fas fa-cart-plus"></i> Auto-Cart Options
+                                        </button>
+                                        <div class="dropdown-menu p-2" aria-labelledby="cart-options-${id}">
+                                            <h6 class="dropdown-header">Ticket Quantity</h6>
+                                            <div class="form-group">
+                                                <select class="form-control form-control-sm" id="qty-select-${id}">
+                                                    <option value="1">1 Ticket</option>
+                                                    <option value="2" selected>2 Tickets</option>
+                                                    <option value="3">3 Tickets</option>
+                                                    <option value="4">4 Tickets</option>
+                                                    <option value="6">6 Tickets</option>
+                                                    <option value="8">8 Tickets</option>
+                                                </select>
+                                            </div>
+                                            <div class="form-check">
+                                                <input class="form-check-input" type="checkbox" value="" id="auto-checkout-${id}" checked>
+                                                <label class="form-check-label" for="auto-checkout-${id}">
+                                                    Auto-Checkout
+                                                </label>
+                                            </div>
+                                            <div class="form-check">
+                                                <input class="form-check-input" type="checkbox" value="" id="best-available-${id}" checked>
+                                                <label class="form-check-label" for="best-available-${id}">
+                                                    Best Available
+                                                </label>
+                                            </div>
+                                            <div class="dropdown-divider"></div>
+                                            <button onclick="startAutoCartWithOptions('${id}')" class="btn btn-success btn-sm btn-block">Start Auto-Cart</button>
+                                        </div>
+                                    </div>
+                                </div>
+                            </div>
+                        </div>
+                    `;
+                }).join('')}
+            </div>
+            `;
+            container.appendChild(monthDiv);
+        }
+    });
+});
+
+const SERVER_CHECK_INTERVAL = 15000; // Fallback until the server publishes its check interval
+const COUNTDOWN_UPDATE_INTERVAL = 1000; // Clock tick while the tab is visible
+const HIDDEN_FETCH_INTERVAL = 60000; // Slowest fetch cadence while the tab is in the background
+const MIN_FETCH_INTERVAL = 5000; // Never poll faster than this
+const FETCH_AFTER_CHECK_DELAY = 1000; // Fetch shortly after the server's next check is due
+
+// Bad Bunny concert dates - hardcoded to ensure they always display
+const CONCERT_DATES = {
+    'July': ['12', '18', '19'],
+    'August': ['1', '2', '3', '8', '9', '10', '15', '16', '17', '22', '23', '24', '29', '30', '31'],
+    'September': ['5', '6', '7', '12', '13', '14']
+};
+
+// Specific URLs for each Bad Bunny concert date - HARDCODED DIRECTLY
+const DIRECT_URLS = {
+    "july-12": "https://choli.ticketera.com/checkout/67801ac67b15db4542eeed7e?underShop=67801ac67b15db4542eeee56&boxOnly=true",
+    "july-18": "https://choli.ticketera.com/checkout/67801c6485e7610f9b45cb54?underShop=67801c6585e7610f9b45cbce&boxOnly=true",
+    "july-19": "https://choli.ticketera.com/event/67801ccc52c0091cff4e33a7/67801ccd52c0091cff4e33f7",
+    "august-1": "https://choli.ticketera.com/checkout/677ff055a1198f5724fc1158?underShop=677ff055a1198f5724fc11a8",
+    "august-2": "https://choli.ticketera.com/checkout/678276b19c10a4675dcd677b?underShop=678276b19c10a4675dcd67d4",
+    "august-3": "https://choli.ticketera.com/checkout/6782776b39978af92af5d38e?underShop=6782776c39978af92af5d3e7",
+    "august-8": "https://choli.ticketera.com/checkout/678278919c8c608b8c0ebdd2?underShop=678278929c8c608b8c0ebe2b",
+    "august-9": "https://choli.ticketera.com/checkout/6782790885a03cd75926079c?underShop=6782790885a03cd759260898",
+    "august-10": "https://choli.ticketera.com/checkout/67827a23406d3f4b30602cf9?underShop=67827a23406d3f4b30602d52",
+    "august-15": "https://choli.ticketera.com/checkout/67827aecbb4a8ef99dab15e8?underShop=67827aecbb4a8ef99dab1641",
+    "august-16": "https://choli.ticketera.com/checkout/67827b7b0cc574c721710a65?underShop=67827b7c0cc574c721710abe",
+    "august-17": "https://choli.ticketera.com/checkout/67827c0f96690559d725b430?underShop=67827c1096690559d725b489",
+    "august-22": "https://choli.ticketera.com/checkout/67827cf5564ad8f63c77f57d?underShop=67827cf5564ad8f63c77f5d8",
+    "august-23": "https://choli.ticketera.com/checkout/67827da9651f8bdbe0bd3f0e?underShop=67827daa651f8bdbe0bd3f67",
+    "august-24": "https://choli.ticketera.com/checkout/67827f39c3c7b7d600ca906a?underShop=67827f3ac3c7b7d600ca90ce",
+    "august-29": "https://choli.ticketera.com/checkout/67827fce1104e5b3ac99c82a?underShop=67827fce1104e5b3ac99c883",
+    "august-30": "https://choli.ticketera.com/checkout/678281fdc311c1c0762df8d6?underShop=678281fec311c1c0762df93d",
+    "august-31": "https://choli.ticketera.com/checkout/6782827df1edcc48da3866fb?underShop=6782827ef1edcc48da386754",
+    "september-5": "https://choli.ticketera.com/checkout/678285d0a9936d5291154f60?underShop=678285d1a9936d5291154fb9",
+    "september-6": "https://choli.ticketera.com/checkout/67828834bb4a8ef99daf35b9?underShop=67828835bb4a8ef99daf361c",
+    "september-7": "https://choli.ticketera.com/checkout/67828abbf9dde02e3c3f059d?underShop=67828abcf9dde02e3c3f062d",
+    "september-12": "https://choli.ticketera.com/checkout/67828d8333f81d3543d0a47c?underShop=67828d8333f81d3543d0a575",
+    "september-13": "https://choli.ticketera.com/checkout/67828df40952cb5ab00ba5dd?underShop=67828df40952cb5ab00ba636",
+    "september-14": "https://choli.ticketera.com/checkout/67828e871104e5b3ac9ed068?underShop=67828e871104e5b3ac9ed0c1"
+};
+
+// Helper function to get direct URL for a specific date
+function getDirectUrl(month, day) {
+    const key = `${month.toLowerCase()}-${day}`;
+    return DIRECT_URLS[key] || "https://choli.ticketera.com/";
+}
+
+let soundEnabled = true;
+
+// Helper function to get the correct URL for a given date
+function getUrlForDate(month, day) {
+    return getDirectUrl(month, day);
+}
+
+function isSoundEnabled() {
+    return soundEnabled;
+}
+
+function toggleSound() {
+    soundEnabled = !soundEnabled;
+    const soundStatus = document.getElementById('sound-status');
+    soundStatus.innerText = soundEnabled ? 'ENABLED' : 'DISABLED';
+
+    // Save preference to localStorage
+    localStorage.setItem('soundEnabled', soundEnabled.toString());
+}
+
+// Alert sound: the custom sound is kept as a Blob in IndexedDB and decoded once
+// into a Web Audio buffer, so an alert starts without parsing or decoding anything
+const SOUND_DB_NAME = 'bb-monitor';
+const SOUND_STORE = 'sounds';
+const CUSTOM_SOUND_KEY = 'custom';
+
+const alertAudio = {
+    context: null,
+    buffer: null,
+    objectUrl: null
+};
+
+function openSoundDb() {
+    return new Promise((resolve, reject) => {
+        if (!('indexedDB' in window)) {
+            reject(new Error('IndexedDB is not available'));
+            return;
+        }
+        const request = indexedDB.open(SOUND_DB_NAME, 1);
+        request.onupgradeneeded = () => request.result.createObjectStore(SOUND_STORE);
+        request.onsuccess = () => resolve(request.result);
+        request.onerror = () => reject(request.error);
+    });
+}
+
+function soundDbRequest(mode, operation) {
+    return openSoundDb().then(db => new Promise((resolve, reject) => {
+        const transaction = db.transaction(SOUND_STORE, mode);
+        const request = operation(transaction.objectStore(SOUND_STORE));
+        transaction.oncomplete = () => {
+            db.close();
+            resolve(request.result);
+        };
+        transaction.onerror = () => {
+            db.close();
+            reject(transaction.error);
+        };
+    }));
+}
+
+function saveSoundBlob(blob) {
+    return soundDbRequest('readwrite', store => store.put(blob, CUSTOM_SOUND_KEY));
+}
+
+function loadSoundBlob() {
+    return soundDbRequest('readonly', store => store.get(CUSTOM_SOUND_KEY));
+}
+
+function getAudioContext() {
+    if (!alertAudio.context) {
+        const AudioContextClass = window.AudioContext || window.webkitAudioContext;
+        if (!AudioContextClass) return null;
+        alertAudio.context = new AudioContextClass();
+    }
+    return alertAudio.context;
+}
+
+// Browsers start audio contexts suspended until the user interacts with the page
+function unlockAudioContext() {
+    const context = getAudioContext();
+    if (context && context.state === 'suspended') {
+        context.resume().catch(() => undefined);
+    }
+}
+
+// Decode a sound once and keep it ready; the <audio> element stays as a fallback
+function useAlertSound(blob) {
+    const audioElement = document.getElementById('alertSound');
+    if (alertAudio.objectUrl) URL.revokeObjectURL(alertAudio.objectUrl);
+    alertAudio.objectUrl = URL.createObjectURL(blob);
+    audioElement.src = alertAudio.objectUrl;
+    alertAudio.buffer = null;
+    
+    const context = getAudioContext();
+    if (!context) return Promise.resolve(null);
+    return blob.arrayBuffer()
+        .then(data => context.decodeAudioData(data))
+        .then(buffer => {
+            alertAudio.buffer = buffer;
+            return buffer;
+        })
+        .catch(error => {
+            console.warn('Could not decode alert sound, using the audio element instead:', error);
+            return null;
+        });
+}
+
+// Load the saved custom sound, moving an old localStorage data URL into IndexedDB
+function loadCustomSound() {
+    const legacyData = localStorage.getItem('customSoundData');
+    const blobPromise = legacyData
+        ? fetch(legacyData)
+            .then(response => response.blob())
+            .then(blob => saveSoundBlob(blob)
+                .then(() => localStorage.removeItem('customSoundData'))
+                .catch(error => console.warn('Keeping custom sound in localStorage:', error))
+                .then(() => blob))
+        : loadSoundBlob();
+    
+    return blobPromise
+        .then(blob => {
+            if (!blob) return;
+            console.log("Loaded custom sound");
+            return useAlertSound(blob);
+        })
+        .catch(error => console.warn('Could not load custom sound:', error));
+}
+
+// Play the pre-decoded buffer; returns false when the <audio> element must be used
+function playDecodedSound() {
+    const context = alertAudio.context;
+    if (!alertAudio.buffer || !context || context.state !== 'running') return false;
+    const source = context.createBufferSource();
+    source.buffer = alertAudio.buffer;
+    source.connect(context.destination);
+    source.start(0);
+    return true;
+}
+
+function playAlertSound() {
+    if (soundEnabled) {
+        if (playDecodedSound()) return;
+        
+        const audioElement = document.getElementById('alertSound');
+
+        // Make sure the audio element is properly loaded
+        if (audioElement.readyState === 0) {  // HAVE_NOTHING
+            // Force a load if needed
+            audioElement.load();
+        }
+
+        // Reset the audio to the beginning
+        audioElement.currentTime = 0;
+
+        // Play the sound with a promise to handle autoplay restrictions
+        const playPromise = audioElement.play();
+
+        if (playPromise !== undefined) {
+            playPromise.then(_ => {
+                // Playback started successfully
+                console.log("Alert sound played successfully");
+            })
+            .catch(error => {
+                // Auto-play was prevented, log error
+                console.error("Audio playback was prevented:", error);
+
+                // Try again once after a brief delay (user may have interacted by then)
+                setTimeout(() => {
+                    audioElement.currentTime = 0;
+                    audioElement.play().catch(e => console.error("Retry also failed:", e));
+                }, 1000);
+            });
+        }
+    }
+}
+
+function testNotification() {
+    playAlertSound();
+
+    const testCard = document.querySelector('.ticket-card');
+    if (testCard) {
+        testCard.classList.add('urgent-alert');
+        setTimeout(() => testCard.classList.remove('urgent-alert'), 3000);
+    }
+}
+
+let previousStates = {};
+let cachedData = null;
+// Events the server has retired (past or long sold out); they get no card
+let archivedEvents = new Set();
+// This browser's watchlist; empty means every date is shown
+let watchlist = new Set();
+
+// Single client-side clock: one timer drives both fetching and the countdown
+const dashboardClock = {
+    timer: null,
+    nextFetchAt: 0,                        // Client time (ms) of the next /api/tickets fetch
+    nextCheckAt: null,                     // Server's published next check, in client time (ms)
+    checkInterval: SERVER_CHECK_INTERVAL,  // Server's published check interval (ms)
+    fetchInFlight: false,
+    started: false
+};
+
+function scheduleTick() {
+    clearTimeout(dashboardClock.timer);
+    const now = Date.now();
+    let delay;
+    if (document.hidden) {
+        // No countdown to draw in the background: sleep until the next fetch is due
+        delay = Math.max(dashboardClock.nextFetchAt - now, COUNTDOWN_UPDATE_INTERVAL);
+    } else {
+        // Align ticks to the second so the countdown changes in step
+        delay = COUNTDOWN_UPDATE_INTERVAL - (now % COUNTDOWN_UPDATE_INTERVAL);
+    }
+    dashboardClock.timer = setTimeout(tick, delay);
+}
+
+function tick() {
+    const now = Date.now();
+    if (!document.hidden) {
+        updateCountdown(now);
+    }
+    if (now >= dashboardClock.nextFetchAt && !dashboardClock.fetchInFlight) {
+        updateTicketData();
+    }
+    scheduleTick();
+}
+
+function planNextFetch(response) {
+    const now = Date.now();
+    const serverTime = Number(response && response.headers.get('X-Server-Time'));
+    const nextCheck = Number(response && response.headers.get('X-Next-Check'));
+    const interval = Number(response && response.headers.get('X-Check-Interval'));
+
+    if (interval > 0) {
+        dashboardClock.checkInterval = interval;
+    }
+    if (serverTime > 0 && nextCheck > 0) {
+        // Translate the server's schedule into client time to absorb clock skew
+        dashboardClock.nextCheckAt = nextCheck - serverTime + now;
+    } else {
+        dashboardClock.nextCheckAt = now + dashboardClock.checkInterval;
+    }
+
+    let nextFetch = Math.max(dashboardClock.nextCheckAt + FETCH_AFTER_CHECK_DELAY, now + MIN_FETCH_INTERVAL);
+    if (document.hidden) {
+        nextFetch = Math.max(nextFetch, now + HIDDEN_FETCH_INTERVAL);
+    }
+    dashboardClock.nextFetchAt = nextFetch;
+}
+
+function handleVisibilityChange() {
+    if (document.hidden) {
+        // Back off: push the next fetch out and stop drawing the countdown
+        dashboardClock.nextFetchAt = Math.max(dashboardClock.nextFetchAt, Date.now() + HIDDEN_FETCH_INTERVAL);
+        scheduleTick();
+    } else {
+        // Catch up immediately on focus
+        dashboardClock.nextFetchAt = 0;
+        tick();
+    }
+}
+
+function updateCountdown(now) {
+    const currentTime = now || Date.now();
+    const interval = dashboardClock.checkInterval;
+    const nextCheckAt = dashboardClock.nextCheckAt || (currentTime + interval);
+
+    // Count down to the server's next scheduled check
+    const timeUntilServerCheck = Math.max(0, nextCheckAt - currentTime);
+    const remainingSeconds = Math.ceil(timeUntilServerCheck / 1000);
+
+    // Update the countdown display
+    const countdownNumber = document.querySelector('.countdown-number');
+    if (countdownNumber) {
+        countdownNumber.textContent = remainingSeconds;
+    }
+
+    // Update the progress circle
+    const progressCircle = document.querySelector('.countdown-circle .progress');
+    if (progressCircle) {
+        const dashoffset = 283 * Math.min(1, timeUntilServerCheck / interval);
+        progressCircle.style.strokeDashoffset = dashoffset;
+    }
+
+    // Update the next check time
+    const nextCheckTime = document.getElementById('nextCheckTime');
+    if (nextCheckTime) {
+        const nextCheck = new Date(currentTime + timeUntilServerCheck);
+        nextCheckTime.textContent = nextCheck.toLocaleTimeString([], { hour: '2-digit', minute: '2-digit', second: '2-digit' });
+    }
+}
+
+function createEventCard(id, event) {
+    const col = document.createElement('div');
+    col.className = 'col-md-4 mb-4';
+
+    // Determine the appropriate status class
+    let statusClass = 'alert-info';
+    let statusText = event.status || "⚡ Not Yet Available";
+    let urgentClass = '';
+
+    if (statusText.includes('AVAILABLE') || statusText.includes('CHECK NOW')) {
+        statusClass = 'alert-success';
+        urgentClass = 'urgent-alert';
+    } else if (statusText.includes('Queue') || statusText.includes('Waitlist')) {
+        statusClass = 'alert-warning';
+    } else if (statusText.includes('Not Available') || statusText.includes('Sold Out') || statusText.includes('Blocked')) {
+        statusClass = 'alert-danger';
+    }
+
+    col.innerHTML = `
+        <div class="card ticket-card ${urgentClass}" data-event-id="${id}">
+            <div class="status-alert ${statusClass}"></div>
+            <div class="card-body">
+                <h5 class="card-title">${event.name}</h5>
+                <div class="d-flex justify-content-between align-items-center mb-3">
+                    <span class="badge ${statusClass} status-badge">${statusText}</span>
+                </div>
+                <p class="card-text">Last checked: ${event.lastChecked || "Pending..."}</p>
+                <a href="${event.url || getUrlForDate(id.split('-')[0], id.split('-')[1])}" class="btn btn-primary" target="_blank">Check Tickets</a>
+                ${watchButton(id)}
+                <div class="dropdown mt-2 mb-2">
+                    <button class="btn btn-sm btn-outline-success dropdown-toggle" type="button" id="cart-options-${id}" data-toggle="dropdown" aria-haspopup="true" aria-expanded="false">
+                        <i class="fas fa-cart-plus"></i> Auto-Cart Options
+                    </button>
+                    <div class="dropdown-menu p-2" aria-labelledby="cart-options-${id}">
+                        <h6 class="dropdown-header">Ticket Quantity</h6>
+                        <div class="form-group">
+                            <select class="form-control form-control-sm" id="qty-select-${id}">
+                                <option value="1">1 Ticket</option>
+                                <option value="2" selected>2 Tickets</option>
+                                <option value="3">3 Tickets</option>
+                                <option value="4">4 Tickets</option>
+                                <option value="6">6 Tickets</option>
+                                <option value="8">8 Tickets</option>
+                            </select>
+                        </div>
+                        <div class="form-check">
+                            <input class="form-check-input" type="checkbox" value="" id="auto-checkout-${id}" checked>
+                            <label class="form-check-label" for="auto-checkout-${id}">
+                                Auto-Checkout
+                            </label>
+                        </div>
+                        <div class="form-check">
+                            <input class="form-check-input" type="checkbox" value="" id="best-available-${id}" checked>
+                            <label class="form-check-label" for="best-available-${id}">
+                                Best Available
+                            </label>
+                        </div>
+                        <div class="dropdown-divider"></div>
+                        <button onclick="startAutoCartWithOptions('${id}')" class="btn btn-success btn-sm btn-block">Start Auto-Cart</button>
+                    </div>
+                </div>
+            </div>
+        </div>
+    `;
+
+    return col;
+}
+
+function enhancedUpdateTicketUI(eventId, event) {
+    const container = document.getElementById('tickets-container');
+    if (!container) return;
+
+    // Find the existing card or create a new one
+    let card = container.querySelector(`.ticket-card[data-event-id="${eventId}"]`);
+    if (!card) {
+        card = createEventCard(eventId, event);
+        container.appendChild(card);
+    } else {
+        // Update the card's content
+        const statusBadge = card.querySelector('.status-badge');
+        const statusAlert = card.querySelector('.status-alert');
+        const cardText = card.querySelector('.card-text');
+        const cardTitle = card.querySelector('.card-title');
+        const checkButton = card.querySelector('.btn-primary');
+
+        // Determine the appropriate status class
+        let statusClass = 'alert-info';
+        let statusText = event.status || "⚡ Not Yet Available";
+        let urgentClass = '';
+
+        if (statusText.includes('AVAILABLE') || statusText.includes('CHECK NOW')) {
+            statusClass = 'alert-success';
+            urgentClass = 'urgent-alert';
+        } else if (statusText.includes('Queue') || statusText.includes('Waitlist')) {
+            statusClass = 'alert-warning';
+        } else if (statusText.includes('Not Available') || statusText.includes('Sold Out') || statusText.includes('Blocked')) {
+            statusClass = 'alert-danger';
+        }
+
+        // Update the card's status
+        statusBadge.className = `badge ${statusClass} status-badge`;
+        statusBadge.textContent = statusText;
+        statusAlert.className = `status-alert ${statusClass}`;
+        cardText.textContent = `Last checked: ${event.lastChecked || "Pending..."}`;
+        cardTitle.textContent = event.name;
+
+        // Important: Update the Check Tickets button with direct URL
+        const [month, day] = eventId.split('-');
+        const directUrl = getDirectUrl(month, day);
+        if (checkButton && directUrl) {
+            checkButton.href = directUrl;
+            checkButton.removeAttribute('onclick'); // Remove any onclick handler to ensure href works directly
+        }
+
+        // Add urgent class if needed
+        if (urgentClass && !card.classList.contains(urgentClass)) {
+            card.classList.add(urgentClass);
+            setTimeout(() => card.classList.remove(urgentClass), 3000);
+        }
+    }
+}
+
+// Show how old the displayed snapshot is when it came from the service worker's cache
+function showSnapshotAge(response) {
+    const label = document.getElementById('snapshotAge');
+    if (!label) return;
+    
+    const cachedAt = Number(response && response.headers.get('X-Cached-At'));
+    if (!response || response.headers.get('X-From-Cache') !== '1' || !cachedAt) {
+        label.textContent = '';
+        label.classList.remove('stale');
+        return;
+    }
+    
+    const minutes = Math.max(0, Math.round((Date.now() - cachedAt) / 60000));
+    const version = response.headers.get('X-Snapshot-Version');
+    label.textContent = `Server unreachable - showing last known status from ${minutes} min ago` +
+        (version ? ` (v${version})` : '');
+    label.classList.add('stale');
+}
+
+// Paint the last good snapshot from the service worker cache before the network answers
+function renderCachedSnapshot() {
+    if (!('caches' in window)) return Promise.resolve();
+    return caches.match('/api/tickets')
+        .then(response => {
+            if (!response || cachedData) return;
+            return response.json().then(data => {
+                if (cachedData || !data || Object.keys(data).length === 0) return;
+                cachedData = data;
+                updateTicketUI(data);
+            });
+        })
+        .catch(error => console.warn('Could not read cached snapshot:', error));
+}
+
+function registerServiceWorker() {
+    if (!('serviceWorker' in navigator)) return;
+    navigator.serviceWorker.register('/sw.js')
+        .catch(error => console.warn('Service worker registration failed:', error));
+}
+
+// Web Push: alerts reach this device even when no dashboard tab is open
+function urlBase64ToUint8Array(base64String) {
+    const padding = '='.repeat((4 - base64String.length % 4) % 4);
+    const raw = atob((base64String + padding).replace(/-/g, '+').replace(/_/g, '/'));
+    return Uint8Array.from(raw, char => char.charCodeAt(0));
+}
+
+function setPushToggleLabel(subscribed) {
+    const toggle = document.getElementById('pushToggle');
+    if (toggle) toggle.innerText = subscribed ? 'Disable Phone Alerts' : 'Enable Phone Alerts';
+}
+
+function refreshPushToggle() {
+    if (!('serviceWorker' in navigator) || !('PushManager' in window)) return;
+    navigator.serviceWorker.ready
+        .then(registration => registration.pushManager.getSubscription())
+        .then(subscription => setPushToggleLabel(Boolean(subscription)))
+        .catch(() => setPushToggleLabel(false));
+}
+
+function togglePushAlerts() {
+    if (!('serviceWorker' in navigator) || !('PushManager' in window)) {
+        alert('Push notifications are not supported in this browser.');
+        return;
+    }
+    
+    navigator.serviceWorker.ready.then(registration => {
+        return registration.pushManager.getSubscription().then(existing => {
+            if (existing) {
+                return fetch('/api/push/unsubscribe', {
+                    method: 'POST',
+                    headers: { 'Content-Type': 'application/json' },
+                    body: JSON.stringify({ endpoint: existing.endpoint })
+                })
+                    .then(() => existing.unsubscribe())
+                    .then(() => setPushToggleLabel(false));
+            }
+            
+            return fetch('/api/push/config')
+                .then(response => response.json())
+                .then(config => {
+                    if (!config.enabled) throw new Error('Phone alerts are not configured on this server.');
+                    return registration.pushManager.subscribe({
+                        userVisibleOnly: true,
+                        applicationServerKey: urlBase64ToUint8Array(config.publicKey)
+                    });
+                })
+                .then(subscription => fetch('/api/push/subscribe', {
+                    method: 'POST',
+                    headers: { 'Content-Type': 'application/json' },
+                    body: JSON.stringify(subscription.toJSON())
+                }))
+                .then(response => {
+                    if (!response.ok) throw new Error('The server rejected the subscription.');
+                    setPushToggleLabel(true);
+                });
+        });
+    }).catch(error => {
+        console.error('Error changing phone alerts:', error);
+        alert(error.message || 'Could not change phone alerts.');
+    });
+}
+
+function isWatched(eventId) {
+    return watchlist.size === 0 || watchlist.has(eventId);
+}
+
+function watchButton(eventId) {
+    const watching = watchlist.has(eventId);
+    return `<button class="btn btn-sm ${watching ? 'btn-warning' : 'btn-outline-warning'} ms-2 watch-toggle" onclick="toggleWatch('${eventId}')" title="${watching ? 'Stop watching' : 'Only show the dates I watch'}">${watching ? '★ Watching' : '☆ Watch'}</button>`;
+}
+
+// The server filters /api/tickets to the saved watchlist (cookie-based)
+function saveWatchlist(events) {
+    return fetch('/api/watchlist', {
+        method: 'PUT',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ events: Array.from(events) })
+    })
+        .then(response => {
+            if (!response.ok) throw new Error('Could not save watchlist');
+            return updateTicketData();
+        })
+        .catch(error => console.error('Error saving watchlist:', error));
+}
+
+function toggleWatch(eventId) {
+    const events = new Set(watchlist);
+    if (events.has(eventId)) {
+        events.delete(eventId);
+    } else {
+        events.add(eventId);
+    }
+    return saveWatchlist(events);
+}
+
+function clearWatchlist() {
+    return saveWatchlist([]);
+}
+
+function renderWatchlistBar() {
+    const bar = document.getElementById('watchlistBar');
+    if (!bar) return;
+    if (watchlist.size === 0) {
+        bar.innerHTML = '';
+        return;
+    }
+    bar.innerHTML = `Watching ${watchlist.size} date${watchlist.size === 1 ? '' : 's'} · <a href="#" onclick="clearWatchlist(); return false;">Show all dates</a>`;
+}
+
+function updateTicketData() {
+    dashboardClock.fetchInFlight = true;
+    return fetch('/api/tickets')
+        .then(response => {
+            planNextFetch(response);
+            showSnapshotAge(response);
+            const archived = response.headers.get('X-Archived-Events');
+            archivedEvents = new Set(archived ? archived.split(',') : []);
+            const watched = response.headers.get('X-Watchlist');
+            watchlist = new Set(watched ? watched.split(',') : []);
+            renderWatchlistBar();
+            return response.json();
+        })
+        .then(data => {
+            console.log('Received ticket data:', data);
+
+            if (data && Object.keys(data).length > 0) {
+                // Add missing dates if any are missing from the API response
+                for (const month in CONCERT_DATES) {
+                    for (const day of CONCERT_DATES[month]) {
+                        const eventId = `${month.toLowerCase()}-${day}`;
+                        if (!data[eventId] && !archivedEvents.has(eventId) && isWatched(eventId)) {
+                            // Create a fallback entry for this date
+                            data[eventId] = generateFallbackEntryForDate(month, day);
+                        }
+                    }
+                }
+                cachedData = data;
+                updateTicketUI(data);
+            } else {
+                // If no data from server, use cached data or generate fallback
+                const dataToUse = cachedData || generateFallbackData();
+                updateTicketUI(dataToUse);
+            }
+        })
+        .catch(error => {
+            console.error('Error fetching ticket data:', error);
+            // On error, use cached data or generate fallback
+            const dataToUse = cachedData || generateFallbackData();
+            updateTicketUI(dataToUse);
+            if (Date.now() >= dashboardClock.nextFetchAt) {
+                planNextFetch(null);
+            }
+        })
+        .finally(() => {
+            dashboardClock.fetchInFlight = false;
+        });
+}
+
+function generateFallbackEntryForDate(month, day) {
+    const date = `${month} ${day}, 2025`;
+    return {
+        name: `Bad Bunny - ${date}`,
+        date: date,
+        status: "⚡ Loading...",
+        lastChecked: "Checking...",
+        url: getUrlForDate(month, day)
+    };
+}
+
+// Generates fallback data for all dates
+function generateFallbackData() {
+    const fallbackData = {};
+    for (const month in CONCERT_DATES) {
+        for (const day of CONCERT_DATES[month]) {
+            const eventId = `${month.toLowerCase()}-${day}`;
+            if (archivedEvents.has(eventId) || !isWatched(eventId)) continue;
+            fallbackData[eventId] = generateFallbackEntryForDate(month, day);
+        }
+    }
+    return fallbackData;
+}
+
+function updateTicketUI(data) {
+    const container = document.getElementById('tickets-container');
+    if (!container) return;
+
+    // Clear the container first to avoid duplications
+    container.innerHTML = '';
+
+    // Create a section for each month
+    let monthSections = {};
+    ['July', 'August', 'September'].forEach(month => {
+        let monthSection = document.createElement('div');
+        monthSection.className = 'month-section mb-4';
+        monthSection.setAttribute('data-month', month);
+        monthSection.innerHTML = `<h2 class="month-title">${month} 2025</h2><div class="row" data-month-row="${month}"></div>`;
+        container.appendChild(monthSection);
+        monthSections[month] = monthSection.querySelector(`[data-month-row="${month}"]`);
+    });
+
+    // Then update or create tickets for each event
+    for (const eventId in data) {
+        const event = data[eventId];
+        const [monthLower, day] = eventId.split('-');
+        const month = monthLower.charAt(0).toUpperCase() + monthLower.slice(1);
+
+        if (!CONCERT_DATES[month] || !CONCERT_DATES[month].includes(day)) {
+            continue; // Skip if not in our list of concert dates
+        }
+
+        // Create new card
+        const col = document.createElement('div');
+        col.className = 'col-md-4 mb-4';
+        col.innerHTML = `
+            <div class="card ticket-card" id="${eventId}" data-event-id="${eventId}">
+                <div class="status-alert alert-info"></div>
+                <div class="card-body">
+                    <h5 class="card-title">${event.name}</h5>
+                    <div class="d-flex justify-content-between align-items-center mb-3">
+                        <span class="badge alert-info status-badge">${event.status}</span>
+                    </div>
+                    <p class="card-text">Last checked: ${event.lastChecked}</p>
+                    <a href="${event.url || getUrlForDate(monthLower, day)}" class="btn btn-primary" target="_blank">Check Tickets</a>
+                    ${watchButton(eventId)}
+                    <div class="dropdown mt-2 mb-2">
+                        <button class="btn btn-sm btn-outline-success dropdown-toggle" type="button" id="cart-options-${eventId}" data-toggle="dropdown" aria-haspopup="true" aria-expanded="false">
+                            <i class="fas fa-cart-plus"></i> Auto-Cart Options
+                        </button>
+                        <div class="dropdown-menu p-2" aria-labelledby="cart-options-${eventId}">
+                            <h6 class="dropdown-header">Ticket Quantity</h6>
+                            <div class="form-group">
+                                <select class="form-control form-control-sm" id="qty-select-${eventId}">
+                                    <option value="1">1 Ticket</option>
+                                    <option value="2" selected>2 Tickets</option>
+                                    <option value="3">3 Tickets</option>
+                                    <option value="4">4 Tickets</option>
+                                    <option value="6">6 Tickets</option>
+                                    <option value="8">8 Tickets</option>
+                                </select>
+                            </div>
+                            <div class="form-check">
+                                <input class="form-check-input" type="checkbox" value="" id="auto-checkout-${eventId}" checked>
+                                <label class="form-check-label" for="auto-checkout-${eventId}">
+                                    Auto-Checkout
+                                </label>
+                            </div>
+                            <div class="form-check">
+                                <input class="form-check-input" type="checkbox" value="" id="best-available-${eventId}" checked>
+                                <label class="form-check-label" for="best-available-${eventId}">
+                                    Best Available
+                                </label>
+                            </div>
+                            <div class="dropdown-divider"></div>
+                            <button onclick="startAutoCartWithOptions('${eventId}')" class="btn btn-success btn-sm btn-block">Start Auto-Cart</button>
+                        </div>
+                    </div>
+                </div>
+            </div>
+        `;
+        monthSections[month].appendChild(col);
+
+        // Apply the appropriate status alert coloring
+        const ticketCard = col.querySelector('.ticket-card');
+        const statusBadge = ticketCard.querySelector('.status-badge');
+        const statusAlert = ticketCard.querySelector('.status-alert');
+
+        let alertClass = 'alert-info';
+
+        // Check for checkout links in the status text (highest priority)
+        if (event.status.includes('CHECKOUT AVAILABLE')) {
+            alertClass = 'alert-danger';
+            statusBadge.className = 'badge checkout-status status-badge';
+            ticketCard.classList.add('checkout-available', 'shake');
+
+            // Add checkout button if there's a link
+            const linkMatch = event.status.match(/Link: (https?:\/\/[^\s]+)/);
+            if (linkMatch && linkMatch[1]) {
+                const checkoutLink = linkMatch[1].replace('...', '');
+
+                // Create checkout button container
+                const buttonContainer = document.createElement('div');
+                buttonContainer.className = 'checkout-button-container text-center mt-3';
+
+                // Create checkout button
+                const checkoutButton = document.createElement('a');
+                checkoutButton.className = 'btn btn-danger checkout-button';
+                checkoutButton.innerHTML = '<i class="fas fa-shopping-cart"></i> GO TO CHECKOUT';
+                checkoutButton.href = checkoutLink;
+                checkoutButton.target = '_blank';
+
+                buttonContainer.appendChild(checkoutButton);
+                ticketCard.querySelector('.card-body').appendChild(buttonContainer);
+
+                // Play alert sound with maximum urgency when checkout is available
+                if (previousStates[eventId] && !previousStates[eventId].includes('CHECKOUT AVAILABLE') && isSoundEnabled()) {
+                    // Play the sound multiple times to indicate urgency
+                    playAlertSound();
+                    setTimeout(playAlertSound, 1000);
+                    setTimeout(playAlertSound, 2000);
+                }
+            }
+        }
+        else if (event.status.includes('Available')) {
+            alertClass = 'alert-success';
+            statusBadge.className = 'badge alert-success status-badge';
+            ticketCard.classList.add('shake');
+            setTimeout(() => {
+                ticketCard.classList.remove('shake');
+            }, 1000);
+
+            // Check if status has changed from unavailable to available
+            const previousStatus = previousStates[eventId] || '';
+            if (!previousStatus.includes('Available') && isSoundEnabled()) {
+                console.log(`Status changed for ${eventId}: ${previousStatus} → ${event.status}`);
+                playAlertSound();
+            }
+        } else if (event.status.includes('Soon')) {
+            alertClass = 'alert-warning';
+            statusBadge.className = 'badge alert-warning status-badge';
+        } else if (event.status.includes('Sold Out')) {
+            alertClass = 'alert-danger';
+            statusBadge.className = 'badge alert-danger status-badge';
+        } else {
+            statusBadge.className = 'badge alert-info status-badge';
+        }
+
+        // Store current status for next comparison
+        previousStates[eventId] = event.status;
+
+        // Apply the alert class to the status alert bar
+        statusAlert.className = `status-alert ${alertClass}`;
+    }
+}
+
+// Initialize
+function initialize() {
+    if (dashboardClock.started) return;
+    dashboardClock.started = true;
+
+    // Load sound preference from localStorage
+    const savedSoundPreference = localStorage.getItem('soundEnabled');
+    if (savedSoundPreference !== null) {
+        soundEnabled = savedSoundPreference === 'true';
+        const soundStatus = document.getElementById('sound-status');
+        soundStatus.innerText = soundEnabled ? 'ENABLED' : 'DISABLED';
+    }
+
+    // Load and pre-decode the custom sound in the background
+    loadCustomSound();
+    ['pointerdown', 'keydown'].forEach(type => document.addEventListener(type, unlockAudioContext, { once: true }));
+
+    // Render the last known status instantly, then start the dashboard clock
+    // (its first tick fetches fresh data)
+    registerServiceWorker();
+    refreshPushToggle();
+    renderCachedSnapshot();
+    document.addEventListener('visibilitychange', handleVisibilityChange);
+    tick();
+}
+
+// Initialize when DOM is ready
+document.addEventListener('DOMContentLoaded', initialize);
+
+function toggleCustomSoundOptions() {
+    const container = document.getElementById('custom-sound-container');
+    if (container.classList.contains('visible')) {
+        container.classList.remove('visible');
+    } else {
+        container.classList.add('visible');
+        // Force redraw - this helps ensure the container is visible
+        setTimeout(() => {
+            container.style.opacity = '0.99';
+            setTimeout(() => container.style.opacity = '1', 50);
+        }, 10);
+    }
+}
+
+function selectPresetSound(preset) {
+    const audio = document.getElementById('alertSound');
+    if (preset === 'default') {
+        audio.src = 'data:audio/mpeg;base64,SUQzBAAAAAAAI1RTU0UAAAAPAAADTGF2ZjU4Ljc2LjEwMAAAAAAAAAAAAAAA//tQAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAASW5mbwAAAA8AAAASAAAeMwAUFBQUFCgoKCgoKDw8PDw8PFBQUFBQUG5ubm5uboKCgoKCgpaWlpaWlqqqqqqqqr6+vr6+vtLS0tLS0ubm5ubm5vr6+vr6+v8AAAAATGF2YzU4Ljc2LjEwMAAAAAAAAAAAAAAA//tQAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAASW5mbwAAAA8AAAASAAAeMwAUFBQUFCgoKCgoKDw8PDw8PFBQUFBQUG5ubm5uboKCgoKCgpaWlpaWlqqqqqqqqr6+vr6+vtLS0tLS0ubm5ubm5vr6+vr6+v8AAAAATGF2YzU4LjEzAAAAAAAAAAAAAAAAJAQKAAAAAAAAHjOZTf9C//MsAAAAAAAAAAAAAAAAAAAA//tQZAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAWGluZwAAAA8AAAACAAACzAAICAg4ODg4SEhISEhoaGhoaHh4eHh4iIiIiIiYmJiYmKioqKiouLi4uLjMzMzMzNzc3Nzc8PDw8PD4+Pj4+P8AAAAATGF2ZTU4LjEzAAAAAAAAAAAAAAAAJAQGAAAAAAAACs3yxUAAAAAAAAAAAAAAAAAAAAAA//sQZAAP8AAAaQAAAAgAAA0gAAABAAABpAAAACAAADSAAAAETEFNRTMuOTkuNVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVV';
+    } else if (preset === 'loud') {
+        audio.src = 'data:audio/mpeg;base64,SUQzBAAAAAAAI1RTU0UAAAAPAAADTGF2ZjU4Ljc2LjEwMAAAAAAAAAAAAAAA//tQAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAASW5mbwAAAA8AAAASAAAeMwAUFBQUFCgoKCgoKDw8PDw8PFBQUFBQUG5ubm5uboKCgoKCgpaWlpaWlqqqqqqqqr6+vr6+vtLS0tLS0ubm5ubm5vr6+vr6+v8AAAAATGF2YzU4Ljc2LjEwMAAAAAAAAAAAAAAA//tQAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAASW5mbwAAAA8AAAASAAAeMwAUFBQUFCgoKCgoKDw8PDw8PFBQUFBQUG5ubm5uboKCgoKCgpaWlpaWlqqqqqqqqr6+vr6+vtLS0tLS0ubm5ubm5vr6+vr6+v8AAAAATGF2YzU4LjEzAAAAAAAAAAAAAAAAJAQKAAAAAAAAHjOZTf9C//MsAAAAAAAAAAAAAAAAAAAA//tQZAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAWGluZwAAAA8AAAACAAACzAAICAg4ODg4SEhISEhoaGhoaHh4eHh4iIiIiIiYmJiYmKioqKiouLi4uLjMzMzMzNzc3Nzc8PDw8PD4+Pj4+P8AAAAATGF2ZTU4LjEzAAAAAAAAAAAAAAAAJAQGAAAAAAAACs3yxUAAAAAAAAAAAAAAAAAAAAAA//sQZAAP8AAAaQAAAAgAAA0gAAABAAABpAAAACAAADSAAAAETEFNRTMuOTkuNVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVV';
+    } else if (preset === 'soft') {
+        audio.src = 'data:audio/mpeg;base64,SUQzBAAAAAAAI1RTU0UAAAAPAAADTGF2ZjU4Ljc2LjEwMAAAAAAAAAAAAAAA//tQAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAASW5mbwAAAA8AAAASAAAeMwAUFBQUFCgoKCgoKDw8PDw8PFBQUFBQUG5ubm5uboKCgoKCgpaWlpaWlqqqqqqqqr6+vr6+vtLS0tLS0ubm5ubm5vr6+vr6+v8AAAAATGF2YzU4Ljc2LjEwMAAAAAAAAAAAAAAA//tQAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAASW5mbwAAAA8AAAASAAAeMwAUFBQUFCgoKCgoKDw8PDw8PFBQUFBQUG5ubm5uboKCgoKCgpaWlpaWlqqqqqqqqr6+vr6+vtLS0tLS0ubm5ubm5vr6+vr6+v8AAAAATGF2YzU4LjEzAAAAAAAAAAAAAAAAJAQKAAAAAAAAHjOZTf9C//MsAAAAAAAAAAAAAAAAAAAA//tQZAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAWGluZwAAAA8AAAACAAACzAAICAg4ODg4SEhISEhoaGhoaHh4eHh4iIiIiIiYmJiYmKioqKiouLi4uLjMzMzMzNzc3Nzc8PDw8PD4+Pj4+P8AAAAATGF2ZTU4LjEzAAAAAAAAAAAAAAAAJAQGAAAAAAAACs3yxUAAAAAAAAAAAAAAAAAAAAAA//sQZAAP8AAAaQAAAAgAAA0gAAABAAABpAAAACAAADSAAAAETEFNRTMuOTkuNVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVX/+xBkBY/wAABpAAAACAAADSAAAAEAAAGkAAAAIAAANIAAAARVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVVV';
+    }
+
+    // Presets replace the decoded custom sound until the page is reloaded
+    fetch(audio.src)
+        .then(response => response.blob())
+        .then(useAlertSound)
+        .catch(error => console.warn('Could not decode preset sound:', error));
+}
+
+function saveCustomSound() {
+    // Check if a file was uploaded
+    const fileInput = document.getElementById('sound-file-upload');
+    if (fileInput.files && fileInput.files[0]) {
+        const file = fileInput.files[0];
+        if (file.type.includes('audio')) {
+            // The File is already a Blob: store it as-is and decode it once for playback
+            useAlertSound(file);
+            saveSoundBlob(file)
+                .then(() => {
+                    localStorage.setItem('customSoundUrl', 'LOCAL_FILE'); // Mark that we're using a local file
+                    localStorage.removeItem('customSoundData');
+                    alert('Custom sound file saved! Click Test Sound to make sure it works.');
+                })
+                .catch(error => {
+                    console.error('Error saving custom sound:', error);
+                    alert('Custom sound will be used until you reload, but it could not be saved in this browser.');
+                });
+        } else {
+            alert('Please select a valid audio file.');
+        }
+    } else {
+        alert('Please select a sound file to upload or choose a preset.');
+    }
+}
+
+function testSound() {
+    // Clicking Test Sound is a user gesture, so the audio context may start here
+    const context = getAudioContext();
+    if (alertAudio.buffer && context) {
+        context.resume()
+            .then(() => {
+                if (!playDecodedSound()) playTestSoundElement();
+            })
+            .catch(() => playTestSoundElement());
+        return;
+    }
+    playTestSoundElement();
+}
+
+function playTestSoundElement() {
+    const audio = document.getElementById('alertSound');
+
+    // Make sure the audio element is properly loaded
+    if (audio.readyState === 0) {  // HAVE_NOTHING
+        // Force a load if needed
+        audio.load();
+    }
+
+    // Reset to beginning and attempt to play
+    audio.currentTime = 0;
+
+    // Create a user interaction context for autoplay
+    const playPromise = audio.play();
+
+    if (playPromise !== undefined) {
+        playPromise.then(() => {
+            console.log("Test sound played successfully");
+        }).catch(error => {
+            console.error("Error playing test sound:", error);
+            if (error.name === "NotAllowedError") {
+                alert("Browser blocked autoplay. Please interact with the page first (click somewhere) and try again.");
+            } else {
+                alert("Error playing sound: " + error.message);
+            }
+        });
+    }
+}
+
+function toggleAutofillSettings() {
+    const container = document.getElementById('autofill-settings-container');
+    const cartContainer = document.getElementById('cart-settings-container');
+
+    // Close cart settings if open
+    if (cartContainer.classList.contains('visible')) {
+        cartContainer.classList.remove('visible');
+    }
+
+    // Toggle autofill settings
+    container.classList.toggle('visible');
+
+    // Scroll to container if visible
+    if (container.classList.contains('visible')) {
+        container.scrollIntoView({ behavior: 'smooth', block: 'start' });
+
+        // Check if autofill is already initialized
+        setTimeout(() => {
+            if (!document.getElementById('random-autofill-settings')) {
+                initAutofillSettings();
+            }
+        }, 100);
+    }
+}
+
+function toggleCartSettings() {
+    const container = document.getElementById('cart-settings-container');
+    const autofillContainer = document.getElementById('autofill-settings-container');
+
+    // Close autofill settings if open
+    if (autofillContainer.classList.contains('visible')) {
+        autofillContainer.classList.remove('visible');
+    }
+
+    // Toggle cart settings
+    container.classList.toggle('visible');
+
+    // Scroll to container if visible
+    if (container.classList.contains('visible')) {
+        container.scrollIntoView({ behavior: 'smooth', block: 'start' });
+        refreshCartSettings(); // Auto-refresh settings when opened
+        refreshCartStatus(); // Get current cart status
+    }
+}
+
+// Initialize autofill only when the "Generate Random Info" button is clicked
+window.onload = function() {
+    console.log("Window loaded - setting up autofill button events");
+
+    // Setup the Generate button click handler
+    const generateButton = document.getElementById('generate-autofill');
+    if (generateButton) {
+        generateButton.addEventListener('click', function() {
+            console.log("Generate button clicked - generating random info");
+
+            // Check if the userInfo function exists in the autofill.js
+            if (typeof generateRandomUserInfo === 'function') {
+                // Generate random info
+                const userInfo = generateRandomUserInfo();
+                console.log("Generated random user info:", userInfo);
+
+                // Fill the form fields
+                document.getElementById('autofill-firstname').value = userInfo.firstName;
+                document.getElementById('autofill-lastname').value = userInfo.lastName;
+                document.getElementById('autofill-phone').value = userInfo.phone;
+                document.getElementById('autofill-street').value = userInfo.address.street;
+                document.getElementById('autofill-city').value = userInfo.address.city;
+                document.getElementById('autofill-state').value = userInfo.address.state;
+                document.getElementById('autofill-zip').value = userInfo.address.zip;
+
+                // Save to localStorage
+                localStorage.setItem('ticketeraUserInfo', JSON.stringify(userInfo));
+
+                console.log("Random info populated and saved to localStorage");
+            } else {
+                console.error("generateRandomUserInfo function not found");
+            }
+        });
+    }
+};
+
+        document.addEventListener('DOMContentLoaded', function() {
+            // Set up the copy button
+            const copyButton = document.getElementById('copy-autofill-script');
+            if (copyButton) {
+                copyButton.addEventListener('click', function() {
+                    const userInfo = {
+                        firstName: document.getElementById('autofill-firstname').value,
+                        lastName: document.getElementById('autofill-lastname').value,
+                        phone: document.getElementById('autofill-phone').value,
+                        address: {
+                            street: document.getElementById('autofill-street').value,
+                            city: document.getElementById('autofill-city').value,
+                            state: document.getElementById('autofill-state').value,
+                            zip: document.getElementById('autofill-zip').value
+                        }
+                    };
+
+                    const script = `
+(function() {
+    const userInfo = ${JSON.stringify(userInfo)};
+
+    // Fill all input fields
+    document.querySelectorAll('input:not([type="hidden"]):not([type="submit"]):not([type="button"]):not([type="checkbox"]):not([type="radio"])').forEach(input => {
+        const name = (input.name || '').toLowerCase();
+        const id = (input.id || '').toLowerCase();
+        const placeholder = (input.placeholder || '').toLowerCase();
+
+        if (input.value) return; // Skip already filled fields
+
+        if (name.includes('first') || name.includes('nombre') || id.includes('first') || placeholder.includes('first name')) {
+            input.value = userInfo.firstName;
+        } else if (name.includes('last') || name.includes('apellido') || id.includes('last') || placeholder.includes('last name')) {
+            input.value = userInfo.lastName;
+        } else if (name.includes('phone') || name.includes('tel') || id.includes('phone') || placeholder.includes('phone')) {
+            input.value = userInfo.phone;
+        } else if (name.includes('address') || name.includes('street') || id.includes('address') || placeholder.includes('address')) {
+            input.value = userInfo.address.street;
+        } else if (name.includes('city') || id.includes('city') || placeholder.includes('city')) {
+            input.value = userInfo.address.city;
+        } else if (name.includes('state') || id.includes('state') || placeholder.includes('state')) {
+            input.value = userInfo.address.state;
+        } else if (name.includes('zip') || name.includes('postal') || id.includes('zip') || placeholder.includes('zip')) {
+            input.value = userInfo.address.zip;
+        }
+
+        if (input.value) {
+            input.dispatchEvent(new Event('input', { bubbles: true }));
+            input.dispatchEvent(new Event('change', { bubbles: true }));
+        }
+    });
+
+    alert('Form autofilled! Remember to add your email address.');
+})();`;
+
+                    navigator.clipboard.writeText(script)
+                        .then(() => alert('Autofill script copied! Paste it into the browser console on the checkout page.'))
+                        .catch(err => alert('Error copying script: ' + err));
+                });
+            }
+        });
+
+// Initialize the cart settings UI
+function refreshCartSettings() {
+    fetch('/api/cart-config')
+        .then(response => response.json())
+        .then(config => {
+            document.getElementById('cart-enabled').checked = config.enabled;
+            document.getElementById('cart-quantity').value = config.ticketQuantity;
+            document.getElementById('cart-max-price').value = config.maxPrice;
+            document.getElementById('cart-fallback').checked = config.fallbackToAnySection;
+            document.getElementById('cart-retries').value = config.autoRetryAttempts;
+            document.getElementById('cart-notifications').checked = config.notifications;
+
+            // Update preferred sections (multi-select)
+            const sectionsSelect = document.getElementById('cart-sections');
+            for (let i = 0; i < sectionsSelect.options.length; i++) {
+                sectionsSelect.options[i].selected = 
+                    config.preferredSections.includes(sectionsSelect.options[i].value);
+            }
+        })
+        .catch(error => console.error('Error loading cart config:', error));
+}
+
+// Refresh cart status from server
+function refreshCartStatus() {
+    fetch('/api/cart-status')
+        .then(response => response.json())
+        .then(status => {
+            updateCartStatusUI(status);
+        })
+        .catch(error => console.error('Error loading cart status:', error));
+}
+
+// Update cart status UI
+function updateCartStatusUI(status) {
+    const activeContainer = document.getElementById('active-carts');
+    const completedContainer = document.getElementById('completed-carts');
+
+    // Update active carts
+    if (Object.keys(status.active).length === 0) {
+        activeContainer.innerHTML = '<p class="no-status">No active carting sessions</p>';
+    } else {
+        activeContainer.innerHTML = '';
+        for (const [eventId, cartInfo] of Object.entries(status.active)) {
+            activeContainer.innerHTML += `
+                <div class="cart-item active">
+                    <div class="cart-item-header">
+                        <span class="cart-item-title">${cartInfo.eventName}</span>
+                        <span class="cart-item-status">${cartInfo.status}</span>
+                    </div>
+                    <div class="cart-item-body">
+                        <p>Started: ${new Date(cartInfo.startTime).toLocaleTimeString()}</p>
+                    </div>
+                </div>
+            `;
+        }
+    }
+
+    // Update completed carts
+    if (Object.keys(status.completed).length === 0) {
+        completedContainer.innerHTML = '<p class="no-status">No completed carts</p>';
+    } else {
+        completedContainer.innerHTML = '';
+        for (const [eventId, cartInfo] of Object.entries(status.completed)) {
+            completedContainer.innerHTML += `
+                <div class="cart-item completed">
+                    <div class="cart-item-header">
+                        <span class="cart-item-title">${status.active[eventId]?.eventName || 'Unknown Event'}</span>
+                        <span class="cart-item-status">✅ Completed</span>
+                    </div>
+                    <div class="cart-item-body">
+                        <p>Completed: ${new Date(cartInfo.completedTime).toLocaleTimeString()}</p>
+                        <p>Tickets: ${cartInfo.ticketQuantity}</p>
+                        <a href="${cartInfo.checkoutUrl}" target="_blank" class="btn btn-sm btn-success">
+                            <i class="fas fa-external-link-alt"></i> Go to Checkout
+                        </a>
+                    </div>
+                </div>
+            `;
+        }
+    }
+}
+
+// Save cart settings to server
+function saveCartSettings() {
+    // Get values from form
+    const config = {
+        enabled: document.getElementById('cart-enabled').checked,
+        ticketQuantity: parseInt(document.getElementById('cart-quantity').value),
+        maxPrice: parseInt(document.getElementById('cart-max-price').value),
+        fallbackToAnySection: document.getElementById('cart-fallback').checked,
+        autoRetryAttempts: parseInt(document.getElementById('cart-retries').value),
+        notifications: document.getElementById('cart-notifications').checked,
+        preferredSections: Array.from(
+            document.getElementById('cart-sections').selectedOptions, 
+            option => option.value
+        )
+    };
+
+    // Save to server
+    fetch('/api/cart-config', {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json',
+        },
+        body: JSON.stringify(config)
+    })
+    .then(response => response.json())
+    .then(data => {
+        console.log('Cart settings saved:', data);
+        showNotification('Cart settings saved successfully!', 'success');
+
+        // Also update in the client-side cart system
+        if (window.cartSystem && window.cartSystem.updateConfig) {
+            window.cartSystem.updateConfig(config);
+        }
+    })
+    .catch(error => console.error('Error saving cart settings:', error));
+}
+
+// Start auto-carting for a specific event
+function startAutoCartWithOptions(eventId) {
+    const [month, day] = eventId.split('-');
+    const ticketUrl = getDirectUrl(month, day);
+
+    // Get options from form elements
+    const quantitySelect = document.getElementById(`qty-select-${eventId}`);
+    const quantity = quantitySelect ? quantitySelect.value : "2";
+
+    const autoCheckout = document.getElementById(`auto-checkout-${eventId}`);
+    const useAutoCheckout = autoCheckout ? autoCheckout.checked : true;
+
+    const bestAvailable = document.getElementById(`best-available-${eventId}`);
+    const useBestAvailable = bestAvailable ? bestAvailable.checked : true;
+
+    // Validate URL
+    if (!ticketUrl) {
+        alert("Error: No direct URL available for this date.");
+        return;
+    }
+
+    // Store options in localStorage
+    const cartOptions = {
+        eventId: eventId,
+        quantity: quantity,
+        autoCheckout: useAutoCheckout,
+        bestAvailable: useBestAvailable,
+        url: ticketUrl,
+        timestamp: new Date().toISOString()
+    };
+    localStorage.setItem('lastCartOptions', JSON.stringify(cartOptions));
+
+    // Build the API endpoint URL with parameters
+    const apiUrl = `/api/start-cart?event_id=${encodeURIComponent(eventId)}&url=${encodeURIComponent(ticketUrl)}&quantity=${quantity}&auto_checkout=${useAutoCheckout}&best_available=${useBestAvailable}`;
+
+    // Update UI to show cart is starting
+    const ticketCard = document.querySelector(`[data-event-id="${eventId}"]`);
+    if (ticketCard) {
+        const statusBadge = ticketCard.querySelector('.status-badge');
+        if (statusBadge) {
+            statusBadge.textContent = '🛒 Starting Auto-Cart...';
+            statusBadge.className = 'badge alert-info status-badge';
+        }
+    }
+
+    // Call the API endpoint
+    fetch(apiUrl)
+        .then(response => response.json())
+        .then(data => {
+            console.log('Auto-cart process started:', data);
+
+            // Update UI based on response
+            if (ticketCard) {
+                const statusBadge = ticketCard.querySelector('.status-badge');
+                if (statusBadge) {
+                    if (data.success) {
+                        statusBadge.textContent = `🛒 Auto-Cart Started (${quantity} tickets)`;
+                        statusBadge.className = 'badge alert-success status-badge';
+
+                        // Add a cart status indicator
+                        const cardBody = ticketCard.querySelector('.card-body');
+                        if (cardBody) {
+                            const cartStatus = document.createElement('div');
+                            cartStatus.className = 'cart-status mt-2 p-2 bg-light';
+                            cartStatus.innerHTML = `
+                                <small>
+                                    <strong>Auto-Cart Status:</strong> <span class="cart-progress">Initializing...</span><br>
+                                    <div class="progress mt-1" style="height: 5px;">
+                                        <div class="progress-bar bg-success cart-progress-bar" role="progressbar" style="width: 0%"></div>
+                                    </div>
+                                </small>
+                            `;
+                            cardBody.appendChild(cartStatus);
+
+                            // Set up periodic updates of cart status
+                            const updateCartInterval = setInterval(() => {
+                                fetch(`/api/cart-status?event_id=${encodeURIComponent(eventId)}`)
+                                    .then(response => response.json())
+                                    .then(statusData => {
+                                        const progressSpan = cartStatus.querySelector('.cart-progress');
+                                        const progressBar = cartStatus.querySelector('.cart-progress-bar');
+
+                                        if (progressSpan && progressBar && statusData.status) {
+                                            progressSpan.textContent = statusData.status;
+                                            if (statusData.progress) {
+                                                progressBar.style.width = `${statusData.progress}%`;
+                                            }
+
+                                            // If completed, clear interval
+                                            if (statusData.completed) {
+                                                clearInterval(updateCartInterval);
+                                            }
+                                        }
+                                    })
+                                    .catch(err => console.error('Error updating cart status:', err));
+                            }, 2000);
+                        }
+                    } else {
+                        statusBadge.textContent = '❌ Auto-Cart Failed';
+                        statusBadge.className = 'badge alert-danger status-badge';
+                        alert(`Failed to start auto-cart: ${data.error || 'Unknown error'}`);
+                    }
+                }
+            }
+        })
+        .catch(error => {
+            console.error('Error starting auto-cart:', error);
+            if (ticketCard) {
+                const statusBadge = ticketCard.querySelector('.status-badge');
+                if (statusBadge) {
+                    statusBadge.textContent = '❌ Auto-Cart Error';
+                    statusBadge.className = 'badge alert-danger status-badge';
+                }
+            }
+            alert('Error starting auto-cart process. Please try again.');
+        });
+}
+
+// Legacy function for backward compatibility
+function startAutoCart(eventId) {
+    startAutoCartWithOptions(eventId);
+}
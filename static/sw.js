@@ -0,0 +1,136 @@
+/**
+ * Service worker for the Bad Bunny Ticket Monitor dashboard
+ *
+ * - App shell ("/") is served stale-while-revalidate so first paint never waits
+ *   on the server.
+ * - Hashed bundles under /assets/ are immutable and served cache-first.
+ * - /api/tickets is network-first. Every good response is kept as the last
+ *   known snapshot. When the server is down, restarting or returns an error,
+ *   the snapshot is served with X-From-Cache and X-Cached-At headers so the page
+ *   can show how old it is instead of falling back to placeholder data.
+ */
+const SHELL_CACHE = 'bb-shell-v1';
+const SNAPSHOT_CACHE = 'bb-snapshot-v1';
+const SNAPSHOT_URL = '/api/tickets';
+const SHELL_URLS = ['/'];
+
+self.addEventListener('install', event => {
+    event.waitUntil(
+        caches.open(SHELL_CACHE)
+            .then(cache => cache.addAll(SHELL_URLS))
+            .then(() => self.skipWaiting())
+    );
+});
+
+self.addEventListener('activate', event => {
+    const keep = [SHELL_CACHE, SNAPSHOT_CACHE];
+    event.waitUntil(
+        caches.keys()
+            .then(keys => Promise.all(keys.filter(key => !keep.includes(key)).map(key => caches.delete(key))))
+            .then(() => self.clients.claim())
+    );
+});
+
+self.addEventListener('fetch', event => {
+    const request = event.request;
+    if (request.method !== 'GET') return;
+
+    const url = new URL(request.url);
+    if (url.origin !== self.location.origin) return;
+
+    if (url.pathname === SNAPSHOT_URL) {
+        event.respondWith(networkFirstSnapshot(request));
+    } else if (url.pathname.startsWith('/assets/')) {
+        event.respondWith(cacheFirst(request));
+    } else if (url.pathname === '/' || url.pathname.startsWith('/static/')) {
+        event.respondWith(staleWhileRevalidate(request, event));
+    }
+});
+
+async function networkFirstSnapshot(request) {
+    const cache = await caches.open(SNAPSHOT_CACHE);
+    try {
+        const response = await fetch(request);
+        if (response.ok) {
+            await cache.put(SNAPSHOT_URL, await stampSnapshot(response.clone()));
+            return response;
+        }
+        // Server errors during restarts: prefer the last good snapshot
+        return (await cachedSnapshot(cache)) || response;
+    } catch (error) {
+        const cached = await cachedSnapshot(cache);
+        if (cached) return cached;
+        throw error;
+    }
+}
+
+async function stampSnapshot(response) {
+    // Record when we stored the snapshot so its age survives restarts of the browser
+    const headers = new Headers(response.headers);
+    headers.set('X-Cached-At', String(Date.now()));
+    headers.delete('ETag');
+    return new Response(await response.blob(), { status: 200, headers: headers });
+}
+
+async function cachedSnapshot(cache) {
+    const cached = await cache.match(SNAPSHOT_URL);
+    if (!cached) return null;
+    const headers = new Headers(cached.headers);
+    headers.set('X-From-Cache', '1');
+    return new Response(await cached.blob(), { status: 200, headers: headers });
+}
+
+async function cacheFirst(request) {
+    const cache = await caches.open(SHELL_CACHE);
+    const cached = await cache.match(request);
+    if (cached) return cached;
+    const response = await fetch(request);
+    if (response.ok) {
+        cache.put(request, response.clone());
+    }
+    return response;
+}
+
+async function staleWhileRevalidate(request, event) {
+    const cache = await caches.open(SHELL_CACHE);
+    // Query strings on the dashboard URL do not change the shell
+    const cacheKey = new URL(request.url).pathname === '/' ? '/' : request;
+    const cached = await cache.match(cacheKey);
+    const network = fetch(request)
+        .then(response => {
+            if (response.ok) {
+                cache.put(cacheKey, response.clone());
+            }
+            return response;
+        });
+
+    if (cached) {
+        // Revalidate in the background; errors only matter when nothing is cached
+        event.waitUntil(network.catch(() => undefined));
+        return cached;
+    }
+    return network;
+}
+
+// Web Push alerts sent by the monitor's sweep (see web_push.py)
+self.addEventListener('push', event => {
+    let alert = {};
+    try {
+        alert = event.data ? event.data.json() : {};
+    } catch (error) {
+        alert = { body: event.data ? event.data.text() : '' };
+    }
+
+    event.waitUntil(self.registration.showNotification(alert.title || 'Bad Bunny Ticket Monitor', {
+        body: alert.body || 'Ticket status changed',
+        tag: alert.eventId || 'ticket-status',
+        renotify: true,
+        requireInteraction: Boolean(alert.urgent),
+        data: { url: alert.url || '/' }
+    }));
+});
+
+self.addEventListener('notificationclick', event => {
+    event.notification.close();
+    event.waitUntil(self.clients.openWindow(event.notification.data.url));
+});
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Test script for alert routing rules
+
+Checks that:
+- malformed rules (bad webhook, unknown filters, non-string ids) are refused
+- the compiled index returns exactly the rules a transition matches
+- a rule saved through one store is seen by another on the same file
+- dispatch() sends once per webhook with every mention on it
+
+Usage:
+    python test_alert_rules.py
+    python -m pytest test_alert_rules.py
+"""
+import os
+import sys
+import tempfile
+
+from alert_rules import RuleStore, dispatch, validate_rule
+
+EVENTS = ['july-12', 'july-18', 'august-8', 'august-9', 'august-10', 'september-5']
+WEBHOOK = 'https://discord.com/api/webhooks/1/abc'
+
+
+def check(condition, message):
+    print(f"  {'PASS' if condition else 'FAIL'}: {message}")
+    return condition
+
+
+def rejected(rule):
+    try:
+        validate_rule(rule, EVENTS)
+    except ValueError:
+        return True
+    return False
+
+
+def check_validation():
+    print("\n== rule validation ==")
+    ok = check(rejected({'webhook': 'http://discord.com/x'}), "non-https webhook refused")
+    ok &= check(rejected({'webhook': WEBHOOK, 'months': ['december']}), "unknown month refused")
+    ok &= check(rejected({'webhook': WEBHOOK, 'states': ['maybe']}), "unknown state refused")
+    ok &= check(rejected({'webhook': WEBHOOK, 'events': ['july-12'], 'months': ['august']}),
+                "rule matching no events refused")
+    for rule_id in ({'a': 1}, ['a'], 7, 'x' * 65, 'bad id'):
+        ok &= check(rejected({'webhook': WEBHOOK, 'id': rule_id}), f"id {rule_id!r:.20} refused")
+    rule = validate_rule({'webhook': WEBHOOK, 'id': 'ana-weekends', 'weekdays': ['Saturday']}, EVENTS)
+    ok &= check(rule['id'] == 'ana-weekends' and rule['weekdays'] == ['sat'], "valid rule normalized")
+    return ok
+
+
+def check_matching():
+    print("\n== index matching ==")
+    with tempfile.TemporaryDirectory() as tmp:
+        store = RuleStore(os.path.join(tmp, 'alert_rules.json'), EVENTS)
+        store.add({'id': 'august', 'webhook': WEBHOOK, 'months': ['August']})
+        store.add({'id': 'upgrades', 'webhook': WEBHOOK, 'events': ['july-12'], 'upgrades_only': True})
+        store.add({'id': 'stock', 'webhook': WEBHOOK, 'states': ['available'], 'inventory_known': True})
+
+        def matched(event_id, previous, status):
+            return sorted(rule['id'] for rule in store.match(event_id, previous, status))
+
+        ok = check(matched('august-8', '❌ Sold Out', '⚡ Coming Soon') == ['august'], "month filter")
+        ok &= check(matched('july-12', '❌ Sold Out', '🔥 TICKETS AVAILABLE! CHECK NOW 🔥') == ['upgrades'],
+                    "upgrade to available matches the upgrades-only rule")
+        ok &= check(matched('july-12', '🔥 TICKETS AVAILABLE! CHECK NOW 🔥', '❌ Sold Out') == [],
+                    "downgrade does not match the upgrades-only rule")
+        ok &= check(matched('july-18', '❌ Sold Out', '🔥 TICKETS AVAILABLE! 40 tickets in stock 🔥') == ['stock'],
+                    "inventory-known rule matches a stock count")
+        ok &= check(matched('july-18', '❌ Sold Out', '🔥 TICKETS AVAILABLE! CHECK NOW 🔥') == [],
+                    "inventory-known rule skips statuses without a count")
+        ok &= check(matched('august-9', '❌ Sold Out', '🔥 TICKETS AVAILABLE! Stock: 3 🔥') == ['august', 'stock'],
+                    "every matching rule is returned")
+
+        other_worker = RuleStore(store.path, EVENTS)
+        ok &= check(len(other_worker) == 3, "rules are shared through the file")
+        store.remove('august')
+        ok &= check(sorted(rule['id'] for rule in other_worker.all()) == ['stock', 'upgrades'],
+                    "a removal in one store is seen by another")
+    return ok
+
+
+def check_dispatch():
+    print("\n== dispatch ==")
+    sent = []
+    rules = [
+        {'webhook': WEBHOOK, 'mention': '<@1>'},
+        {'webhook': WEBHOOK, 'mention': '<@2>'},
+        {'webhook': WEBHOOK, 'mention': '<@1>'},
+        {'webhook': 'https://discord.com/api/webhooks/2/def', 'mention': ''},
+    ]
+
+    def post(webhook, content):
+        sent.append((webhook, content))
+        return webhook == WEBHOOK
+
+    result = dispatch(rules, 'July 12: tickets!', post)
+    ok = check(result == {'sent': 1, 'failed': 1}, "one delivery per webhook, failures counted")
+    ok &= check((WEBHOOK, '<@1> <@2> July 12: tickets!') in sent, "mentions merged and deduplicated")
+    return ok
+
+
+def test_validation():
+    assert check_validation()
+
+
+def test_matching():
+    assert check_matching()
+
+
+def test_dispatch():
+    assert check_dispatch()
+
+
+def main():
+    passed = check_validation()
+    passed &= check_matching()
+    passed &= check_dispatch()
+    print("\nAll checks passed" if passed else "\nSome checks FAILED")
+    return 0 if passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Test script for the ASGI /api/tickets endpoint
+
+Checks that:
+- GET sends the snapshot with its content-length
+- HEAD sends the same status and headers, content-length included, and an
+  empty body
+- a matching If-None-Match gets a 304 without a body
+
+Usage:
+    python test_asgi_app.py
+    python -m pytest test_asgi_app.py
+"""
+import os
+import sys
+import asyncio
+
+os.environ.setdefault('HISTORY_DB_PATH', ':memory:')
+
+
+def check(condition, message):
+    print(f"  {'PASS' if condition else 'FAIL'}: {message}")
+    return condition
+
+
+def call(method, headers=()):
+    """Run tickets_endpoint directly; returns (status, headers dict, body)"""
+    import asgi_app
+
+    scope = {'type': 'http', 'method': method, 'path': '/api/tickets', 'query_string': b'',
+             'headers': [(key.encode(), value.encode()) for key, value in headers]}
+    messages = []
+
+    async def send(message):
+        messages.append(message)
+
+    asyncio.run(asgi_app.tickets_endpoint(scope, send))
+    start, body = messages
+    return start['status'], dict(start['headers']), body['body']
+
+
+def check_head():
+    print("\n== HEAD /api/tickets ==")
+    import app as monitor
+
+    monitor.ensure_all_dates_exist()
+    status, headers, body = call('GET')
+    ok = check(status == 200 and body and int(headers[b'content-length']) == len(body),
+               "GET sends the snapshot and its length")
+
+    head_status, head_headers, head_body = call('HEAD')
+    ok &= check(head_status == 200 and head_body == b'', "HEAD sends no body")
+    ok &= check(head_headers[b'content-length'] == headers[b'content-length'], "but the GET content-length")
+    ok &= check({key: value for key, value in head_headers.items() if not key.startswith(b'x-')} ==
+                {key: value for key, value in headers.items() if not key.startswith(b'x-')},
+                "and the same headers")
+
+    status, _, body = call('GET', [('if-none-match', headers[b'etag'].decode())])
+    ok &= check(status == 304 and body == b'', "a matching ETag gets a 304 without a body")
+    return ok
+
+
+def test_head():
+    assert check_head()
+
+
+def main():
+    passed = check_head()
+    print("\nAll checks passed" if passed else "\nSome checks FAILED")
+    return 0 if passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
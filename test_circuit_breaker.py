@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Test script for the per-event circuit breakers
+
+Checks that:
+- a breaker opens after FAILURE_THRESHOLD failures (or at once with trip_now)
+- an open breaker refuses checks until its open period has passed
+- half-open lets exactly one probe through, even with many threads asking
+- a probe's success closes the breaker; its failure re-opens it for twice as long
+- a probe that never reports back is given up on after another open period
+- a new URL resets the event's breaker
+
+Usage:
+    python test_circuit_breaker.py
+    python -m pytest test_circuit_breaker.py
+"""
+import sys
+import threading
+
+from circuit_breaker import (
+    CLOSED, HALF_OPEN, OPEN, BreakerRegistry, CircuitBreaker, is_check_failure,
+)
+
+URL = 'https://choli.ticketera.com/event/july-12'
+
+
+def check(condition, message):
+    print(f"  {'PASS' if condition else 'FAIL'}: {message}")
+    return condition
+
+
+def tripped(now=0, open_seconds=300, max_open_seconds=3600):
+    breaker = CircuitBreaker(URL, failure_threshold=3, open_seconds=open_seconds,
+                             max_open_seconds=max_open_seconds)
+    for _ in range(3):
+        breaker.record(False, now, 'HTTP 503')
+    return breaker
+
+
+def check_opening():
+    print("\n== opening ==")
+    breaker = CircuitBreaker(URL, failure_threshold=3)
+    opened = [breaker.record(False, 0, 'HTTP 503') for _ in range(3)]
+    ok = check(opened == [False, False, True], "opens on the third failure in a row")
+    ok &= check(breaker.state == OPEN and not breaker.allow(299), "open breaker refuses checks")
+
+    breaker = CircuitBreaker(URL, failure_threshold=3)
+    breaker.record(False, 0)
+    breaker.record(True, 1)
+    breaker.record(False, 2)
+    ok &= check(breaker.state == CLOSED and breaker.failures == 1, "a success resets the failure count")
+
+    breaker = CircuitBreaker(URL)
+    ok &= check(breaker.record(False, 0, 'placeholder', trip_now=True), "trip_now opens at once")
+    ok &= check(is_check_failure('🚫 Access Blocked - Using Cached Status') and
+                not is_check_failure('❌ Sold Out'), "only failed checks count as failures")
+    return ok
+
+
+def check_single_probe():
+    print("\n== half-open probe ==")
+    breaker = tripped()
+    ok = check(breaker.allow(300), "the probe is allowed once the open period has passed")
+    ok &= check(breaker.state == HALF_OPEN, "the breaker is half-open")
+    ok &= check(not breaker.allow(301) and not breaker.allow(302), "no second check while the probe is out")
+    ok &= check(breaker.describe(301)['probeInFlight'], "the probe is reported as in flight")
+
+    breaker.record(True, 305)
+    ok &= check(breaker.state == CLOSED and breaker.allow(306) and breaker.allow(306),
+                "a successful probe closes the breaker for everyone")
+
+    breaker = tripped()
+    breaker.allow(300)
+    ok &= check(breaker.record(False, 305, 'HTTP 503'), "a failed probe re-opens the breaker")
+    ok &= check(breaker.open_seconds == 600 and not breaker.allow(904) and breaker.allow(905),
+                "and keeps it open twice as long")
+
+    breaker = tripped(open_seconds=2000, max_open_seconds=3600)
+    breaker.allow(2000)
+    breaker.record(False, 2000)
+    ok &= check(breaker.open_seconds == 3600, "the open period is capped at max_open_seconds")
+    return ok
+
+
+def check_lost_probe():
+    print("\n== lost probe ==")
+    breaker = tripped()
+    breaker.allow(300)
+    ok = check(not breaker.allow(599), "a silent probe blocks others during one open period")
+    ok &= check(breaker.allow(600), "then another probe is allowed")
+    ok &= check(not breaker.allow(601), "and only one")
+    return ok
+
+
+def check_concurrent_callers():
+    print("\n== concurrent callers ==")
+    registry = BreakerRegistry(failure_threshold=1, open_seconds=10)
+    registry.record('july-12', URL, False, now=0)
+    barrier = threading.Barrier(16)
+    allowed = []
+
+    def ask():
+        barrier.wait()
+        allowed.append(registry.allow('july-12', URL, now=10))
+
+    threads = [threading.Thread(target=ask) for _ in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    ok = check(allowed.count(True) == 1, "exactly one of 16 threads gets the probe")
+
+    registry.allow('july-12', 'https://choli.ticketera.com/event/new', now=11)
+    ok &= check(registry.state('july-12') == CLOSED, "a new URL resets the breaker")
+    return ok
+
+
+def test_opening():
+    assert check_opening()
+
+
+def test_single_probe():
+    assert check_single_probe()
+
+
+def test_lost_probe():
+    assert check_lost_probe()
+
+
+def test_concurrent_callers():
+    assert check_concurrent_callers()
+
+
+def main():
+    passed = check_opening()
+    passed &= check_single_probe()
+    passed &= check_lost_probe()
+    passed &= check_concurrent_callers()
+    print("\nAll checks passed" if passed else "\nSome checks FAILED")
+    return 0 if passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Test script for the compact /api/tickets encodings
+
+Checks that:
+- compacting a snapshot, encoding, decoding and expanding it gives back the
+  original snapshot, in MessagePack and CBOR
+- negotiate only picks a compact type the client names above JSON, and never
+  one whose library is missing
+- the event dictionary is sent when the client's X-Event-Dictionary is absent
+  or stale, left out when it matches, and refreshed when an event's URL changes
+- GET /api/tickets serves the negotiated encoding with distinct ETags for
+  payloads with and without the dictionary
+
+Usage:
+    python test_compact_status.py
+    python -m pytest test_compact_status.py
+"""
+import os
+import sys
+
+from werkzeug.datastructures import MIMEAccept
+from werkzeug.http import parse_accept_header
+
+import compact_status
+from compact_status import CBOR_TYPE, compact_snapshot, decode, encode, expand, negotiate
+
+os.environ.setdefault('HISTORY_DB_PATH', ':memory:')
+
+MSGPACK = 'application/msgpack'
+
+
+def check(condition, message):
+    print(f"  {'PASS' if condition else 'FAIL'}: {message}")
+    return condition
+
+
+def sample_snapshot():
+    statuses = {
+        'august-8': "❌ Sold Out",
+        'july-12': "🔥 TICKETS AVAILABLE! 12 tickets in stock 🔥",
+        'july-18': "⚡ Not Yet Available",
+        'july-19': "Something new on the page",
+    }
+    return {
+        event_id: {'name': f"Bad Bunny - {event_id}", 'date': event_id, 'status': status,
+                   'url': f"https://choli.ticketera.com/event/{event_id}", 'lastChecked': '14:03:11'}
+        for event_id, status in statuses.items()
+    }
+
+
+def check_round_trip():
+    print("\n== round trip ==")
+    snapshot = sample_snapshot()
+    ok = True
+    for media_type in (MSGPACK, 'application/x-msgpack', CBOR_TYPE):
+        payload = decode(encode(compact_snapshot(snapshot, 7), media_type), media_type)
+        ok &= check(payload['v'] == 7 and expand(payload, None) == snapshot, f"{media_type}: snapshot restored")
+
+    full = compact_snapshot(snapshot, 7)
+    rows = dict(zip((event[0] for event in full['events']), full['s']))
+    ok &= check(rows['august-8'] == [2, '14:03:11'], "canonical statuses carry only their code")
+    ok &= check(rows['july-12'][0] == 5 and len(rows['july-12']) == 3, "variable statuses keep their text")
+    ok &= check(rows['july-19'][0] == 255, "unknown statuses map to Other")
+
+    lean = compact_snapshot(snapshot, 8, full['d'])
+    ok &= check(expand(decode(encode(lean, MSGPACK), MSGPACK), full) == snapshot,
+                "a payload without the dictionary expands with the cached one")
+    return ok
+
+
+def accept(header):
+    return parse_accept_header(header, MIMEAccept)
+
+
+def check_negotiate():
+    print("\n== negotiate ==")
+    cases = [
+        ('', None),
+        ('*/*', None),
+        ('application/json', None),
+        ('text/html', None),
+        ('application/msgpack', MSGPACK),
+        ('application/x-msgpack', 'application/x-msgpack'),
+        ('application/cbor', CBOR_TYPE),
+        ('application/json, application/msgpack', None),
+        ('application/json;q=0.5, application/msgpack', MSGPACK),
+        ('application/json, application/cbor;q=0.9', None),
+        ('application/json;q=0.1, application/cbor;q=0.2, */*;q=0.05', CBOR_TYPE),
+        ('application/msgpack;q=0', None),
+    ]
+    ok = True
+    for header, expected in cases:
+        ok &= check(negotiate(accept(header)) == expected, f"{header or '(none)'!r} -> {expected}")
+
+    saved = compact_status.msgpack
+    compact_status.msgpack = None
+    try:
+        ok &= check(negotiate(accept('application/msgpack')) is None, "msgpack not offered without the library")
+        ok &= check(negotiate(accept('application/msgpack, application/cbor;q=0.8')) == CBOR_TYPE,
+                    "the next compact type is used instead")
+    finally:
+        compact_status.msgpack = saved
+    return ok
+
+
+def check_dictionary():
+    print("\n== event dictionary ==")
+    snapshot = sample_snapshot()
+    full = compact_snapshot(snapshot, 1)
+    ok = check('events' in full and 'codes' in full, "sent when the client has none")
+    ok &= check('events' not in compact_snapshot(snapshot, 2, full['d']), "left out when the client's matches")
+    stale = compact_snapshot(snapshot, 2, 'feedfacecafe')
+    ok &= check('events' in stale and stale['d'] == full['d'], "sent again when the client's is stale")
+
+    snapshot['july-12']['status'] = "❌ Sold Out"
+    snapshot['july-12']['lastChecked'] = '14:04:00'
+    ok &= check(compact_snapshot(snapshot, 3)['d'] == full['d'], "status changes keep the dictionary")
+
+    snapshot['july-12']['url'] = "https://choli.ticketera.com/event/july-12-new"
+    refreshed = compact_snapshot(snapshot, 4, full['d'])
+    ok &= check(refreshed['d'] != full['d'] and 'events' in refreshed, "a URL change refreshes it")
+    ok &= check(expand(refreshed, full)['july-12']['url'].endswith('july-12-new'), "with the new URL")
+    return ok
+
+
+def check_endpoint():
+    print("\n== GET /api/tickets ==")
+    import app as monitor
+
+    saved = monitor.INLINE_SWEEPS
+    monitor.INLINE_SWEEPS = False  # Serve the snapshot without sweeping
+    try:
+        monitor.ensure_all_dates_exist()
+        client = monitor.app.test_client()
+        response = client.get('/api/tickets', headers={'Accept': MSGPACK})
+        full = decode(response.data, MSGPACK)
+        ok = check(response.mimetype == MSGPACK and 'events' in full, "first poll carries the dictionary")
+        ok &= check(expand(full, None) == monitor.ticket_status, "and expands to the JSON snapshot")
+        ok &= check('X-Event-Dictionary' in response.headers['Vary'], "responses vary on the dictionary")
+
+        headers = {'Accept': MSGPACK, 'X-Event-Dictionary': full['d']}
+        lean = client.get('/api/tickets', headers=headers)
+        ok &= check('events' not in decode(lean.data, MSGPACK), "later polls leave it out")
+        ok &= check(lean.headers['ETag'] != response.headers['ETag'], "with a different ETag")
+        ok &= check(client.get('/api/tickets', headers={**headers, 'If-None-Match': lean.headers['ETag']})
+                    .status_code == 304, "and revalidate")
+
+        stale = client.get('/api/tickets', headers={'Accept': MSGPACK, 'X-Event-Dictionary': 'feedfacecafe',
+                                                    'If-None-Match': lean.headers['ETag']})
+        ok &= check(stale.status_code == 200 and 'events' in decode(stale.data, MSGPACK),
+                    "a stale dictionary gets the full payload, not a 304")
+        ok &= check(client.get('/api/tickets').mimetype == 'application/json', "JSON by default")
+    finally:
+        monitor.INLINE_SWEEPS = saved
+    return ok
+
+
+def test_round_trip():
+    assert check_round_trip()
+
+
+def test_negotiate():
+    assert check_negotiate()
+
+
+def test_dictionary():
+    assert check_dictionary()
+
+
+def test_endpoint():
+    assert check_endpoint()
+
+
+def main():
+    passed = check_round_trip()
+    passed &= check_negotiate()
+    passed &= check_dictionary()
+    passed &= check_endpoint()
+    print("\nAll checks passed" if passed else "\nSome checks FAILED")
+    return 0 if passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Test script for the health and readiness probes
+
+Checks that, with inline sweeps and with the ASGI check engine alike:
+- /readyz is ready while the last sweep is within READY_SWEEP_INTERVALS
+  check intervals, and fails once it is older
+- the limit follows CHECK_INTERVAL when the config changes it
+- a fresh process is 'starting' for one window, then fails without a sweep
+- a hung sweep fails both /healthz and /readyz
+
+Usage:
+    python test_health.py
+    python -m pytest test_health.py
+"""
+import os
+import sys
+
+os.environ.setdefault('HISTORY_DB_PATH', ':memory:')
+
+
+def check(condition, message):
+    print(f"  {'PASS' if condition else 'FAIL'}: {message}")
+    return condition
+
+
+def check_readiness():
+    print("\n== /readyz ==")
+    import app as monitor
+
+    names = ('monitor_clock', 'monitor_started', 'last_sweep_started', 'last_sweep_finished',
+             'CHECK_INTERVAL', 'READY_SWEEP_INTERVALS', 'INLINE_SWEEPS')
+    saved = {name: getattr(monitor, name) for name in names}
+    now = 1_000_000.0
+    monitor.monitor_clock = lambda: now
+    monitor.CHECK_INTERVAL = 60
+    monitor.READY_SWEEP_INTERVALS = 10
+    client = monitor.app.test_client()
+
+    def ready(started_ago, finished_ago, uptime=10_000):
+        monitor.monitor_started = now - uptime
+        monitor.last_sweep_started = now - started_ago if started_ago is not None else None
+        monitor.last_sweep_finished = now - finished_ago if finished_ago is not None else None
+        response = client.get('/readyz')
+        return response.status_code, response.get_json()['status']
+
+    ok = True
+    try:
+        for inline in (True, False):
+            mode = 'inline' if inline else 'engine'
+            monitor.INLINE_SWEEPS = inline
+            ok &= check(ready(70, 60) == (200, 'ok'), f"{mode}: a recent sweep is ready")
+            ok &= check(ready(610, 600) == (200, 'ok'), f"{mode}: ready up to 10 check intervals")
+            ok &= check(ready(611, 601) == (503, 'checking stalled'), f"{mode}: not ready after that")
+            ok &= check(client.get('/readyz').get_json()['checksStale'], f"{mode}: and reported stale")
+            ok &= check(ready(None, None, uptime=300) == (200, 'starting'), f"{mode}: a fresh process is starting")
+            ok &= check(ready(None, None, uptime=601) == (503, 'no sweep completed'),
+                        f"{mode}: and fails without a first sweep")
+            ok &= check(ready(601, 1200) == (503, 'sweep stalled'), f"{mode}: a hung sweep is not ready")
+            ok &= check(client.get('/healthz').status_code == 503, f"{mode}: nor live")
+
+        monitor.CHECK_INTERVAL = 120
+        ok &= check(ready(1000, 900) == (200, 'ok'), "a longer CHECK_INTERVAL raises the limit")
+        ok &= check(client.get('/readyz').get_json()['maxSweepAge'] == 1200, "the limit is reported")
+    finally:
+        for name, value in saved.items():
+            setattr(monitor, name, value)
+    return ok
+
+
+def test_readiness():
+    assert check_readiness()
+
+
+def main():
+    passed = check_readiness()
+    print("\nAll checks passed" if passed else "\nSome checks FAILED")
+    return 0 if passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
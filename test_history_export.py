@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Test script for history exports
+
+Checks that:
+- iter_checks returns the same rows in (event, time) order whatever the batch
+  size, including checks that share a timestamp across a batch boundary
+- its event and time filters select the right rows
+- GET /api/history/export streams CSV and NDJSON, keeps only status changes
+  with changes=1, and refuses unknown formats and events
+- the encoder flushes in chunks instead of building the whole export
+
+Usage:
+    python test_history_export.py
+    python -m pytest test_history_export.py
+"""
+import os
+import csv
+import sys
+import json
+
+os.environ.setdefault('HISTORY_DB_PATH', ':memory:')
+
+from history_store import HistoryStore
+
+SOLD_OUT = '❌ Sold Out'
+AVAILABLE = '🔥 TICKETS AVAILABLE! CHECK NOW 🔥'
+
+
+def check(condition, message):
+    print(f"  {'PASS' if condition else 'FAIL'}: {message}")
+    return condition
+
+
+def sample_history():
+    """Three events; july-12 flips status and has two checks at t=3"""
+    history = HistoryStore(':memory:')
+    checks = [
+        ('july-18', 1, SOLD_OUT), ('july-12', 1, SOLD_OUT), ('july-12', 2, SOLD_OUT),
+        ('july-12', 3, AVAILABLE), ('july-12', 3, AVAILABLE), ('august-8', 2, SOLD_OUT),
+        ('july-12', 4, SOLD_OUT), ('july-18', 5, SOLD_OUT),
+    ]
+    for event_id, checked_at, status in checks:
+        history.record_check(event_id, status, f"https://example.test/{event_id}", checked_at)
+    return history
+
+
+def keys(rows):
+    return [(row['event_id'], row['checked_at'], row['status']) for row in rows]
+
+
+def check_iter_checks():
+    print("\n== iter_checks ==")
+    history = sample_history()
+    everything = keys(history.iter_checks(batch_size=1000))
+    ok = check(len(everything) == 8, "every row exported")
+    ok &= check(everything == sorted(everything, key=lambda row: (row[0], row[1])), "ordered by event, then time")
+    ok &= check(all(keys(history.iter_checks(batch_size=size)) == everything for size in (1, 2, 3, 7)),
+                "batch size never changes the rows, even across shared timestamps")
+
+    july = keys(history.iter_checks(['july-12'], batch_size=2))
+    ok &= check([row[1] for row in july] == [1, 2, 3, 3, 4], "event filter")
+    window = keys(history.iter_checks(since=2, until=4, batch_size=2))
+    ok &= check(window == [('august-8', 2, SOLD_OUT), ('july-12', 2, SOLD_OUT),
+                           ('july-12', 3, AVAILABLE), ('july-12', 3, AVAILABLE)],
+                "since is inclusive, until exclusive")
+
+    rows = history.iter_checks(batch_size=2)
+    first = next(rows)
+    history.record_check('july-18', SOLD_OUT, None, 9)
+    rest = keys(rows)
+    ok &= check(first['event_id'] == 'august-8' and len(rest) == 8 and rest[-1] == ('july-18', 9, SOLD_OUT),
+                "a check written ahead of a running export's position is included")
+    history.close()
+    return ok
+
+
+def check_endpoint():
+    print("\n== GET /api/history/export ==")
+    import app as monitor
+
+    saved = monitor.history
+    monitor.history = sample_history()
+    try:
+        client = monitor.app.test_client()
+        response = client.get('/api/history/export')
+        rows = list(csv.DictReader(response.get_data(as_text=True).splitlines()))
+        ok = check(response.status_code == 200 and response.mimetype == 'text/csv', "CSV by default")
+        ok &= check(len(rows) == 8 and list(rows[0]) == list(monitor.EXPORT_FIELDS), "CSV header and rows")
+        ok &= check(response.headers['Content-Disposition'] == 'attachment; filename="history.csv"',
+                    "served as a download")
+
+        response = client.get('/api/history/export?format=ndjson&events=july-12&changes=1')
+        rows = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+        ok &= check(response.mimetype == 'application/x-ndjson', "NDJSON on request")
+        ok &= check([(row['checked_at'], row['status']) for row in rows] ==
+                    [(1, SOLD_OUT), (3, AVAILABLE), (4, SOLD_OUT)], "changes=1 keeps only status changes")
+        ok &= check(rows[0]['time'].startswith('1970-01-01T00:00:01') and rows[0]['truncated'] is False,
+                    "rows carry an ISO time and the truncation flag")
+
+        response = client.get('/api/history/export?format=ndjson&since=5')
+        ok &= check(len(response.get_data(as_text=True).splitlines()) == 1, "time filters apply")
+        ok &= check(client.get('/api/history/export?format=xml').status_code == 400, "unknown format refused")
+        ok &= check(client.get('/api/history/export?events=july-12,december-1').status_code == 400,
+                    "unknown events refused")
+    finally:
+        monitor.history.close()
+        monitor.history = saved
+    return ok
+
+
+def check_chunking():
+    print("\n== chunked encoding ==")
+    import app as monitor
+
+    saved = monitor.EXPORT_FLUSH_BYTES
+    monitor.EXPORT_FLUSH_BYTES = 200
+    history = sample_history()
+    saved_history, monitor.history = monitor.history, history
+    try:
+        chunks = list(monitor.export_chunks(monitor.export_rows(None, None, None, False), 'ndjson'))
+        ok = check(len(chunks) > 2, f"export flushed in {len(chunks)} chunks")
+        ok &= check(all(len(chunk.encode()) < 200 + 300 for chunk in chunks), "no chunk grows far past the flush size")
+        ok &= check(len(''.join(chunks).splitlines()) == 8, "chunks add up to the whole export")
+    finally:
+        monitor.EXPORT_FLUSH_BYTES = saved
+        monitor.history = saved_history
+        history.close()
+    return ok
+
+
+def test_iter_checks():
+    assert check_iter_checks()
+
+
+def test_endpoint():
+    assert check_endpoint()
+
+
+def test_chunking():
+    assert check_chunking()
+
+
+def main():
+    passed = check_iter_checks()
+    passed &= check_endpoint()
+    passed &= check_chunking()
+    print("\nAll checks passed" if passed else "\nSome checks FAILED")
+    return 0 if passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Test script for the inline-script inventory scanner
+
+Checks that:
+- quoted ("key", 'key') and bare keys are read, mismatched quotes are not
+- a key inside a longer identifier (stock in inStock) is not a match
+- non-numeric values are skipped in favour of a later numeric occurrence
+- keys used in expressions (a ternary, a switch case) are not properties
+- higher-priority fields win, and pages without inventory give None
+
+Usage:
+    python test_inventory_scan.py
+    python -m pytest test_inventory_scan.py
+"""
+import sys
+
+from inventory_scan import _property_value_pos, extract_inventory_count, scan_inventory
+
+
+def check(condition, message):
+    print(f"  {'PASS' if condition else 'FAIL'}: {message}")
+    return condition
+
+
+def value_pos(text, key='stock'):
+    return _property_value_pos(text, text.find(key), len(key))
+
+
+def check_keys():
+    print("\n== keys ==")
+    ok = check(scan_inventory('{"stock": 12}') == ('stock', 12), "double-quoted key")
+    ok &= check(scan_inventory("{'stock':12}") == ('stock', 12), "single-quoted key")
+    ok &= check(scan_inventory('{stock : 12}') == ('stock', 12), "bare key")
+    ok &= check(scan_inventory('{a: 1,\n  stock:\n 12}') == ('stock', 12), "whitespace around the member")
+    ok &= check(scan_inventory('{"stock\': 12}') is None, "mismatched quotes")
+    ok &= check(value_pos('{"stock": 1}') == len('{"stock": '), "value position after a quoted key")
+    ok &= check(value_pos('{stock 1}') is None, "a key needs a colon")
+    return ok
+
+
+def check_substrings():
+    print("\n== longer identifiers ==")
+    ok = check(scan_inventory('{inStock: 1, stockLimit: 2}') is None, "stock inside inStock and stockLimit")
+    ok &= check(scan_inventory('{inStock: true, stock: 4}') == ('stock', 4), "the real key further on")
+    ok &= check(scan_inventory('{$stock: 1, stock_: 2}') is None, "$ and _ are identifier characters")
+    ok &= check(scan_inventory('{"inStock": 1}') is None, "quoted longer key")
+    return ok
+
+
+def check_values():
+    print("\n== values ==")
+    ok = True
+    for literal in ('true', 'null', '"many"', "''", '{}', '[3]', 'count', '"1,200"'):
+        ok &= check(scan_inventory(f'{{stock: {literal}}}') is None, f"{literal} is not a count")
+    ok &= check(scan_inventory('{stock: null, x: {stock: "7"}}') == ('stock', '7'),
+                "a non-numeric value is skipped for a later numeric one")
+    ok &= check(scan_inventory("{stock: ' 3 '}") == ('stock', '3'), "numeric strings are stripped")
+    ok &= check(scan_inventory('{stock: -1}') == ('stock', -1), "negative integer")
+    ok &= check(scan_inventory('{stock: 2.5e1}') == ('stock', 25.0), "float")
+    return ok
+
+
+def check_expressions():
+    print("\n== expressions ==")
+    ok = check(scan_inventory('var n = ok ? stock : 0;') is None, "ternary with a bare key")
+    ok &= check(scan_inventory('var n = ok ? "stock" : 0;') is None, "ternary with a string")
+    ok &= check(scan_inventory('switch (k) { case stock: 5 }') is None, "switch case")
+    ok &= check(scan_inventory('stock: for (;;) {}') is None, "label at the start of a script")
+    ok &= check(scan_inventory('var n = ok ? stock : 0; var s = {stock: 9};') == ('stock', 9),
+                "an object member after an expression")
+    ok &= check(scan_inventory('[{stock: 1}, {stock: 2}]') == ('stock', 1), "first member in an array")
+    return ok
+
+
+def check_pages():
+    print("\n== pages ==")
+    ok = check(scan_inventory('{stock: 1, ticketsAvailable: 40}') == ('ticketsAvailable', 40),
+               "higher-priority field wins")
+    ok &= check(scan_inventory('') is None and scan_inventory(None) is None, "empty script")
+    ok &= check(scan_inventory('window.dataLayer = [{page: "event"}];') is None, "script without inventory")
+    ok &= check(extract_inventory_count([]) is None, "page without scripts")
+    ok &= check(extract_inventory_count(['var x = {stock: 5};']) is None,
+                "scripts without an inventory marker are not scanned")
+    ok &= check(extract_inventory_count(['', 'var ticketsAvailable = 0;', '{"ticketsAvailable": 3}']) == 3,
+                "first script with a count")
+    return ok
+
+
+def test_keys():
+    assert check_keys()
+
+
+def test_substrings():
+    assert check_substrings()
+
+
+def test_values():
+    assert check_values()
+
+
+def test_expressions():
+    assert check_expressions()
+
+
+def test_pages():
+    assert check_pages()
+
+
+def main():
+    passed = check_keys()
+    passed &= check_substrings()
+    passed &= check_values()
+    passed &= check_expressions()
+    passed &= check_pages()
+    print("\nAll checks passed" if passed else "\nSome checks FAILED")
+    return 0 if passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Test script for event retirement and the history store
+
+Checks that:
+- past dates retire events only when a tour year is set, after the grace days
+- future dates, and the concert day itself, keep events active
+- the sold-out rule retires events after sold_out_seconds, and a status
+  change restarts its clock
+- retire_finished_events takes retired events, including ones another worker
+  archived, out of the snapshot and of _select_sweep_events
+- HistoryStore records and queries checks in a WAL database file, readable
+  from a second connection as gunicorn workers do
+
+Usage:
+    python test_lifecycle.py
+    python -m pytest test_lifecycle.py
+"""
+import os
+import sys
+import sqlite3
+import tempfile
+from datetime import datetime, timedelta
+
+from history_store import HistoryStore
+from lifecycle import LifecycleManager, event_date
+
+os.environ.setdefault('HISTORY_DB_PATH', ':memory:')
+
+SOLD_OUT = '❌ Sold Out'
+AVAILABLE = '🔥 TICKETS AVAILABLE! CHECK NOW 🔥'
+
+
+def check(condition, message):
+    print(f"  {'PASS' if condition else 'FAIL'}: {message}")
+    return condition
+
+
+def noon(day):
+    """Timestamp for midday local time on a date"""
+    return datetime(day.year, day.month, day.day, 12).timestamp()
+
+
+def check_dates():
+    print("\n== dates ==")
+    concert = event_date('july-12', 2025)
+    after = noon(concert + timedelta(days=1))
+    ok = check(LifecycleManager(year=None).retirement_reason('july-12', None, noon(concert + timedelta(days=400)))
+               is None, "no tour year: dates never retire events")
+    manager = LifecycleManager(year=2025, grace_days=1)
+    ok &= check(manager.retirement_reason('july-12', None, after) == 'date passed', "a past date retires")
+    ok &= check(manager.retirement_reason('july-12', None, noon(concert)) is None, "the concert day is kept")
+    ok &= check(manager.retirement_reason('july-18', AVAILABLE, after) is None, "a future date is kept")
+    ok &= check(LifecycleManager(year=2025, grace_days=3).retirement_reason('july-12', None, after) is None,
+                "grace days delay retirement")
+    ok &= check(LifecycleManager(year=2026).retirement_reason('july-12', None, after) is None,
+                "the tour year decides which dates are past")
+    return ok
+
+
+def check_sold_out():
+    print("\n== sold out ==")
+    manager = LifecycleManager(sold_out_seconds=100)
+    ok = check(manager.retirement_reason('july-12', SOLD_OUT, 1000) is None, "first sold-out sighting starts the clock")
+    ok &= check(manager.retirement_reason('july-12', SOLD_OUT, 1099) is None, "kept before sold_out_seconds")
+    ok &= check(manager.retirement_reason('july-12', AVAILABLE, 1100) is None, "a status change resets the clock")
+    ok &= check(manager.retirement_reason('july-12', SOLD_OUT, 1150) is None and
+                manager.retirement_reason('july-12', SOLD_OUT, 1250) == 'sold out', "retired once sold out long enough")
+    ok &= check(manager.retirement_reason('july-18', None, 5000) is None, "no confirmed status keeps the event")
+    keep = LifecycleManager(sold_out_seconds=0)
+    ok &= check(keep.retirement_reason('july-12', SOLD_OUT, 0) is None and
+                keep.retirement_reason('july-12', SOLD_OUT, 10 ** 9) is None, "sold_out_seconds=0 keeps events")
+    return ok
+
+
+def check_sweep_selection():
+    print("\n== retire_finished_events ==")
+    import app as monitor
+
+    names = ('lifecycle', 'history', 'monitor_clock', 'MAX_DATES_PER_CHECK', 'snapshot_version')
+    saved = {name: getattr(monitor, name) for name in names}
+    saved_status = dict(monitor.ticket_status)
+    saved_updates = dict(monitor.last_update_time)
+    saved_archived = set(monitor.archived_event_ids)
+
+    event_ids = sorted(monitor.BAD_BUNNY_EVENT_IDS, key=lambda event_id: event_date(event_id, 2025))
+    cutoff = event_date(event_ids[len(event_ids) // 2], 2025)
+    past = {event_id for event_id in event_ids if event_date(event_id, 2025) <= cutoff}
+    other_worker = event_ids[-1]
+    with tempfile.TemporaryDirectory() as tmp:
+        try:
+            monitor.history = HistoryStore(os.path.join(tmp, 'history.db'))
+            monitor.lifecycle = LifecycleManager(year=2025, sold_out_seconds=0)
+            monitor.monitor_clock = lambda: noon(cutoff + timedelta(days=1))
+            monitor.MAX_DATES_PER_CHECK = len(event_ids)
+            monitor.archived_event_ids.clear()
+            monitor.ensure_all_dates_exist()
+            monitor.history.archive(other_worker, {'url': 'https://example.test'}, 'date passed', 0)
+            version = monitor.snapshot_version
+
+            monitor.retire_finished_events()
+            retired = past | {other_worker}
+            ok = check(monitor.archived_event_ids == retired, f"{len(past)} past events and one from another worker retired")
+            ok &= check(not retired & set(monitor.ticket_status), "retired events leave the snapshot")
+            ok &= check(monitor.snapshot_version == version + 1, "as a new snapshot version")
+            selected = {event_id for event_id, _ in monitor._select_sweep_events()}
+            ok &= check(selected == set(event_ids) - retired, "and are no longer selected for sweeps")
+            ok &= check(set(monitor.history.archived()) == retired, "their final state is in the history store")
+
+            monitor.retire_finished_events()
+            ok &= check(monitor.snapshot_version == version + 1, "a sweep with nothing to retire keeps the version")
+        finally:
+            monitor.history.close()
+            for name, value in saved.items():
+                setattr(monitor, name, value)
+            monitor.ticket_status.clear()
+            monitor.ticket_status.update(saved_status)
+            monitor.last_update_time.clear()
+            monitor.last_update_time.update(saved_updates)
+            monitor.archived_event_ids.clear()
+            monitor.archived_event_ids.update(saved_archived)
+    return ok
+
+
+def check_history_store():
+    print("\n== HistoryStore ==")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'history.db')
+        history = HistoryStore(path)
+        for checked_at, status in [(1, SOLD_OUT), (2, SOLD_OUT), (3, AVAILABLE)]:
+            history.record_check('july-12', status, 'https://example.test/july-12', checked_at,
+                                 page_hash='abc' if checked_at == 3 else None, truncated=checked_at == 2)
+        history.record_check('july-18', SOLD_OUT, None, 2)
+
+        rows = history.checks('july-12')
+        ok = check([row['checked_at'] for row in rows] == [3, 2, 1], "checks come back newest first")
+        ok &= check(rows[0] == {'checked_at': 3, 'status': AVAILABLE, 'url': 'https://example.test/july-12',
+                                'page_hash': 'abc', 'truncated': False}, "with every recorded field")
+        ok &= check(rows[1]['truncated'] is True, "truncation read back as a bool")
+        ok &= check([row['checked_at'] for row in history.checks('july-12', since=2, until=3)] == [2],
+                    "since is inclusive, until exclusive")
+        ok &= check(len(history.checks('july-12', limit=1)) == 1, "limit")
+
+        history.archive('july-12', {'name': 'Bad Bunny', 'status': AVAILABLE}, 'date passed', 10)
+        history.archive('july-12', {'name': 'Bad Bunny', 'status': SOLD_OUT}, 'sold out', 20)
+        ok &= check(history.archived()['july-12']['reason'] == 'date passed', "archiving twice keeps the first record")
+
+        other = HistoryStore(path)
+        ok &= check(other.checks('july-18')[0]['status'] == SOLD_OUT and other.archived_ids() == {'july-12'},
+                    "a second connection sees the rows")
+        other.close()
+        history.close()
+
+        db = sqlite3.connect(path)
+        ok &= check(db.execute('PRAGMA journal_mode').fetchone()[0] == 'wal', "the file is in WAL mode")
+        db.close()
+    return ok
+
+
+def test_dates():
+    assert check_dates()
+
+
+def test_sold_out():
+    assert check_sold_out()
+
+
+def test_sweep_selection():
+    assert check_sweep_selection()
+
+
+def test_history_store():
+    assert check_history_store()
+
+
+def main():
+    passed = check_dates()
+    passed &= check_sold_out()
+    passed &= check_sweep_selection()
+    passed &= check_history_store()
+    print("\nAll checks passed" if passed else "\nSome checks FAILED")
+    return 0 if passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Test script for the hot-reloadable monitor config
+
+Checks that:
+- validate_config refuses wrong types, out-of-range values, unknown settings,
+  unknown dates and non-http(s) URLs, and normalises valid values
+- ConfigWatcher applies a valid file, keeps the previous revision in force when
+  an edit is invalid, and goes back to the defaults when the file is removed
+- settings a revision leaves out fall back to CONFIG_DEFAULTS
+- a revision that changes event URLs publishes a new snapshot version, so
+  ETags and cached payloads do not keep the old links
+
+Usage:
+    python test_monitor_config.py
+    python -m pytest test_monitor_config.py
+"""
+import os
+import sys
+import json
+import tempfile
+import itertools
+
+from monitor_config import ConfigWatcher, config_hash, validate_config
+
+os.environ.setdefault('HISTORY_DB_PATH', ':memory:')
+
+KNOWN_DATES = {'July': ['12', '18'], 'August': ['8']}
+URL = 'https://choli.ticketera.com/event/bad-bunny-july-12'
+
+
+def check(condition, message):
+    print(f"  {'PASS' if condition else 'FAIL'}: {message}")
+    return condition
+
+
+def problems(data):
+    """Error message validate_config raises for data, or None if it is accepted"""
+    try:
+        validate_config(data, KNOWN_DATES)
+    except ValueError as e:
+        return str(e)
+    return None
+
+
+def check_settings():
+    print("\n== settings ==")
+    ok = True
+    for key, value in [('CHECK_INTERVAL', 4), ('CHECK_INTERVAL', 3601), ('MAX_DATES_PER_CHECK', 0),
+                       ('MAX_DATES_PER_CHECK', 101), ('JITTER_MAX', 0.5), ('JITTER_MAX', 301)]:
+        ok &= check('between' in (problems({key: value}) or ''), f"{key}={value} out of range")
+    for key, value in [('CHECK_INTERVAL', '15'), ('CHECK_INTERVAL', True), ('CHECK_INTERVAL', 15.5),
+                       ('MAX_DATES_PER_CHECK', None), ('JITTER_MAX', [10])]:
+        ok &= check('must be' in (problems({key: value}) or ''), f"{key}={value!r} wrong type")
+    ok &= check('unknown setting' in (problems({'CHECK_INTERVALS': 15}) or ''), "unknown setting refused")
+    ok &= check(problems([]) is not None, "a non-object file refused")
+
+    message = problems({'CHECK_INTERVAL': 1, 'JITTER_MAX': 'x'})
+    ok &= check('CHECK_INTERVAL' in message and 'JITTER_MAX' in message, "every problem is reported at once")
+
+    settings = validate_config({'CHECK_INTERVAL': 15.0, 'JITTER_MAX': 10, 'MAX_DATES_PER_CHECK': 3}, KNOWN_DATES)
+    ok &= check(settings == {'CHECK_INTERVAL': 15, 'JITTER_MAX': 10.0, 'MAX_DATES_PER_CHECK': 3} and
+                type(settings['CHECK_INTERVAL']) is int and type(settings['JITTER_MAX']) is float,
+                "valid values normalised to their types")
+    return ok
+
+
+def check_event_urls():
+    print("\n== event_urls ==")
+    ok = check('no event on July 13' in (problems({'event_urls': {'July': {'13': URL}}}) or ''),
+               "unknown day refused")
+    ok &= check('unknown month' in (problems({'event_urls': {'December': {'1': URL}}}) or ''),
+                "unknown month refused")
+    for url in ('ftp://choli.ticketera.com/x', 'javascript:alert(1)', 'choli.ticketera.com/x', 12):
+        ok &= check('http(s) URL' in (problems({'event_urls': {'July': {'12': url}}}) or ''),
+                    f"{url!r} refused")
+    ok &= check(problems({'event_urls': ['July']}) is not None, "event_urls must be an object")
+    settings = validate_config({'event_urls': {'July': {12: URL}}}, KNOWN_DATES)
+    ok &= check(settings == {'event_urls': {'July': {'12': URL}}}, "numeric days accepted as strings")
+    return ok
+
+
+def check_watcher():
+    print("\n== ConfigWatcher ==")
+    applied = []
+    revisions = itertools.count(1)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'monitor_config.json')
+
+        def write(content):
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(content)
+            # Same-size rewrites within one mtime tick must still be seen
+            stat = os.stat(path)
+            os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + next(revisions) * 1000))
+
+        watcher = ConfigWatcher(path, KNOWN_DATES, applied.append)
+        write(json.dumps({'CHECK_INTERVAL': 20}))
+        ok = check(watcher.check() and applied == [{'CHECK_INTERVAL': 20}] and watcher.version == 1,
+                   "a valid file is applied")
+        good_hash = watcher.hash
+
+        write(json.dumps({'CHECK_INTERVAL': 2}))
+        ok &= check(not watcher.check() and len(applied) == 1, "an out-of-range edit is not applied")
+        ok &= check(watcher.version == 1 and watcher.hash == good_hash, "the previous revision stays active")
+        ok &= check('CHECK_INTERVAL' in watcher.describe()['lastError'], "the rejection is reported")
+
+        write('{"CHECK_INTERVAL": 20,')
+        ok &= check(not watcher.check() and watcher.version == 1, "a half-written file is not applied")
+
+        write(json.dumps({'CHECK_INTERVAL': 20}, indent=2))
+        ok &= check(not watcher.check() and watcher.describe()['lastError'] is None,
+                    "fixing the file clears the error without a new version when nothing changed")
+
+        os.remove(path)
+        ok &= check(watcher.check() and applied[-1] == {} and watcher.version == 2 and
+                    watcher.hash == config_hash({}),
+                    "removing the file goes back to the defaults")
+    return ok
+
+
+def check_app_config():
+    print("\n== app.apply_monitor_config ==")
+    import app as monitor
+
+    saved = {name: getattr(monitor, name) for name in ('CHECK_INTERVAL', 'MAX_DATES_PER_CHECK', 'JITTER_MAX',
+                                                        'TICKETERA_URLS', 'INLINE_SWEEPS')}
+    month = next(iter(monitor.BAD_BUNNY_DATES))
+    day = monitor.BAD_BUNNY_DATES[month][0]
+    event_id = f"{month.lower()}-{day}"
+    new_url = f"https://choli.ticketera.com/event/new-{event_id}"
+    published = []
+    monitor.snapshot_listeners.append(lambda: published.append(monitor.snapshot_version))
+    monitor.INLINE_SWEEPS = False  # Serve the snapshot without sweeping
+    client = monitor.app.test_client()
+    try:
+        monitor.apply_monitor_config({})
+        monitor.ensure_all_dates_exist()
+        etag = client.get('/api/tickets').headers['ETag']
+        version = monitor.snapshot_version
+
+        monitor.apply_monitor_config({'CHECK_INTERVAL': 30, 'JITTER_MAX': 5.0})
+        ok = check(monitor.CHECK_INTERVAL == 30 and monitor.JITTER_MAX == 5.0, "settings applied")
+        ok &= check(monitor.snapshot_version == version and not published,
+                    "a revision that keeps the URLs keeps the snapshot version")
+
+        monitor.apply_monitor_config({'event_urls': {month: {day: new_url}}})
+        ok &= check(monitor.CHECK_INTERVAL == monitor.CONFIG_DEFAULTS['CHECK_INTERVAL'] and
+                    monitor.JITTER_MAX == monitor.CONFIG_DEFAULTS['JITTER_MAX'] and
+                    monitor.MAX_DATES_PER_CHECK == monitor.CONFIG_DEFAULTS['MAX_DATES_PER_CHECK'],
+                    "settings left out fall back to CONFIG_DEFAULTS")
+        ok &= check(monitor.ticket_status[event_id]['url'] == new_url, "the snapshot carries the new URL")
+        ok &= check(monitor.snapshot_version == version + 1 and published == [version + 1],
+                    "a URL change publishes a new snapshot version")
+        response = client.get('/api/tickets', headers={'If-None-Match': etag})
+        ok &= check(response.status_code == 200 and response.get_json()[event_id]['url'] == new_url,
+                    "clients holding the old ETag get the new links")
+    finally:
+        monitor.snapshot_listeners.clear()
+        monitor.apply_monitor_config({})
+        for name, value in saved.items():
+            setattr(monitor, name, value)
+    return ok
+
+
+def test_settings():
+    assert check_settings()
+
+
+def test_event_urls():
+    assert check_event_urls()
+
+
+def test_watcher():
+    assert check_watcher()
+
+
+def test_app_config():
+    assert check_app_config()
+
+
+def main():
+    passed = check_settings()
+    passed &= check_event_urls()
+    passed &= check_watcher()
+    passed &= check_app_config()
+    print("\nAll checks passed" if passed else "\nSome checks FAILED")
+    return 0 if passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Test script for the page archive
+
+Checks that:
+- a page stored twice is written once and loads back byte for byte
+- a duplicate hit refreshes the file's mtime
+- eviction removes the least recently seen pages, not ones still being served
+- a page evicted by another worker is written again on its next store
+
+Usage:
+    python test_page_archive.py
+    python -m pytest test_page_archive.py
+"""
+import os
+import sys
+import tempfile
+
+from page_archive import PageArchive, find_page, page_files
+
+LONG_AGO = 1_000_000_000  # 2001; any mtime well before the test runs
+
+
+def check(condition, message):
+    print(f"  {'PASS' if condition else 'FAIL'}: {message}")
+    return condition
+
+
+def page(n, size=4096):
+    """Incompressible-enough page body so sizes stay predictable"""
+    return os.urandom(size // 2).hex().encode() + f"<p>page {n}</p>".encode()
+
+
+def check_dedupe():
+    print("\n== dedupe and round trip ==")
+    with tempfile.TemporaryDirectory() as tmp:
+        archive = PageArchive(tmp)
+        body = page(1)
+        first = archive.store(body)
+        second = archive.store(body)
+        ok = check(first == second, "the same body gets the same hash")
+        ok &= check(len(page_files(tmp)) == 1, "the body is written once")
+        ok &= check(archive.stats['stored'] == 1 and archive.stats['duplicate'] == 1,
+                    "the second store is counted as a duplicate")
+        ok &= check(archive.load(first) == body, "the page loads back unchanged")
+        ok &= check(archive.load('0' * 64) is None and archive.load('../etc') is None,
+                    "unknown and malformed hashes load nothing")
+    return ok
+
+
+def check_duplicate_refreshes_mtime():
+    print("\n== duplicate hits ==")
+    with tempfile.TemporaryDirectory() as tmp:
+        archive = PageArchive(tmp)
+        body = page(1)
+        digest = archive.store(body)
+        path = find_page(tmp, digest)[1]
+        os.utime(path, (LONG_AGO, LONG_AGO))
+        archive.store(body)
+        ok = check(os.stat(path).st_mtime > LONG_AGO, "a duplicate hit marks the page as recently seen")
+    return ok
+
+
+def check_eviction():
+    print("\n== eviction ==")
+    with tempfile.TemporaryDirectory() as tmp:
+        archive = PageArchive(tmp, max_bytes=10 ** 9)
+        bodies = [page(n) for n in range(4)]
+        digests = [archive.store(body) for body in bodies]
+        for age, digest in enumerate(digests):
+            stamp = LONG_AGO + age
+            os.utime(find_page(tmp, digest)[1], (stamp, stamp))
+
+        # The oldest page is still being served: seeing it again must save it
+        archive.store(bodies[0])
+        size = archive.total_bytes // 4
+        archive.max_bytes = int(size * 4.5)
+        archive.store(page(4))
+
+        kept = [find_page(tmp, digest) is not None for digest in digests]
+        ok = check(kept[0], "a page refreshed by a duplicate hit survives eviction")
+        ok &= check(not kept[1], "the least recently seen page is evicted")
+        ok &= check(archive.total_bytes <= archive.max_bytes * 0.9, "the archive is back under 90% of its limit")
+        ok &= check(archive.stats['evicted'] >= 1, "evictions are counted")
+    return ok
+
+
+def check_store_after_other_worker_evicted():
+    print("\n== shared directory ==")
+    with tempfile.TemporaryDirectory() as tmp:
+        worker = PageArchive(tmp)
+        other_worker = PageArchive(tmp)
+        body = page(1)
+        digest = worker.store(body)
+        # The other worker evicts everything, e.g. after writing large pages
+        other_worker.max_bytes = 0
+        other_worker.evict()
+        ok = check(find_page(tmp, digest) is None, "the page was evicted by the other worker")
+        worker.store(body)
+        ok &= check(worker.load(digest) == body, "storing it again writes it back")
+        ok &= check(worker.stats['stored'] == 2, "the re-store counts as a write, not a duplicate")
+    return ok
+
+
+def test_dedupe():
+    assert check_dedupe()
+
+
+def test_duplicate_refreshes_mtime():
+    assert check_duplicate_refreshes_mtime()
+
+
+def test_eviction():
+    assert check_eviction()
+
+
+def test_store_after_other_worker_evicted():
+    assert check_store_after_other_worker_evicted()
+
+
+def main():
+    passed = check_dedupe()
+    passed &= check_duplicate_refreshes_mtime()
+    passed &= check_eviction()
+    passed &= check_store_after_other_worker_evicted()
+    print("\nAll checks passed" if passed else "\nSome checks FAILED")
+    return 0 if passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
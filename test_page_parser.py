@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Test script for the parser backends
+
+Checks that the soup and lxml backends:
+- give the classifier identical verdicts on the benchmark pages
+- answer each document question (links, scripts, element text, existence) alike
+- agree on awkward input: empty pages, XML declarations, partial class names,
+  script text inside a selected element
+- reject unknown backend names
+
+Usage:
+    python test_page_parser.py
+    python -m pytest test_page_parser.py
+"""
+import sys
+
+from bench_parsers import synthetic_pages
+from page_classifier import classify_ticketera_page
+from page_parser import LxmlDocument, SoupDocument, parser_backend
+
+EDGE_PAGES = {
+    'empty': "",
+    'whitespace': "   \n",
+    'xml-declaration': '<?xml version="1.0" encoding="utf-8"?><html><body><p>Agotado</p></body></html>',
+    'partial-class': "<div class='buy-button-disabled'>x</div><div class='queued'>y</div>",
+    'button-class': "<a class='buy-button'>not a button</a><button class='big buy-button'>Buy</button>",
+    'script-in-inventory': "<div data-stock='1'>12 left<script>var x = 99;</script><style>.a{}</style></div>",
+    'nested-inventory': "<div class='stock-level'>Only <b>3</b> left <span class='tickets-available'>!</span></div>",
+    'links': "<a href='/a'>a</a><a>no href</a><a href=''>empty</a><area href='/x'>",
+    'empty-script': "<script></script><script>var next = '/checkout/1';</script>",
+}
+
+
+def check(condition, message):
+    print(f"  {'PASS' if condition else 'FAIL'}: {message}")
+    return condition
+
+
+def answers(document_class, page_html):
+    document = document_class(page_html)
+    return {
+        'links': document.links(),
+        'scripts': [script or None for script in document.scripts()],
+        'texts': {name: document.texts(name) for name in ('inventory', 'buy_buttons', 'waitlist')},
+        'exists': {name: document.exists(name) for name in ('inventory', 'buy_buttons', 'waitlist')},
+    }
+
+
+def check_verdict_parity():
+    print("\n== verdicts ==")
+    ok = True
+    for name, page_html in {**synthetic_pages(), **EDGE_PAGES}.items():
+        soup = classify_ticketera_page(page_html, name, SoupDocument)
+        lxml = classify_ticketera_page(page_html, name, LxmlDocument)
+        ok &= check(soup == lxml, f"{name}: {soup[:40]}")
+    return ok
+
+
+def check_document_parity():
+    print("\n== document answers ==")
+    ok = True
+    for name, page_html in EDGE_PAGES.items():
+        soup = answers(SoupDocument, page_html)
+        lxml = answers(LxmlDocument, page_html)
+        ok &= check(soup == lxml, f"{name}: same answers")
+        if soup != lxml:
+            print(f"    soup {soup}\n    lxml {lxml}")
+    return ok
+
+
+def check_selectors():
+    print("\n== selectors ==")
+    ok = True
+    for document_class in (SoupDocument, LxmlDocument):
+        name = document_class.__name__
+        partial = document_class(EDGE_PAGES['partial-class'])
+        ok &= check(not partial.exists('buy_buttons') and not partial.exists('waitlist'),
+                    f"{name}: class names match whole words only")
+        buttons = document_class(EDGE_PAGES['button-class'])
+        ok &= check(buttons.texts('buy_buttons') == ['Buy'], f"{name}: buy-button must be a <button>")
+        inventory = document_class(EDGE_PAGES['script-in-inventory'])
+        ok &= check(inventory.texts('inventory') == ['12 left'], f"{name}: script and style text left out")
+    return ok
+
+
+def check_backend_names():
+    print("\n== backend names ==")
+    ok = check(parser_backend('lxml') is LxmlDocument and parser_backend('soup') is SoupDocument, "known names")
+    try:
+        parser_backend('html5lib')
+        ok &= check(False, "unknown name refused")
+    except ValueError:
+        ok &= check(True, "unknown name refused")
+    return ok
+
+
+def test_verdict_parity():
+    assert check_verdict_parity()
+
+
+def test_document_parity():
+    assert check_document_parity()
+
+
+def test_selectors():
+    assert check_selectors()
+
+
+def test_backend_names():
+    assert check_backend_names()
+
+
+def main():
+    passed = check_verdict_parity()
+    passed &= check_document_parity()
+    passed &= check_selectors()
+    passed &= check_backend_names()
+    print("\nAll checks passed" if passed else "\nSome checks FAILED")
+    return 0 if passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
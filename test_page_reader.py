@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Test script for bounded page reading
+
+Checks that:
+- a body over max_bytes is cut at exactly max_bytes and reported as 'size'
+- a compressed body that inflates past max_ratio is abandoned as 'ratio',
+  while small bodies are never judged by their ratio
+- a multi-byte character split across chunks decodes correctly
+- truncation and peak buffer size are counted
+- the history records which checks classified a truncated page
+
+Usage:
+    python test_page_reader.py
+    python -m pytest test_page_reader.py
+"""
+import os
+import sys
+import sqlite3
+import tempfile
+
+from history_store import HistoryStore
+from page_reader import PageReader, RATIO_MIN_BYTES, TRUNCATED_RATIO, TRUNCATED_SIZE
+
+
+def check(condition, message):
+    print(f"  {'PASS' if condition else 'FAIL'}: {message}")
+    return condition
+
+
+class FakeRaw:
+    def __init__(self):
+        self.wire_bytes = 0
+
+    def tell(self):
+        return self.wire_bytes
+
+
+class FakeResponse:
+    """Just enough of a streamed requests response for PageReader.read"""
+
+    def __init__(self, chunks, encoding='utf-8', compression=1):
+        self.encoding = encoding
+        self.raw = FakeRaw()
+        self.chunks = chunks
+        self.compression = compression
+        self.consumed = 0
+
+    def iter_content(self, chunk_size):
+        for chunk in self.chunks:
+            self.raw.wire_bytes += max(1, len(chunk) // self.compression)
+            self.consumed += 1
+            yield chunk
+
+
+def check_size_cap():
+    print("\n== size cap ==")
+    reader = PageReader(max_bytes=1000)
+    response = FakeResponse([b'a' * 512] * 4)
+    body, text, truncated = reader.read(response)
+    ok = check(len(body) == 1000 and len(text) == 1000, "body cut at exactly max_bytes")
+    ok &= check(truncated == TRUNCATED_SIZE, "truncation reported as 'size'")
+    ok &= check(response.consumed == 2, "reading stops once the cap is reached")
+    ok &= check(reader.stats[TRUNCATED_SIZE] == 1 and reader.peak_bytes == 1000, "truncation and peak counted")
+
+    body, _, truncated = reader.read(FakeResponse([b'<p>ok</p>']))
+    ok &= check(body == b'<p>ok</p>' and truncated is None, "a small page is read whole")
+    return ok
+
+
+def check_ratio_cap():
+    print("\n== decompression ratio ==")
+    reader = PageReader(max_bytes=10 * RATIO_MIN_BYTES, max_ratio=50)
+    chunk = b'\0' * (64 * 1024)
+    response = FakeResponse([chunk] * 40, compression=1000)
+    body, _, truncated = reader.read(response)
+    ok = check(truncated == TRUNCATED_RATIO, "a body inflating 1000x is abandoned as 'ratio'")
+    ok &= check(len(body) <= RATIO_MIN_BYTES + len(chunk), "it is abandoned soon after RATIO_MIN_BYTES")
+    ok &= check(reader.stats[TRUNCATED_RATIO] == 1, "ratio abandonments counted")
+
+    _, _, truncated = reader.read(FakeResponse([b'\0' * 1024] * 4, compression=1000))
+    ok &= check(truncated is None, "bodies under RATIO_MIN_BYTES are not judged by their ratio")
+    return ok
+
+
+def check_incremental_decoding():
+    print("\n== incremental decoding ==")
+    reader = PageReader()
+    encoded = '¡Entradas disponibles! Próximamente'.encode('utf-8')
+    split = encoded.index('¡'.encode('utf-8')) + 1  # Inside the two-byte character
+    _, text, _ = reader.read(FakeResponse([encoded[:split], encoded[split:]]))
+    ok = check(text == '¡Entradas disponibles! Próximamente', "a character split across chunks decodes")
+
+    _, text, _ = reader.read(FakeResponse(['Próximamente'.encode('latin-1')], encoding='latin-1'))
+    ok &= check(text == 'Próximamente', "the response's declared encoding is used")
+    _, text, _ = reader.read(FakeResponse([b'ok'], encoding='no-such-codec'))
+    ok &= check(text == 'ok', "an unknown encoding falls back to UTF-8")
+    return ok
+
+
+def check_history_flag():
+    print("\n== truncation in the history ==")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'history.db')
+        # A database from before checks carried a truncation flag
+        db = sqlite3.connect(path)
+        db.execute('CREATE TABLE checks (id INTEGER PRIMARY KEY, event_id TEXT NOT NULL, '
+                   'checked_at REAL NOT NULL, status TEXT NOT NULL, url TEXT, page_hash TEXT)')
+        db.execute("INSERT INTO checks (event_id, checked_at, status) VALUES ('july-12', 1, '❌ Sold Out')")
+        db.commit()
+        db.close()
+
+        history = HistoryStore(path)
+        history.record_check('july-12', '⚡ Coming Soon', 'https://example.test', 2, 'ab' * 32, truncated=True)
+        rows = history.checks('july-12')
+        ok = check([row['truncated'] for row in rows] == [True, False],
+                   "new checks carry the flag; older rows read as not truncated")
+        ok &= check([row['truncated'] for row in history.iter_checks()] == [0, 1], "exports see the flag")
+        history.close()
+    return ok
+
+
+def test_size_cap():
+    assert check_size_cap()
+
+
+def test_ratio_cap():
+    assert check_ratio_cap()
+
+
+def test_incremental_decoding():
+    assert check_incremental_decoding()
+
+
+def test_history_flag():
+    assert check_history_flag()
+
+
+def main():
+    passed = check_size_cap()
+    passed &= check_ratio_cap()
+    passed &= check_incremental_decoding()
+    passed &= check_history_flag()
+    print("\nAll checks passed" if passed else "\nSome checks FAILED")
+    return 0 if passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Test script for bulk re-classification
+
+Checks that, running reclassify with one worker over saved HTML files:
+- each page gets the current classifier's verdict and a report line
+- a baseline's old verdicts override the history's
+- changed is false when either verdict is missing or the page failed
+- old_verdicts is reported only when the history disagreed with itself
+- --changed-only writes only changed rows but still counts every page
+- sample_timing keeps at most TIMING_SAMPLE times while tracking the max
+
+Usage:
+    python test_reclassify.py
+    python -m pytest test_reclassify.py
+"""
+import io
+import os
+import sys
+import json
+import random
+import tempfile
+
+import reclassify
+from page_classifier import classify_ticketera_page
+from page_parser import SoupDocument
+
+SOLD_OUT_PAGE = "<html><body><h1>Bad Bunny</h1><p>Agotado</p><p>Sold out</p></body></html>"
+AVAILABLE_PAGE = "<html><body><h1>Bad Bunny</h1><button class='buy-button'>Comprar</button></body></html>"
+
+
+def check(condition, message):
+    print(f"  {'PASS' if condition else 'FAIL'}: {message}")
+    return condition
+
+
+def run(pages, **kwargs):
+    """Reclassify with one worker; returns (summary, report rows by file name)"""
+    report = io.StringIO()
+    summary = reclassify.reclassify(pages, report, workers=1, chunk_size=1, **kwargs)
+    rows = [json.loads(line) for line in report.getvalue().splitlines()]
+    return summary, {os.path.basename(row['page']): row for row in rows}
+
+
+def save_pages(directory):
+    for name, page_html in (('sold_out.html', SOLD_OUT_PAGE), ('available.html', AVAILABLE_PAGE)):
+        with open(os.path.join(directory, name), 'w', encoding='utf-8') as f:
+            f.write(page_html)
+    with open(os.path.join(directory, 'notes.txt'), 'w', encoding='utf-8') as f:
+        f.write("not a page")
+    return {name: classify_ticketera_page(page_html, os.path.join(directory, name), SoupDocument)
+            for name, page_html in (('sold_out.html', SOLD_OUT_PAGE), ('available.html', AVAILABLE_PAGE))}
+
+
+def check_saved_pages():
+    print("\n== saved pages ==")
+    with tempfile.TemporaryDirectory() as tmp:
+        verdicts = save_pages(tmp)
+        summary, rows = run(reclassify.file_pages([tmp]))
+        ok = check(set(rows) == {'sold_out.html', 'available.html'}, "only the .html files are classified")
+        ok &= check(all(rows[name]['new'] == verdict for name, verdict in verdicts.items()),
+                    "verdicts match the classifier")
+        ok &= check(verdicts['sold_out.html'] != verdicts['available.html'], "the two pages classify differently")
+        ok &= check(all(row['old'] is None and row['changed'] is False for row in rows.values()),
+                    "no old verdicts, nothing changed")
+        ok &= check(summary['pages'] == 2 and summary['errors'] == 0 and summary['timed'] == 2,
+                    "summary counts and times both pages")
+        ok &= check(all(row['bytes'] > 0 and row['ms'] is not None for row in rows.values()), "sizes and times")
+
+        path = os.path.join(tmp, 'before.ndjson')
+        with open(path, 'w', encoding='utf-8') as report:
+            reclassify.reclassify(reclassify.file_pages([tmp]), report, workers=1)
+        summary, _ = run(reclassify.file_pages([tmp]), baseline=reclassify.load_baseline(path))
+        ok &= check(summary['changed'] == 0, "a report used as its own baseline changes nothing")
+    return ok
+
+
+def check_old_verdicts():
+    print("\n== old verdicts ==")
+    with tempfile.TemporaryDirectory() as tmp:
+        verdicts = save_pages(tmp)
+        sold_out = os.path.join(tmp, 'sold_out.html')
+        available = os.path.join(tmp, 'available.html')
+        missing = os.path.join(tmp, 'missing.html')
+
+        def pages():
+            return [
+                {'source': 'file', 'page': sold_out, 'old': verdicts['sold_out.html'], 'checks': 3,
+                 'old_verdicts': {verdicts['sold_out.html']: 3}},
+                {'source': 'file', 'page': available, 'old': verdicts['sold_out.html'], 'checks': 5,
+                 'old_verdicts': {verdicts['sold_out.html']: 4, 'Other': 1}},
+                {'source': 'file', 'page': missing, 'old': verdicts['sold_out.html']},
+            ]
+
+        summary, rows = run(pages())
+        ok = check(rows['available.html']['changed'] and not rows['sold_out.html']['changed'],
+                   "history verdicts decide what changed")
+        ok &= check(summary['changes'] == {(verdicts['sold_out.html'], verdicts['available.html']): 1},
+                    "changes are tallied by old and new verdict")
+        ok &= check('old_verdicts' not in rows['sold_out.html'] and
+                    rows['available.html']['old_verdicts'] == {verdicts['sold_out.html']: 4, 'Other': 1},
+                    "old_verdicts only when the history disagreed")
+        ok &= check(rows['missing.html']['new'] is None and not rows['missing.html']['changed'] and
+                    'FileNotFoundError' in rows['missing.html']['error'] and summary['errors'] == 1,
+                    "a failed page is reported, not counted as changed")
+
+        baseline = {sold_out: verdicts['available.html'], available: verdicts['available.html']}
+        summary, rows = run(pages(), baseline=baseline)
+        ok &= check(rows['sold_out.html']['old'] == verdicts['available.html'] and rows['sold_out.html']['changed'],
+                    "the baseline overrides the history")
+        ok &= check(not rows['available.html']['changed'], "and can clear a change")
+        ok &= check(rows['missing.html']['old'] is None and not rows['missing.html']['changed'],
+                    "pages missing from the baseline have no old verdict")
+
+        summary, rows = run(pages(), changed_only=True)
+        ok &= check(set(rows) == {'available.html'}, "--changed-only writes only changed rows")
+        ok &= check(summary['pages'] == 3 and summary['changed'] == 1, "but counts every page")
+    return ok
+
+
+def check_sample_timing():
+    print("\n== sample_timing ==")
+    saved = reclassify.TIMING_SAMPLE
+    reclassify.TIMING_SAMPLE = 10
+    try:
+        summary = {'ms': [], 'timed': 0, 'max_ms': 0}
+        rng = random.Random(1)
+        for ms in range(5):
+            reclassify.sample_timing(summary, ms, rng)
+        ok = check(summary['ms'] == [0, 1, 2, 3, 4], "every time kept below the sample size")
+        times = [rng.uniform(0, 50) for _ in range(1000)] + [99.0]
+        for ms in times:
+            reclassify.sample_timing(summary, ms, rng)
+        ok &= check(len(summary['ms']) == 10, "the sample never grows past TIMING_SAMPLE")
+        ok &= check(summary['timed'] == 1006 and summary['max_ms'] == 99.0, "count and max cover every time")
+        ok &= check(set(summary['ms']) <= set(times) | set(range(5)), "the sample holds only recorded times")
+        ok &= check(sum(ms >= 5 for ms in summary['ms']) >= 8, "later times replace earlier ones")
+    finally:
+        reclassify.TIMING_SAMPLE = saved
+    return ok
+
+
+def test_saved_pages():
+    assert check_saved_pages()
+
+
+def test_old_verdicts():
+    assert check_old_verdicts()
+
+
+def test_sample_timing():
+    assert check_sample_timing()
+
+
+def main():
+    passed = check_saved_pages()
+    passed &= check_old_verdicts()
+    passed &= check_sample_timing()
+    print("\nAll checks passed" if passed else "\nSome checks FAILED")
+    return 0 if passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
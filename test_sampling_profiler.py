@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Test script for the sweep sampling profiler
+
+Checks that:
+- a recording writes collapsed stacks and reports its sample counts
+- a recording whose write fails still calls on_done, with the error
+- POST /admin/profile is not locked out by a failed recording, and the
+  download reports why the file is missing
+
+Usage:
+    python test_sampling_profiler.py
+    python -m pytest test_sampling_profiler.py
+"""
+import os
+import sys
+import time
+import tempfile
+import threading
+
+import sampling_profiler
+from sampling_profiler import start_profile
+
+os.environ.setdefault('HISTORY_DB_PATH', ':memory:')
+
+
+def check(condition, message):
+    print(f"  {'PASS' if condition else 'FAIL'}: {message}")
+    return condition
+
+
+def busy(stop):
+    while not stop.is_set():
+        sum(range(1000))
+
+
+def check_recording():
+    print("\n== recording ==")
+    stop = threading.Event()
+    worker = threading.Thread(target=busy, args=(stop,))
+    worker.start()
+    results = []
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'sweep.collapsed')
+            start_profile(lambda: worker.ident, 0.1, path, interval=0.005,
+                          on_done=lambda *args: results.append(args)).join(5)
+            with open(path, encoding='utf-8') as f:
+                lines = f.read().splitlines()
+    finally:
+        stop.set()
+        worker.join()
+    _, samples, idle, error = results[0]
+    ok = check(error is None and samples > 0 and idle == 0, f"{samples} samples, no error")
+    ok &= check(any('busy' in line for line in lines), "the sampled function appears in the stacks")
+    ok &= check(all(line.rsplit(' ', 1)[1].isdigit() for line in lines), "lines end in a count")
+    return ok
+
+
+def failing_write(stacks, path):
+    raise OSError(28, "No space left on device")
+
+
+def check_failed_write():
+    print("\n== failed write ==")
+    saved = sampling_profiler.write_collapsed
+    sampling_profiler.write_collapsed = failing_write
+    results = []
+    try:
+        start_profile(lambda: None, 0.02, '/unused', on_done=lambda *args: results.append(args)).join(5)
+    finally:
+        sampling_profiler.write_collapsed = saved
+    ok = check(len(results) == 1, "on_done is called when the write raises")
+    ok &= check(isinstance(results[0][3], OSError), "and receives the error")
+    return ok
+
+
+def check_endpoint():
+    print("\n== /admin/profile ==")
+    import app as monitor
+
+    saved = sampling_profiler.write_collapsed, monitor.ADMIN_TOKEN
+    sampling_profiler.write_collapsed = failing_write
+    monitor.ADMIN_TOKEN = 'secret'
+    headers = {'X-Admin-Token': 'secret'}
+    client = monitor.app.test_client()
+    try:
+        response = client.post('/admin/profile?seconds=0.05', headers=headers)
+        filename = response.get_json()['file']
+        ok = check(response.status_code == 202, "recording started")
+        deadline = time.monotonic() + 5
+        while monitor.active_profile and time.monotonic() < deadline:
+            time.sleep(0.01)
+        ok &= check(monitor.active_profile is None, "the failed recording releases the profiler")
+
+        response = client.get(f'/admin/profile/{filename}', headers=headers)
+        ok &= check(response.status_code == 500 and 'No space left' in response.get_json()['reason'],
+                    "the download reports why the recording failed")
+        response = client.post('/admin/profile?seconds=0.05', headers=headers)
+        ok &= check(response.status_code == 202, "a new recording can start")
+        deadline = time.monotonic() + 5
+        while monitor.active_profile and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        sampling_profiler.write_collapsed, monitor.ADMIN_TOKEN = saved
+    return ok
+
+
+def test_recording():
+    assert check_recording()
+
+
+def test_failed_write():
+    assert check_failed_write()
+
+
+def test_endpoint():
+    assert check_endpoint()
+
+
+def main():
+    passed = check_recording()
+    passed &= check_failed_write()
+    passed &= check_endpoint()
+    print("\nAll checks passed" if passed else "\nSome checks FAILED")
+    return 0 if passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Test script for single-flight checks
+
+Checks that:
+- concurrent callers for one key share a single call and its result
+- callers within the TTL get the stored result; after it they run again
+- an error reaches every waiting caller and is not cached
+- different keys never share a call
+- the async version shares calls the same way and survives a cancelled follower
+
+Usage:
+    python test_single_flight.py
+    python -m pytest test_single_flight.py
+"""
+import sys
+import asyncio
+import threading
+
+from single_flight import SingleFlight
+
+
+def check(condition, message):
+    print(f"  {'PASS' if condition else 'FAIL'}: {message}")
+    return condition
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def check_threads_share_call():
+    print("\n== concurrent threads ==")
+    flight = SingleFlight(ttl=10)
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def work():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return '❌ Sold Out'
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(flight.do('url', work)))
+    leader.start()
+    started.wait(5)
+    followers = [threading.Thread(target=lambda: results.append(flight.do('url', work))) for _ in range(8)]
+    for thread in followers:
+        thread.start()
+    while flight.stats['inflight'] < 8:
+        threading.Event().wait(0.001)
+    release.set()
+    for thread in [leader] + followers:
+        thread.join()
+
+    ok = check(len(calls) == 1, "nine callers ran the work once")
+    ok &= check(results == ['❌ Sold Out'] * 9, "every caller got the same result")
+    ok &= check(flight.stats == {'leader': 1, 'inflight': 8, 'cached': 0}, "leader and joins counted")
+    return ok
+
+
+def check_ttl():
+    print("\n== result TTL ==")
+    clock = FakeClock()
+    flight = SingleFlight(ttl=10, clock=clock)
+    calls = []
+
+    def work():
+        calls.append(clock.now)
+        return f"status at {clock.now}"
+
+    first = flight.do('url', work)
+    clock.now = 9.9
+    ok = check(flight.do('url', work) == first and len(calls) == 1, "a result is reused within the TTL")
+    clock.now = 10
+    ok &= check(flight.do('url', work) == "status at 10" and len(calls) == 2, "and refetched once it expires")
+    ok &= check(flight.do('other', work) == "status at 10" and len(calls) == 3, "other keys run their own call")
+
+    no_cache = SingleFlight(ttl=0, clock=clock)
+    no_cache.do('url', work)
+    no_cache.do('url', work)
+    ok &= check(len(calls) == 5, "ttl=0 only shares calls in flight")
+    return ok
+
+
+def check_errors():
+    print("\n== errors ==")
+    flight = SingleFlight(ttl=10)
+    attempts = []
+
+    def failing():
+        attempts.append(1)
+        raise ConnectionError("reset")
+
+    raised = []
+    for _ in range(2):
+        try:
+            flight.do('url', failing)
+        except ConnectionError as e:
+            raised.append(e)
+    ok = check(len(raised) == 2 and len(attempts) == 2, "errors are raised and never cached")
+    ok &= check(flight.do('url', lambda: 'ok') == 'ok', "the key works again after an error")
+    return ok
+
+
+def check_async():
+    print("\n== async callers ==")
+    flight = SingleFlight(ttl=10)
+    calls = []
+
+    async def work():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return '⚡ Coming Soon'
+
+    async def scenario():
+        leader = asyncio.ensure_future(flight.do_async('url', work))
+        await asyncio.sleep(0)
+        cancelled = asyncio.ensure_future(flight.do_async('url', work))
+        followers = [asyncio.ensure_future(flight.do_async('url', work)) for _ in range(4)]
+        await asyncio.sleep(0.01)
+        cancelled.cancel()
+        results = await asyncio.gather(leader, *followers)
+        cached = await flight.do_async('url', work)
+        return results, cached
+
+    results, cached = asyncio.run(scenario())
+    ok = check(len(calls) == 1 and results == ['⚡ Coming Soon'] * 5, "coroutines share one call")
+    ok &= check(cached == '⚡ Coming Soon' and flight.stats['cached'] == 1, "then hit the stored result")
+    return ok
+
+
+def test_threads_share_call():
+    assert check_threads_share_call()
+
+
+def test_ttl():
+    assert check_ttl()
+
+
+def test_errors():
+    assert check_errors()
+
+
+def test_async():
+    assert check_async()
+
+
+def main():
+    passed = check_threads_share_call()
+    passed &= check_ttl()
+    passed &= check_errors()
+    passed &= check_async()
+    print("\nAll checks passed" if passed else "\nSome checks FAILED")
+    return 0 if passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
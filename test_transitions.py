@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Test script for status transition detection
+
+Checks that:
+- check failures never change the confirmed status or alert
+- upgrades to possible/available (direct checkout included) are confirmed on
+  the first result
+- downgrades and other changes need `confirmations` of the last `window` results
+- a changed stock count at the same level is not a transition
+- statuses map to their availability levels and state names
+
+Usage:
+    python test_transitions.py
+    python -m pytest test_transitions.py
+"""
+import sys
+
+from transitions import TransitionDetector, availability_level, availability_state
+
+SOLD_OUT = '❌ Sold Out'
+COMING_SOON = '⚡ Coming Soon'
+AVAILABLE = '🔥 TICKETS AVAILABLE! CHECK NOW 🔥'
+BLOCKED = '🚫 Access Blocked - Using Cached Status'
+ERROR = '⚠️ Error Checking - Using Cached Status'
+DIRECT_CHECKOUT = '🚨 DIRECT CHECKOUT AVAILABLE! 🚨 Link: https://choli.ticketera.com/checkout/1'
+
+
+def check(condition, message):
+    print(f"  {'PASS' if condition else 'FAIL'}: {message}")
+    return condition
+
+
+def check_failures_ignored():
+    print("\n== check failures ==")
+    detector = TransitionDetector(confirmations=2, window=3)
+    ok = check(detector.observe('july-12', SOLD_OUT) is None, "the first result only sets the baseline")
+    results = [detector.observe('july-12', status) for status in (BLOCKED, ERROR, BLOCKED)]
+    ok &= check(results == [None, None, None], "failures never alert")
+    ok &= check(detector.confirmed('july-12') == SOLD_OUT, "failures keep the confirmed status")
+
+    detector = TransitionDetector()
+    detector.observe('july-18', COMING_SOON, baseline=BLOCKED)
+    ok &= check(detector.confirmed('july-18') == COMING_SOON, "a failure is never used as the baseline")
+    return ok
+
+
+def check_upgrades_immediate():
+    print("\n== upgrades ==")
+    detector = TransitionDetector(confirmations=2, window=3)
+    detector.observe('july-12', SOLD_OUT)
+    ok = check(detector.observe('july-12', AVAILABLE) == (SOLD_OUT, AVAILABLE), "sold out -> available alerts at once")
+
+    detector.observe('july-13', SOLD_OUT)
+    ok &= check(detector.observe('july-13', DIRECT_CHECKOUT) == (SOLD_OUT, DIRECT_CHECKOUT),
+                "sold out -> direct checkout alerts at once")
+    ok &= check(detector.confirmed('july-13') == DIRECT_CHECKOUT, "and is the confirmed status")
+
+    detector.observe('july-18', SOLD_OUT)
+    ok &= check(detector.observe('july-18', COMING_SOON) is None, "an upgrade below the alert level waits")
+    ok &= check(detector.observe('july-18', COMING_SOON) == (SOLD_OUT, COMING_SOON), "and confirms on the second result")
+
+    detector.observe('august-8', AVAILABLE, baseline=None)
+    ok &= check(detector.observe('august-8', '🔥 TICKETS AVAILABLE! 40 tickets in stock 🔥') is None,
+                "a new stock count at the same level is not a transition")
+    ok &= check('40 tickets' in detector.confirmed('august-8'), "but updates the confirmed text")
+    return ok
+
+
+def check_downgrades_confirmed():
+    print("\n== downgrades ==")
+    detector = TransitionDetector(confirmations=2, window=3)
+    detector.observe('july-12', AVAILABLE)
+    ok = check(detector.observe('july-12', SOLD_OUT) is None, "one sold-out page does not end availability")
+    ok &= check(detector.observe('july-12', AVAILABLE) is None, "flapping back is not news")
+    ok &= check(detector.observe('july-12', SOLD_OUT) == (AVAILABLE, SOLD_OUT),
+                "two sold-out results in the window confirm the downgrade")
+    ok &= check(detector.observe('july-12', AVAILABLE) == (SOLD_OUT, AVAILABLE), "the next drop alerts again")
+
+    detector = TransitionDetector(confirmations=2, window=2)
+    detector.observe('july-19', AVAILABLE)
+    detector.observe('july-19', SOLD_OUT)
+    detector.observe('july-19', AVAILABLE)
+    ok &= check(detector.observe('july-19', SOLD_OUT) is None, "votes older than the window are forgotten")
+    return ok
+
+
+def check_levels():
+    print("\n== levels ==")
+    ok = check(availability_level(AVAILABLE) == 4 and availability_level(SOLD_OUT) == 0, "levels by marker")
+    ok &= check(availability_level('🛒 TICKETS IN CART! 🛒') == 4, "in cart counts as available")
+    ok &= check(availability_state('⏳ In Queue/Waitlist') == 'queue', "state names")
+    ok &= check(availability_state(DIRECT_CHECKOUT) == 'available', "a direct checkout link counts as available")
+    ok &= check(availability_state('Something new on the page') == 'other', "unknown statuses are 'other'")
+    return ok
+
+
+def test_failures_ignored():
+    assert check_failures_ignored()
+
+
+def test_upgrades_immediate():
+    assert check_upgrades_immediate()
+
+
+def test_downgrades_confirmed():
+    assert check_downgrades_confirmed()
+
+
+def test_levels():
+    assert check_levels()
+
+
+def main():
+    passed = check_failures_ignored()
+    passed &= check_upgrades_immediate()
+    passed &= check_downgrades_confirmed()
+    passed &= check_levels()
+    print("\nAll checks passed" if passed else "\nSome checks FAILED")
+    return 0 if passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
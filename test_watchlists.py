@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Test script for watchlists
+
+Checks that:
+- the store only takes server-shaped tokens and known events, and stops
+  growing at max_entries
+- a watchlist saved through one store is seen by another on the same file
+- filter_snapshot and signature behave as the ticket endpoints expect
+- PayloadCache evicts the least recently used payload
+- PUT /api/watchlist refuses non-object bodies and replaces tokens the server
+  did not issue
+
+Usage:
+    python test_watchlists.py
+    python -m pytest test_watchlists.py
+"""
+import os
+import sys
+import tempfile
+
+from json_file import StoreFull
+from watchlists import PayloadCache, WatchlistStore, filter_snapshot, is_token, new_token, signature
+
+EVENTS = ['july-12', 'july-18', 'august-8', 'august-9']
+
+
+def check(condition, message):
+    print(f"  {'PASS' if condition else 'FAIL'}: {message}")
+    return condition
+
+
+def raises(exception, func, *args):
+    try:
+        func(*args)
+    except exception:
+        return True
+    return False
+
+
+def check_store():
+    print("\n== watchlist store ==")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'watchlists.json')
+        store = WatchlistStore(path, EVENTS, max_entries=2)
+        first, second, third = new_token(), new_token(), new_token()
+
+        ok = check(raises(ValueError, store.set, 'x' * 100000, ['july-12']), "oversized token refused")
+        ok &= check(raises(ValueError, store.set, first, ['december-1']), "unknown event refused")
+        ok &= check(raises(ValueError, store.set, first, 'july-12'), "events must be a list")
+        ok &= check(store.set(first, ['july-18', 'july-12', 'july-12']) == ['july-12', 'july-18'],
+                    "events deduplicated and sorted")
+        store.set(second, ['august-8'])
+        ok &= check(raises(StoreFull, store.set, third, ['august-9']), "store stops growing at max_entries")
+        store.set(first, ['august-9'])
+        ok &= check(store.get(first) == ['august-9'], "an existing watchlist can still change when full")
+
+        other_worker = WatchlistStore(path, EVENTS)
+        ok &= check(other_worker.get(second) == ['august-8'], "watchlists are shared through the file")
+        store.set(second, [])
+        ok &= check(other_worker.get(second) is None, "an empty list removes the watchlist everywhere")
+        ok &= check(is_token(first) and not is_token('short') and not is_token(None), "token shape check")
+    return ok
+
+
+def check_filtering_and_cache():
+    print("\n== filtering and payload cache ==")
+    data = {event_id: {'status': 'Sold Out'} for event_id in EVENTS}
+    ok = check(list(filter_snapshot(data, ['august-8', 'july-12'])) == ['july-12', 'august-8'],
+               "filtered snapshot keeps snapshot order")
+    ok &= check(signature(['b', 'a']) == signature(['a', 'b']) != signature(['a']),
+                "signature ignores order and tells lists apart")
+
+    cache = PayloadCache(max_entries=2)
+    cache.put('a', b'1')
+    cache.put('b', b'2')
+    cache.get('a')
+    cache.put('c', b'3')
+    ok &= check(cache.get('b') is None and cache.get('a') == b'1', "least recently used payload evicted")
+    ok &= check(cache.stats == {'hit': 2, 'miss': 1}, "hits and misses counted")
+    return ok
+
+
+def check_endpoint():
+    print("\n== PUT /api/watchlist ==")
+    os.environ.setdefault('HISTORY_DB_PATH', ':memory:')
+    import app as monitor
+
+    with tempfile.TemporaryDirectory() as tmp:
+        saved = monitor.watchlists
+        monitor.watchlists = WatchlistStore(os.path.join(tmp, 'watchlists.json'), monitor.BAD_BUNNY_EVENT_IDS)
+        try:
+            client = monitor.app.test_client()
+            event_id = monitor.BAD_BUNNY_EVENT_IDS[0]
+            ok = check(client.put('/api/watchlist', json=[event_id]).status_code == 400, "list body refused")
+            ok &= check(client.put('/api/watchlist', json='x').status_code == 400, "string body refused")
+
+            forged = 'x' * 100000
+            response = client.put('/api/watchlist', json={'events': [event_id]}, headers={'X-Watchlist-Token': forged})
+            token = response.get_json()['token']
+            ok &= check(response.status_code == 200 and token != forged and is_token(token),
+                        "a client-chosen token is replaced by a server-issued one")
+            response = client.put('/api/watchlist', json={'events': [event_id]}, headers={'X-Watchlist-Token': token})
+            ok &= check(response.get_json()['token'] == token, "an issued token is kept")
+            ok &= check(len(monitor.watchlists) == 1, "one watchlist stored")
+        finally:
+            monitor.watchlists = saved
+    return ok
+
+
+def test_store():
+    assert check_store()
+
+
+def test_filtering_and_cache():
+    assert check_filtering_and_cache()
+
+
+def test_endpoint():
+    assert check_endpoint()
+
+
+def main():
+    passed = check_store()
+    passed &= check_filtering_and_cache()
+    passed &= check_endpoint()
+    print("\nAll checks passed" if passed else "\nSome checks FAILED")
+    return 0 if passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+Test script for Web Push delivery against a local stand-in push service
+
+Starts an HTTP server on localhost that plays the part of FCM/Mozilla/Apple
+push services and checks that broadcast():
+- delivers to every live subscription, several at a time
+- prunes subscriptions answering 404/410 and ones past their expirationTime
+- keeps subscriptions that failed for other reasons (5xx, timeouts)
+
+and that the store refuses endpoints the server must not POST to (http,
+loopback, private and link-local hosts) and stops growing at its cap.
+
+Subscriptions use https://push.test endpoints, which a stand-in resolver
+places on a public address; the senders redirect them to the local service.
+
+With pywebpush installed the same run is repeated through the real VAPID
+sender (encrypted payload plus Authorization header).
+
+Usage:
+    python test_web_push.py
+    python -m pytest test_web_push.py
+"""
+import os
+import sys
+import time
+import base64
+import tempfile
+import threading
+import multiprocessing
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+import web_push
+from json_file import StoreFull
+from web_push import SubscriptionStore, broadcast, validate_subscription
+
+RESPONSE_DELAY = 0.05  # Seconds each stand-in delivery takes, to expose concurrency
+PUSH_HOST = 'https://push.test'
+
+
+def public_resolver(host):
+    """Stand-in DNS: every host is on a public address"""
+    return ['93.184.216.34']
+
+
+def to_service(send, service_url):
+    """Wrap a sender so https://push.test endpoints are delivered to the local service"""
+    def send_local(subscription, data):
+        return send(dict(subscription, endpoint=subscription['endpoint'].replace(PUSH_HOST, service_url)), data)
+    return send_local
+
+
+class StandInPushService:
+    """Push endpoint whose answer depends on the path: /ok/*, /gone/*, /missing/*, /error/*"""
+
+    def __init__(self):
+        self.received = []
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self._lock = threading.Lock()
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), self._handler())
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def _handler(self):
+        service = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length', 0))
+                body = self.rfile.read(length)
+                with service._lock:
+                    service.in_flight += 1
+                    service.peak_in_flight = max(service.peak_in_flight, service.in_flight)
+                time.sleep(RESPONSE_DELAY)
+                with service._lock:
+                    service.in_flight -= 1
+                    service.received.append((self.path, dict(self.headers), body))
+
+                kind = self.path.split('/')[1]
+                status = {'ok': 201, 'gone': 410, 'missing': 404}.get(kind, 500)
+                self.send_response(status)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def __enter__(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def plain_sender(subscription, data):
+    """Deliver the JSON payload unencrypted; enough to exercise store, batching and pruning"""
+    response = requests.post(subscription['endpoint'], data=data.encode('utf-8'),
+                             headers={'TTL': '60', 'Content-Type': 'application/json'}, timeout=5)
+    return response.status_code
+
+
+def make_subscription(endpoint, expiration=None, p256dh=None):
+    return {
+        'endpoint': endpoint,
+        'expirationTime': expiration,
+        'keys': {
+            'p256dh': p256dh or 'BNcRdreALRFXTkOOUHK1EtK2wtaz5Ry4YfYCA_0QTpQtUbVlUls0VJXg7A8u-Ts1XbjhazAkj7I99e8QcYP7DkM',
+            'auth': base64.urlsafe_b64encode(os.urandom(16)).decode().rstrip('='),
+        },
+    }
+
+
+def populate(store, ok=0, gone=0, missing=0, error=0, expired=0, p256dh=None):
+    for kind, count in (('ok', ok), ('gone', gone), ('missing', missing), ('error', error)):
+        for i in range(count):
+            store.add(make_subscription(f"{PUSH_HOST}/{kind}/{i}", p256dh=p256dh))
+    past = (time.time() - 60) * 1000
+    for i in range(expired):
+        store.add(make_subscription(f"{PUSH_HOST}/ok/expired-{i}", expiration=past, p256dh=p256dh))
+
+
+def check(condition, message):
+    print(f"  {'PASS' if condition else 'FAIL'}: {message}")
+    return condition
+
+
+def check_broadcast(send, label, p256dh=None):
+    print(f"\n== broadcast via {label} ==")
+    results = []
+    with tempfile.TemporaryDirectory() as tmp, StandInPushService() as service:
+        store_path = os.path.join(tmp, 'push_subscriptions.json')
+        store = SubscriptionStore(store_path, resolve=public_resolver)
+        populate(store, ok=20, gone=3, missing=2, error=2, expired=4, p256dh=p256dh)
+
+        started = time.monotonic()
+        result = broadcast(store, {'title': 'Bad Bunny - July 12, 2025', 'body': 'Sold Out → TICKETS AVAILABLE'},
+                           to_service(send, service.url), batch_size=10, max_workers=5)
+        elapsed = time.monotonic() - started
+        print(f"  result={result} elapsed={elapsed:.2f}s peak_in_flight={service.peak_in_flight}")
+
+        results.append(check(result == {'sent': 20, 'expired': 9, 'failed': 2}, "counts of sent/expired/failed"))
+        results.append(check(len(service.received) == 27, "expired subscriptions were never contacted"))
+        results.append(check(1 < service.peak_in_flight <= 5, "sends ran concurrently within max_workers"))
+        results.append(check(elapsed < 27 * RESPONSE_DELAY / 2, "batch finished faster than serial delivery"))
+
+        remaining = {s['endpoint'].split('/')[3] for s in SubscriptionStore(store_path, resolve=public_resolver).all()}
+        results.append(check(remaining == {'ok', 'error'}, "404/410 subscriptions pruned from the file, 5xx kept"))
+
+        if label == 'VAPID':
+            headers = service.received[0][1]
+            results.append(check(headers.get('Content-Encoding') == 'aes128gcm', "payload is encrypted"))
+            results.append(check(headers.get('Authorization', '').startswith('vapid '), "VAPID Authorization header sent"))
+    return all(results)
+
+
+def check_store_shared_between_workers():
+    print("\n== subscription store shared through the file ==")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'push_subscriptions.json')
+        worker_a = SubscriptionStore(path, resolve=public_resolver)
+        worker_b = SubscriptionStore(path, resolve=public_resolver)
+        worker_a.add(make_subscription('https://push.example.com/a'))
+        ok = check(len(worker_b) == 1, "a subscription added in one worker is seen by another")
+        worker_b.remove(['https://push.example.com/a'])
+        ok &= check(len(worker_a) == 0, "a removal in one worker is seen by another")
+
+        try:
+            worker_a.add({'endpoint': 'ftp://nope', 'keys': {}})
+            ok &= check(False, "malformed subscription rejected")
+        except ValueError:
+            ok &= check(True, "malformed subscription rejected")
+    return ok
+
+
+def _add_from_worker(path, worker, count):
+    store = SubscriptionStore(path, resolve=public_resolver)
+    for i in range(count):
+        store.add(make_subscription(f"{PUSH_HOST}/ok/{worker}-{i}"))
+
+
+def check_concurrent_workers():
+    print("\n== concurrent adds from several processes ==")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'push_subscriptions.json')
+        workers = [multiprocessing.Process(target=_add_from_worker, args=(path, worker, 25)) for worker in range(4)]
+        for process in workers:
+            process.start()
+        for process in workers:
+            process.join()
+        stored = len(SubscriptionStore(path, resolve=public_resolver))
+        leftovers = [name for name in os.listdir(tmp) if name.endswith('.tmp')]
+        ok = check(stored == 100, f"no update lost ({stored} of 100 stored)")
+        ok &= check(not leftovers, "no temp files left behind")
+    return ok
+
+
+def check_unsafe_endpoints_rejected():
+    print("\n== endpoints the server must not POST to ==")
+    private_resolver = {'internal.example.com': ['10.0.0.5'], 'metadata.example.com': ['169.254.169.254']}.get
+    ok = True
+    for endpoint in ('http://push.example.com/a', 'https://127.0.0.1:8080/a', 'https://169.254.169.254/latest',
+                     'https://[::1]/a', 'https://192.168.1.20/a', 'https://localhost/a',
+                     'https://internal.example.com/a', 'https://metadata.example.com/a', 'https://push.test:99999/a'):
+        try:
+            validate_subscription(make_subscription(endpoint), resolve=lambda host: private_resolver(host, []))
+            ok &= check(False, f"{endpoint} rejected")
+        except ValueError:
+            ok &= check(True, f"{endpoint} rejected")
+    ok &= check(validate_subscription(make_subscription(f"{PUSH_HOST}/a"), resolve=public_resolver) is not None,
+                "https endpoint on a public host accepted")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = SubscriptionStore(os.path.join(tmp, 'push_subscriptions.json'), max_subscriptions=2,
+                                  resolve=public_resolver)
+        store.add(make_subscription(f"{PUSH_HOST}/1"))
+        store.add(make_subscription(f"{PUSH_HOST}/2"))
+        store.add(make_subscription(f"{PUSH_HOST}/2"))
+        try:
+            store.add(make_subscription(f"{PUSH_HOST}/3"))
+            ok &= check(False, "store stops growing at max_subscriptions")
+        except StoreFull:
+            ok &= check(len(store) == 2, "store stops growing at max_subscriptions")
+    return ok
+
+
+def test_store_shared_between_workers():
+    assert check_store_shared_between_workers()
+
+
+def test_concurrent_workers():
+    assert check_concurrent_workers()
+
+
+def test_unsafe_endpoints_rejected():
+    assert check_unsafe_endpoints_rejected()
+
+
+def test_broadcast_plain_sender():
+    assert check_broadcast(plain_sender, 'plain sender')
+
+
+def vapid_test_material():
+    """Return (sender, subscriber public key) for a real VAPID run, or None without pywebpush"""
+    if web_push.webpush is None:
+        return None
+    from py_vapid import Vapid01
+    from cryptography.hazmat.primitives.asymmetric import ec
+    from cryptography.hazmat.primitives import serialization
+
+    vapid = Vapid01()
+    vapid.generate_keys()
+    with tempfile.NamedTemporaryFile('wb', suffix='.pem', delete=False) as f:
+        f.write(vapid.private_pem())
+
+    subscriber = ec.generate_private_key(ec.SECP256R1())
+    point = subscriber.public_key().public_bytes(serialization.Encoding.X962, serialization.PublicFormat.UncompressedPoint)
+    p256dh = base64.urlsafe_b64encode(point).decode().rstrip('=')
+    return web_push.vapid_sender(f.name, 'mailto:test@example.com'), p256dh
+
+
+def main():
+    passed = check_store_shared_between_workers()
+    passed &= check_concurrent_workers()
+    passed &= check_unsafe_endpoints_rejected()
+    passed &= check_broadcast(plain_sender, 'plain sender')
+
+    material = vapid_test_material()
+    if material is None:
+        print("\npywebpush not installed: skipping the VAPID run")
+    else:
+        sender, p256dh = material
+        passed &= check_broadcast(sender, 'VAPID', p256dh=p256dh)
+
+    print("\nAll checks passed" if passed else "\nSome checks FAILED")
+    return 0 if passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,118 @@
+"""
+Status Transitions
+
+Decides which status changes are worth an alert. Raw check results flap: a
+403 or a timeout in the middle of a sold-out run is not news, and a single
+odd page should not page everyone. Each event keeps a confirmed status and
+a window of its last few successful check results:
+
+- Check failures (see circuit_breaker.is_check_failure) never change the
+  confirmed status and never alert. They are a health problem, tracked by
+  the circuit breakers, not an availability change.
+- Upgrades to availability (possible availability, tickets available, a
+  direct checkout link, in cart) from a lower level are confirmed immediately, so real drops are
+  never delayed.
+- Every other change, downgrades included, is confirmed only once the new
+  level shows up in `confirmations` of the last `window` results.
+- Results at the same level (e.g. a changed stock count) update the
+  confirmed text without a transition.
+"""
+import threading
+from collections import deque
+
+from circuit_breaker import is_check_failure
+
+# Availability levels, highest first; the first matching marker wins
+AVAILABILITY_LEVELS = (
+    ('TICKETS AVAILABLE', 4),
+    ('DIRECT CHECKOUT', 4),
+    ('TICKETS IN CART', 4),
+    ('Possible Availability', 3),
+    ('In Queue', 2),
+    ('Coming Soon', 1),
+    ('Not Yet Available', 1),
+    ('Sold Out', 0),
+)
+ALERT_LEVEL = 3  # Upgrades to this level or above skip confirmation
+STATE_NAMES = {4: 'available', 3: 'possible', 2: 'queue', 1: 'upcoming', 0: 'sold_out'}
+
+
+def availability_level(status):
+    """Level of an availability status, or None for statuses the table does not know"""
+    for marker, level in AVAILABILITY_LEVELS:
+        if marker in status:
+            return level
+    return None
+
+
+def availability_state(status):
+    """Short state name for a status ('available', 'sold_out', ...), 'other' if unknown"""
+    return STATE_NAMES.get(availability_level(status), 'other')
+
+
+def _category(status):
+    level = availability_level(status)
+    return status if level is None else level
+
+
+class TransitionDetector:
+    """Per-event hysteresis over check results"""
+
+    def __init__(self, confirmations=2, window=3):
+        self.confirmations = confirmations
+        self.window = window
+        self._events = {}
+        self._lock = threading.Lock()
+
+    def observe(self, event_id, status, baseline=None):
+        """
+        Feed one check result.
+
+        Args:
+            baseline: Confirmed status to start from the first time an event is seen
+
+        Returns:
+            (previous, current) confirmed statuses when a transition is confirmed, else None
+        """
+        with self._lock:
+            state = self._events.get(event_id)
+            if state is None:
+                confirmed = baseline if baseline and not is_check_failure(baseline) else None
+                state = self._events[event_id] = {
+                    'confirmed': confirmed,
+                    'recent': deque(maxlen=self.window),
+                    'errors': 0,
+                }
+
+            if is_check_failure(status):
+                state['errors'] += 1
+                return None
+            state['errors'] = 0
+            state['recent'].append(status)
+
+            previous = state['confirmed']
+            if previous is None or _category(status) == _category(previous):
+                state['confirmed'] = status
+                return None
+
+            new_level = availability_level(status)
+            old_level = availability_level(previous)
+            upgrade = (
+                new_level is not None and new_level >= ALERT_LEVEL and
+                (old_level is None or new_level > old_level)
+            )
+            if not upgrade:
+                votes = sum(1 for seen in state['recent'] if _category(seen) == _category(status))
+                if votes < self.confirmations:
+                    return None
+
+            state['confirmed'] = status
+            # Going back must earn its own confirmations
+            state['recent'].clear()
+            state['recent'].append(status)
+            return previous, status
+
+    def confirmed(self, event_id):
+        with self._lock:
+            state = self._events.get(event_id)
+            return state['confirmed'] if state else None
@@ -0,0 +1,162 @@
+"""
+Watchlists
+
+Lets each dashboard or bot follow a subset of the dates. A client's watchlist
+is stored server-side under an opaque token, which browsers keep in a cookie
+and bots send in the X-Watchlist-Token header. The ticket endpoints then
+filter the snapshot to the watched events.
+
+Tokens are issued by the server (new_token) and the store holds at most
+max_entries watchlists, so anonymous clients cannot grow it without bound.
+
+Clients with the same watchlist share a signature (a hash of the sorted
+event ids). Filtered payloads are cached per (signature, snapshot version,
+encoding), so a thousand viewers following the same two shows cost one
+filter and one encode per snapshot.
+"""
+import re
+import json
+import hashlib
+import logging
+import secrets
+import threading
+from collections import OrderedDict
+
+from json_file import StoreFull, locked, file_version, write_json
+
+logger = logging.getLogger(__name__)
+
+MAX_CACHED_PAYLOADS = 256
+MAX_WATCHLISTS = 50000
+TOKEN_BYTES = 16
+TOKEN_PATTERN = re.compile(r'[A-Za-z0-9_-]{22}')  # secrets.token_urlsafe(TOKEN_BYTES)
+
+
+def new_token():
+    return secrets.token_urlsafe(TOKEN_BYTES)
+
+
+def is_token(token):
+    """True if token has the shape of one new_token() issues"""
+    return isinstance(token, str) and TOKEN_PATTERN.fullmatch(token) is not None
+
+
+def signature(events):
+    """Stable short hash identifying a watchlist"""
+    return hashlib.sha256(','.join(sorted(events)).encode('utf-8')).hexdigest()[:12]
+
+
+def filter_snapshot(data, events):
+    """The snapshot entries for the watched events, in snapshot order"""
+    watched = set(events)
+    return {event_id: entry for event_id, entry in data.items() if event_id in watched}
+
+
+class WatchlistStore:
+    """
+    Thread-safe token -> event ids map persisted to a JSON file.
+
+    Re-read whenever the file changes on disk, so a watchlist saved through
+    one gunicorn worker applies to requests served by the others. Changes hold
+    a file lock from reload to save.
+    """
+
+    def __init__(self, path, known_events, max_entries=MAX_WATCHLISTS):
+        self.path = path
+        self.known_events = set(known_events)
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._watchlists = {}
+        self._version = None
+        with self._lock:
+            self._reload()
+
+    def get(self, token):
+        """Watched event ids for a token, or None if it has no watchlist"""
+        if not is_token(token):
+            return None
+        with self._lock:
+            self._reload()
+            return self._watchlists.get(token)
+
+    def set(self, token, events):
+        """
+        Store a watchlist; an empty list removes it.
+
+        Raises ValueError on a malformed token or unknown events, and
+        StoreFull if a new watchlist would exceed max_entries.
+        """
+        if not is_token(token):
+            raise ValueError("malformed watchlist token")
+        if not isinstance(events, list) or not all(isinstance(event_id, str) for event_id in events):
+            raise ValueError("events must be a list of event ids")
+        unknown = sorted(set(events) - self.known_events)
+        if unknown:
+            raise ValueError(f"unknown events: {', '.join(unknown)}")
+        events = sorted(set(events))
+        with self._lock, locked(self.path):
+            self._reload()
+            if self._watchlists.get(token) == (events or None):
+                return events
+            if events:
+                if token not in self._watchlists and len(self._watchlists) >= self.max_entries:
+                    raise StoreFull(f"watchlist limit of {self.max_entries} reached")
+                self._watchlists[token] = events
+            else:
+                self._watchlists.pop(token, None)
+            self._save()
+        return events
+
+    def remove(self, token):
+        if not is_token(token):
+            return
+        with self._lock, locked(self.path):
+            self._reload()
+            if self._watchlists.pop(token, None) is not None:
+                self._save()
+
+    def __len__(self):
+        with self._lock:
+            self._reload()
+            return len(self._watchlists)
+
+    def _reload(self):
+        version = file_version(self.path)
+        if version is None or version == self._version:
+            return
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                self._watchlists = {token: list(events) for token, events in json.load(f).items()}
+        except (OSError, ValueError, AttributeError, TypeError) as e:
+            logger.warning("Ignoring unreadable watchlist store %s: %s", self.path, e)
+        self._version = version
+
+    def _save(self):
+        self._version = write_json(self.path, self._watchlists)
+
+
+class PayloadCache:
+    """Small LRU of encoded payloads"""
+
+    def __init__(self, max_entries=MAX_CACHED_PAYLOADS):
+        self.max_entries = max_entries
+        self.stats = {'hit': 0, 'miss': 0}
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.stats['miss'] += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats['hit'] += 1
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
@@ -0,0 +1,282 @@
+"""
+Web Push Alerts
+
+Sends ticket status changes straight to subscribed browsers and phones with
+VAPID Web Push, so an alert needs neither Discord nor an open dashboard tab.
+
+- SubscriptionStore keeps PushSubscription objects (as produced by
+  ``subscription.toJSON()`` in the browser) in a small JSON file, keyed by
+  endpoint. Anyone can subscribe, and the server then POSTs to the endpoint,
+  so only https endpoints on public hosts are accepted, and the store is
+  capped at max_subscriptions.
+- broadcast() sends one payload to every subscription in batches, with the
+  sends inside a batch running concurrently. Subscriptions whose
+  expirationTime has passed, or whose push service answers 404/410, are
+  removed from the store.
+- vapid_sender() builds the actual sender on top of pywebpush (optional
+  dependency). broadcast() takes any ``send(subscription, data) -> status``
+  callable, which keeps it usable against a stand-in push service.
+"""
+import json
+import time
+import socket
+import logging
+import ipaddress
+import threading
+from urllib.parse import urlsplit
+from concurrent.futures import ThreadPoolExecutor
+
+from json_file import StoreFull, locked, file_version, write_json
+
+try:
+    from pywebpush import webpush, WebPushException
+except ImportError:
+    webpush = None
+    WebPushException = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 100
+DEFAULT_WORKERS = 8
+DEFAULT_TTL = 300  # Seconds a push service may hold an alert; older alerts are useless
+EXPIRED_STATUS_CODES = (404, 410)  # Push service says the subscription is gone
+MAX_SUBSCRIPTIONS = 10000
+MAX_ENDPOINT_LENGTH = 2048
+MAX_KEY_LENGTH = 256
+
+
+class SubscriptionStore:
+    """
+    Thread-safe set of push subscriptions persisted to a JSON file.
+
+    Every gunicorn worker has its own store object, so the file is re-read
+    whenever it changes on disk; a subscription saved by one worker is seen by
+    the worker that runs the next sweep. Changes hold a file lock from reload
+    to save, so concurrent workers never lose each other's updates.
+
+    Args:
+        resolve: host -> list of IP address strings, used to refuse endpoints
+            on private networks (tests pass a stand-in)
+    """
+
+    def __init__(self, path, max_subscriptions=MAX_SUBSCRIPTIONS, resolve=None):
+        self.path = path
+        self.max_subscriptions = max_subscriptions
+        self.resolve = resolve or resolve_host
+        self._lock = threading.Lock()
+        self._subscriptions = {}
+        self._version = None
+        with self._lock:
+            self._reload()
+
+    def add(self, subscription):
+        """
+        Add or refresh a subscription.
+
+        Raises ValueError if it is malformed or points at a private host, and
+        StoreFull if the store is at max_subscriptions.
+        """
+        subscription = validate_subscription(subscription, self.resolve)
+        with self._lock, locked(self.path):
+            self._reload()
+            if (subscription['endpoint'] not in self._subscriptions and
+                    len(self._subscriptions) >= self.max_subscriptions):
+                raise StoreFull(f"subscription limit of {self.max_subscriptions} reached")
+            self._subscriptions[subscription['endpoint']] = subscription
+            self._save()
+        return subscription
+
+    def remove(self, endpoints):
+        """Remove subscriptions by endpoint; returns how many were removed"""
+        if not endpoints:
+            return 0
+        with self._lock, locked(self.path):
+            self._reload()
+            removed = sum(1 for endpoint in endpoints if self._subscriptions.pop(endpoint, None) is not None)
+            if removed:
+                self._save()
+        return removed
+
+    def all(self):
+        with self._lock:
+            self._reload()
+            return list(self._subscriptions.values())
+
+    def __len__(self):
+        with self._lock:
+            self._reload()
+            return len(self._subscriptions)
+
+    def _reload(self):
+        version = file_version(self.path)
+        if version is None or version == self._version:
+            return
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                subscriptions = {s['endpoint']: s for s in json.load(f)}
+            # Stores written before endpoints were checked may hold unsafe ones
+            self._subscriptions = {
+                endpoint: s for endpoint, s in subscriptions.items()
+                if endpoint_problem(endpoint) is None
+            }
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning("Ignoring unreadable push subscription store %s: %s", self.path, e)
+        self._version = version
+
+    def _save(self):
+        self._version = write_json(self.path, list(self._subscriptions.values()))
+
+
+def resolve_host(host):
+    """IP addresses a host name resolves to"""
+    return [info[4][0] for info in socket.getaddrinfo(host, 443, proto=socket.IPPROTO_TCP)]
+
+
+def endpoint_problem(endpoint, resolve=None):
+    """
+    Why the server must not POST to an endpoint, or None if it may.
+
+    Endpoints must be https URLs on public hosts. IP literals are always
+    checked; host names are resolved and checked only when resolve is given.
+    """
+    if not isinstance(endpoint, str) or len(endpoint) > MAX_ENDPOINT_LENGTH:
+        return "subscription endpoint must be a URL"
+    try:
+        parts = urlsplit(endpoint)
+        host = parts.hostname
+        parts.port  # Raises ValueError on a malformed port
+    except ValueError:
+        return "subscription endpoint must be a URL"
+    if parts.scheme != 'https' or not host:
+        return "subscription endpoint must be an https URL"
+    if host == 'localhost' or host.endswith('.localhost'):
+        return "subscription endpoint must be a public host"
+    try:
+        addresses = [ipaddress.ip_address(host)]
+    except ValueError:
+        if resolve is None:
+            return None
+        try:
+            addresses = [ipaddress.ip_address(address.split('%')[0]) for address in resolve(host)]
+        except (OSError, ValueError):
+            return "subscription endpoint host does not resolve"
+    if not addresses or not all(address.is_global for address in addresses):
+        return "subscription endpoint must be a public host"
+    return None
+
+
+def validate_subscription(subscription, resolve=resolve_host):
+    """Return the fields of a browser PushSubscription we keep, or raise ValueError"""
+    if not isinstance(subscription, dict):
+        raise ValueError("subscription must be an object")
+    endpoint = subscription.get('endpoint')
+    keys = subscription.get('keys') or {}
+    problem = endpoint_problem(endpoint, resolve)
+    if problem:
+        raise ValueError(problem)
+    if not isinstance(keys, dict) or not all(
+            isinstance(keys.get(name), str) and 0 < len(keys[name]) <= MAX_KEY_LENGTH for name in ('p256dh', 'auth')):
+        raise ValueError("subscription keys must include p256dh and auth")
+    expiration = subscription.get('expirationTime')
+    if expiration is not None and not isinstance(expiration, (int, float)):
+        raise ValueError("expirationTime must be a number or null")
+    return {
+        'endpoint': endpoint,
+        'keys': {'p256dh': keys['p256dh'], 'auth': keys['auth']},
+        'expirationTime': expiration,
+    }
+
+
+def is_expired(subscription, now=None):
+    """True if the browser-reported expirationTime (epoch ms) has passed"""
+    expiration = subscription.get('expirationTime')
+    if expiration is None:
+        return False
+    now = time.time() if now is None else now
+    return expiration <= now * 1000
+
+
+def vapid_sender(private_key, subject, ttl=DEFAULT_TTL, timeout=10):
+    """
+    Build a send(subscription, data) callable that encrypts and delivers with VAPID.
+
+    Args:
+        private_key: VAPID private key (base64url DER or PEM path, as pywebpush accepts)
+        subject: Contact URI for the push service, e.g. "mailto:ops@example.com"
+        ttl: Seconds the push service may queue the message
+        timeout: HTTP timeout per delivery
+
+    Returns:
+        send(subscription, data) returning the push service's HTTP status code
+    """
+    if webpush is None:
+        raise RuntimeError("pywebpush is not installed")
+
+    def send(subscription, data):
+        try:
+            response = webpush(
+                subscription_info=subscription,
+                data=data,
+                vapid_private_key=private_key,
+                # pywebpush fills in aud/exp on the dict it is given, so pass a fresh one
+                vapid_claims={'sub': subject},
+                ttl=ttl,
+                timeout=timeout,
+            )
+            return response.status_code
+        except WebPushException as e:
+            if e.response is not None:
+                return e.response.status_code
+            raise
+
+    return send
+
+
+def _deliver(send, subscription, data):
+    try:
+        return send(subscription, data)
+    except Exception as e:
+        logger.warning("Push delivery to %s failed: %s", subscription['endpoint'][:60], e)
+        return None
+
+
+def broadcast(store, payload, send, batch_size=DEFAULT_BATCH_SIZE, max_workers=DEFAULT_WORKERS):
+    """
+    Send payload to every subscription in store and prune dead ones.
+
+    Args:
+        store: SubscriptionStore
+        payload: JSON-serialisable alert body
+        send: Callable (subscription, data) -> HTTP status code
+        batch_size: Subscriptions per batch; dead ones are pruned after each batch
+        max_workers: Concurrent deliveries within a batch
+
+    Returns:
+        Dictionary with sent, expired and failed counts
+    """
+    data = json.dumps(payload, ensure_ascii=False)
+    subscriptions = store.all()
+    result = {'sent': 0, 'expired': 0, 'failed': 0}
+
+    now = time.time()
+    expired = [s['endpoint'] for s in subscriptions if is_expired(s, now)]
+    result['expired'] += store.remove(expired)
+    live = [s for s in subscriptions if not is_expired(s, now)]
+
+    if not live:
+        return result
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(live))), thread_name_prefix='web-push') as pool:
+        for start in range(0, len(live), batch_size):
+            batch = live[start:start + batch_size]
+            gone = []
+            for subscription, status in zip(batch, pool.map(lambda s: _deliver(send, s, data), batch)):
+                if status is not None and 200 <= status < 300:
+                    result['sent'] += 1
+                elif status in EXPIRED_STATUS_CODES:
+                    gone.append(subscription['endpoint'])
+                else:
+                    result['failed'] += 1
+            result['expired'] += store.remove(gone)
+
+    return result